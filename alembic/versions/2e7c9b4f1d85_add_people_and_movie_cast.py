@@ -0,0 +1,77 @@
+"""add people and movie cast
+
+Revision ID: 2e7c9b4f1d85
+Revises: 8d3f1a6b2c40
+Create Date: 2026-10-18 14:31:05.662913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2e7c9b4f1d85'
+down_revision: Union[str, Sequence[str], None] = '8d3f1a6b2c40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _parse_cast(cast):
+    """Split a comma-separated cast string into distinct names (see app.utils.cast)."""
+    names = []
+    seen = set()
+    for name in (cast or "").split(","):
+        name = " ".join(name.split())
+        if name and name.lower() not in seen:
+            seen.add(name.lower())
+            names.append(name)
+    return names
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    people = op.create_table('people',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_people_id'), 'people', ['id'], unique=False)
+    op.create_index('ix_people_name_lower', 'people', [sa.text('lower(name)')], unique=True)
+    movie_cast = op.create_table('movie_cast',
+    sa.Column('movie_id', sa.Integer(), nullable=False),
+    sa.Column('person_id', sa.Integer(), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['movie_id'], ['movies.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['person_id'], ['people.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('movie_id', 'person_id')
+    )
+    op.create_index(op.f('ix_movie_cast_person_id'), 'movie_cast', ['person_id'], unique=False)
+
+    # Parse the existing free-form cast strings into people and credits
+    bind = op.get_bind()
+    movies = bind.execute(sa.text("SELECT id, \"cast\" FROM movies WHERE \"cast\" IS NOT NULL")).all()
+    credits = [(movie_id, _parse_cast(cast)) for movie_id, cast in movies]
+    person_ids = {}
+    for _, names in credits:
+        for name in names:
+            person_ids.setdefault(name.lower(), name)
+    if person_ids:
+        op.bulk_insert(people, [{"name": name} for name in person_ids.values()])
+        rows = bind.execute(sa.text("SELECT id, name FROM people")).all()
+        person_ids = {name.lower(): person_id for person_id, name in rows}
+        op.bulk_insert(movie_cast, [
+            {"movie_id": movie_id, "person_id": person_ids[name.lower()], "position": position}
+            for movie_id, names in credits
+            for position, name in enumerate(names)
+        ])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_movie_cast_person_id'), table_name='movie_cast')
+    op.drop_table('movie_cast')
+    op.drop_index('ix_people_name_lower', table_name='people')
+    op.drop_index(op.f('ix_people_id'), table_name='people')
+    op.drop_table('people')
@@ -0,0 +1,42 @@
+"""add rating created_at
+
+Revision ID: 4f8a2c6e9d13
+Revises: 9c5e3b7a1f42
+Create Date: 2026-10-18 16:05:37.512094
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f8a2c6e9d13'
+down_revision: Union[str, Sequence[str], None] = '9c5e3b7a1f42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # SQLite cannot add a column with a non-constant default, so the column
+    # is added as nullable, backfilled, then tightened in batch mode.
+    # Existing ratings get the migration time as their creation time.
+    op.add_column('movie_ratings', sa.Column('created_at', sa.DateTime(timezone=True), nullable=True))
+    op.execute("UPDATE movie_ratings SET created_at = CURRENT_TIMESTAMP")
+    with op.batch_alter_table('movie_ratings') as batch_op:
+        batch_op.alter_column(
+            'created_at',
+            existing_type=sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        )
+    op.create_index(op.f('ix_movie_ratings_created_at'), 'movie_ratings', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_movie_ratings_created_at'), table_name='movie_ratings')
+    with op.batch_alter_table('movie_ratings') as batch_op:
+        batch_op.drop_column('created_at')
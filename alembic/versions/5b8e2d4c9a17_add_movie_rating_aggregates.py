@@ -0,0 +1,44 @@
+"""add movie rating aggregates
+
+Revision ID: 5b8e2d4c9a17
+Revises: f37f94d97710
+Create Date: 2026-10-18 13:58:12.417305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8e2d4c9a17'
+down_revision: Union[str, Sequence[str], None] = 'f37f94d97710'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('movies', sa.Column('ratings_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('movies', sa.Column('ratings_sum', sa.Float(), server_default='0', nullable=False))
+    # Backfill the running aggregates from existing ratings
+    op.execute(
+        """
+        UPDATE movies SET
+            ratings_count = stats.ratings_count,
+            ratings_sum = stats.ratings_sum
+        FROM (
+            SELECT movie_id, COUNT(id) AS ratings_count, SUM(score) AS ratings_sum
+            FROM movie_ratings
+            GROUP BY movie_id
+        ) AS stats
+        WHERE movies.id = stats.movie_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('movies', 'ratings_sum')
+    op.drop_column('movies', 'ratings_count')
@@ -0,0 +1,37 @@
+"""add foreign key indexes
+
+Revision ID: 6a4d8e2f7b19
+Revises: 2e7c9b4f1d85
+Create Date: 2026-10-18 14:58:44.120376
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6a4d8e2f7b19'
+down_revision: Union[str, Sequence[str], None] = '2e7c9b4f1d85'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_movie_ratings_movie_id'), 'movie_ratings', ['movie_id'], unique=False)
+    op.create_index(op.f('ix_movies_director_id'), 'movies', ['director_id'], unique=False)
+    op.create_index(op.f('ix_movies_release_year'), 'movies', ['release_year'], unique=False)
+    op.create_index(
+        'ix_movie_genre_association_genre_id_movie_id', 'movie_genre_association',
+        ['genre_id', 'movie_id'], unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_movie_genre_association_genre_id_movie_id', table_name='movie_genre_association')
+    op.drop_index(op.f('ix_movies_release_year'), table_name='movies')
+    op.drop_index(op.f('ix_movies_director_id'), table_name='movies')
+    op.drop_index(op.f('ix_movie_ratings_movie_id'), table_name='movie_ratings')
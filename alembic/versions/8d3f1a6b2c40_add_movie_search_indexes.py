@@ -0,0 +1,83 @@
+"""add movie search indexes
+
+Revision ID: 8d3f1a6b2c40
+Revises: 5b8e2d4c9a17
+Create Date: 2026-10-18 14:12:37.208114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d3f1a6b2c40'
+down_revision: Union[str, Sequence[str], None] = '5b8e2d4c9a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SQLITE_TRIGGERS = ('movie_search_ai', 'movie_search_au', 'movie_search_ad', 'movie_search_director_au')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        # Trigram GIN indexes let ILIKE '%x%' and similarity() use an index
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        op.create_index(
+            'ix_movies_title_trgm', 'movies', ['title'],
+            postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'},
+        )
+        op.create_index(
+            'ix_directors_name_trgm', 'directors', ['name'],
+            postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'},
+        )
+    elif dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE movie_search "
+            "USING fts5(title, director_name, tokenize='trigram')"
+        )
+        op.execute(
+            "CREATE TRIGGER movie_search_ai AFTER INSERT ON movies BEGIN "
+            "INSERT INTO movie_search (rowid, title, director_name) "
+            "VALUES (new.id, new.title, (SELECT name FROM directors WHERE id = new.director_id)); "
+            "END"
+        )
+        op.execute(
+            "CREATE TRIGGER movie_search_au AFTER UPDATE OF title, director_id ON movies BEGIN "
+            "UPDATE movie_search SET title = new.title, "
+            "director_name = (SELECT name FROM directors WHERE id = new.director_id) "
+            "WHERE rowid = new.id; "
+            "END"
+        )
+        op.execute(
+            "CREATE TRIGGER movie_search_ad AFTER DELETE ON movies BEGIN "
+            "DELETE FROM movie_search WHERE rowid = old.id; "
+            "END"
+        )
+        op.execute(
+            "CREATE TRIGGER movie_search_director_au AFTER UPDATE OF name ON directors BEGIN "
+            "UPDATE movie_search SET director_name = new.name "
+            "WHERE rowid IN (SELECT id FROM movies WHERE director_id = new.id); "
+            "END"
+        )
+        op.execute(
+            "INSERT INTO movie_search (rowid, title, director_name) "
+            "SELECT movies.id, movies.title, directors.name "
+            "FROM movies JOIN directors ON directors.id = movies.director_id"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.drop_index('ix_directors_name_trgm', table_name='directors')
+        op.drop_index('ix_movies_title_trgm', table_name='movies')
+    elif dialect == 'sqlite':
+        for trigger in SQLITE_TRIGGERS:
+            op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+        op.execute('DROP TABLE IF EXISTS movie_search')
@@ -0,0 +1,43 @@
+"""add movie sort indexes
+
+Revision ID: 9c5e3b7a1f42
+Revises: 6a4d8e2f7b19
+Create Date: 2026-10-18 15:20:16.804529
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c5e3b7a1f42'
+down_revision: Union[str, Sequence[str], None] = '6a4d8e2f7b19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('movies', sa.Column('rating_average', sa.Float(), server_default='0', nullable=False))
+    op.execute(
+        """
+        UPDATE movies SET rating_average = ratings_sum / ratings_count
+        WHERE ratings_count > 0
+        """
+    )
+    op.create_index('ix_movies_rating_average_id', 'movies', ['rating_average', 'id'], unique=False)
+    op.create_index('ix_movies_ratings_count_id', 'movies', ['ratings_count', 'id'], unique=False)
+    op.create_index(
+        'ix_movies_release_year_rating_average', 'movies',
+        ['release_year', 'rating_average'], unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_movies_release_year_rating_average', table_name='movies')
+    op.drop_index('ix_movies_ratings_count_id', table_name='movies')
+    op.drop_index('ix_movies_rating_average_id', table_name='movies')
+    op.drop_column('movies', 'rating_average')
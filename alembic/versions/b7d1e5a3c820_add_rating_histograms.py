@@ -0,0 +1,53 @@
+"""add rating histograms
+
+Revision ID: b7d1e5a3c820
+Revises: 4f8a2c6e9d13
+Create Date: 2026-10-18 16:41:09.228315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d1e5a3c820'
+down_revision: Union[str, Sequence[str], None] = '4f8a2c6e9d13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BUCKETS = range(1, 11)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'movie_rating_histograms',
+        sa.Column('movie_id', sa.Integer(), nullable=False),
+        *[
+            sa.Column(f'bucket_{bucket}', sa.Integer(), server_default='0', nullable=False)
+            for bucket in BUCKETS
+        ],
+        sa.ForeignKeyConstraint(['movie_id'], ['movies.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('movie_id'),
+    )
+    # Fill the histograms of existing ratings; bucket 10 only holds 10s
+    bucket_sums = ", ".join(
+        f"SUM(CASE WHEN score >= {bucket} AND score < {bucket + 1} THEN 1 ELSE 0 END)"
+        for bucket in BUCKETS
+    )
+    op.execute(
+        f"""
+        INSERT INTO movie_rating_histograms
+            (movie_id, {", ".join(f"bucket_{bucket}" for bucket in BUCKETS)})
+        SELECT movie_id, {bucket_sums}
+        FROM movie_ratings
+        GROUP BY movie_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('movie_rating_histograms')
@@ -1 +1,3 @@
-from .movie import router
\ No newline at end of file
+from .movie import router
+from .rating import router as rating_router
+from .leaderboard import router as leaderboard_router
@@ -0,0 +1,86 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from app.api.v1.dependencies import *
+from app.api.v1.schemas import *
+from app.services import *
+from app.utils.logging_config import logger
+
+router = APIRouter(
+    prefix = "/leaderboards",
+    tags = ["leaderboards"],
+)
+
+
+def _require_leaderboards(movie_service: MovieService) -> None:
+    if movie_service.leaderboards is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Movie leaderboards are disabled."
+        )
+
+
+@router.get(
+    "",
+    response_model = ResponseModel,
+    summary = "List leaderboards",
+    description = "List every non-empty leaderboard scope with its number of ranked movies."
+)
+async def list_leaderboards(
+        movie_service: MovieService = Depends(get_movie_service)
+) -> ResponseModel:
+    """List the available leaderboard scopes.
+    Args:
+        movie_service: The MovieService dependency.
+    Returns:
+        Scopes mapped to the number of rated movies they rank.
+    Raises:
+        HTTPException: 503 if the leaderboards are disabled.
+    """
+    _require_leaderboards(movie_service)
+    return ResponseModel(
+        status="success",
+        data={"scopes": movie_service.leaderboards.scopes()}
+    )
+
+
+@router.get(
+    "/{scope}",
+    response_model = ResponseModel,
+    summary = "Get a leaderboard",
+    description = "Top-rated movies overall, per genre or per decade, served from memory."
+)
+async def get_leaderboard(
+        scope: str,
+        limit: int = 10,
+        movie_service: MovieService = Depends(get_movie_service)
+) -> ResponseModel:
+    """Return the best movies of a leaderboard by Bayesian weighted rating.
+    Args:
+        scope: "overall", "genre:<name>" or "decade:<year>", e.g.
+            "genre:Drama" or "decade:1990s".
+        limit: Maximum number of movies to return.
+        movie_service: The MovieService dependency.
+    Returns:
+        The normalized scope, the weighting used and the ranked movies.
+    Raises:
+        HTTPException: 422 if the scope or limit is invalid, 503 if the
+            leaderboards are disabled.
+    """
+    logger.info(f"Getting leaderboard (scope={scope}, limit={limit}, route=/api/v1/leaderboards/{scope})")
+    _require_leaderboards(movie_service)
+    try:
+        scope, items = movie_service.get_leaderboard(scope, limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail=str(e)
+        )
+    return ResponseModel(
+        status="success",
+        data={
+            "scope": scope,
+            "min_votes": movie_service.leaderboards.min_votes,
+            "prior_mean": round(movie_service.leaderboards.prior_mean, 4),
+            "items": [LeaderboardItem(**item) for item in items]
+        }
+    )
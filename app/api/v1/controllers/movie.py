@@ -1,10 +1,12 @@
+import csv
+import io
+import json
 import os
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 
 from dotenv import load_dotenv
-from fastapi import APIRouter, Depends, HTTPException, status, Request
-from fastapi.responses import RedirectResponse
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
+from fastapi.responses import RedirectResponse, StreamingResponse
 
 from app.api.v1.dependencies import *
 from app.api.v1.schemas import *
@@ -12,6 +14,7 @@ from app.exceptions import *
 from app.services import *
 from app.exceptions import *
 from app.models import *
+from app.cache import list_query_cache, movie_detail_cache
 from app.utils.logging_config import logger
 
 router = APIRouter(
@@ -19,6 +22,11 @@ router = APIRouter(
     tags = ["movies"],
 )
 
+# Movies fetched from the export cursor, and written to the client, at a time
+EXPORT_BATCH_SIZE = 1000
+EXPORT_CSV_FIELDS = ["id", "title", "release_year", "director", "cast", "genres", "ratings_count", "average_rating"]
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
 # get method for retrieving list of movies which can be all movies or filtered by query parameters (e.g., director_id, genre, release_year)
 @router.get(
     "/",
@@ -35,6 +43,14 @@ async def list_movies(
         release_year: Optional[int] = None,
         director_name: Optional[str] = None,
         genre: Optional[str] = None,
+        cast_member: Optional[str] = None,
+        cursor: Optional[str] = None,
+        q: Optional[str] = None,
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None,
+        min_rating: Optional[float] = None,
+        sort: Optional[str] = None,
+        order: str = "asc",
 ) -> ResponseModel:
     """List all movies or filter by query parameters.
     Args:
@@ -46,14 +62,38 @@ async def list_movies(
         release_year: Optional release year to filter movies.
         director_name: Optional director name to filter movies.
         genre: Optional genre to filter movies.
+        cast_member: Optional exact cast member name (case-insensitive)
+            to filter movies.
+        cursor: Opaque keyset cursor. When present (an empty value starts
+            from the beginning) the listing switches to cursor mode: page is
+            ignored, total_items is not computed and next_cursor resumes
+            the crawl.
+        q: Optional search text matched against titles and director
+            names. In page mode without sort, results are ranked by
+            relevance and no next_cursor is returned; an explicit sort
+            overrides relevance and next_cursor is returned. Cursor mode
+            requires sort together with q and answers 422 otherwise.
+        year_from: Optional earliest release year, inclusive.
+        year_to: Optional latest release year, inclusive.
+        min_rating: Optional minimum average rating (1-10); unrated
+            movies are excluded.
+        sort: Optional sort key: id, title, release_year, average_rating
+            or ratings_count. Unrated movies sort as the lowest rated.
+        order: Sort direction, "asc" (default) or "desc".
     Returns:
-        List of movies with their basic information.
+        List of movies with their basic information, served from the list
+        query cache when the same normalized query was answered since the
+        last write.
     """
     # Log the incoming request
     logger.info(
         f"Listing movies (page={page}, page_size={page_size}, "
         f"title={title}, release_year={release_year}, "
-        f"director_name={director_name}, genre={genre}, route=/api/v1/movies)"
+        f"director_name={director_name}, genre={genre}, "
+        f"cast_member={cast_member}, "
+        f"cursor={cursor}, q={q}, year_from={year_from}, "
+        f"year_to={year_to}, min_rating={min_rating}, "
+        f"sort={sort}, order={order}, route=/api/v1/movies)"
     )
     
     # Check for validation of query parameters if needed
@@ -92,43 +132,278 @@ async def list_movies(
             status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
             detail="Genre must be a string."
         )
+    for name, year in (("year_from", year_from), ("year_to", year_to)):
+        if year is not None and not 1888 <= year <= 2100:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+                detail=f"{name} must be an integer between 1888 and 2100"
+            )
+    if min_rating is not None and not 1 <= min_rating <= 10:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail="Minimum rating must be between 1 and 10."
+        )
+
+    # Normalize the parameters that select the same result when spelled
+    # differently, so that they share one cache slot
+    q = q.strip() or None if q else None
+    sort = sort.lower() if sort else None
+    order = order.lower()
     if genre:
-        genre_obj = genre_service.get_genre_by_name(genre)
+        genre_obj = await genre_service.get_genre_by_name(genre)
         if not genre_obj:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Genre '{genre}' not found."
             )
         genre = genre_obj
+    else:
+        genre = None
+
+    # page is meaningless in cursor mode, so it is left out of the key there
+    cache_params = (
+        None if cursor is not None else page,
+        page_size,
+        title,
+        release_year,
+        director_name,
+        genre.id if genre else None,
+        cast_member,
+        cursor,
+        q,
+        year_from,
+        year_to,
+        min_rating,
+        sort,
+        order,
+    )
+    cache_version = await list_query_cache.version()
+    cached_data = await list_query_cache.get(cache_version, cache_params)
+    if cached_data is not None:
+        return ResponseModel(status="success", data=cached_data)
 
-    movies = movie_service.get_movies(
-        page=page,
-        page_size=page_size,
+    filters = dict(
         title=title,
         release_year=release_year,
         director_name=director_name,
         genre=genre,
+        cast_member=cast_member,
+        search=q,
+        year_from=year_from,
+        year_to=year_to,
+        min_rating=min_rating,
+        sort=sort,
+        order=order,
     )
 
+    if cursor is not None:
+        try:
+            movies, next_cursor = await movie_service.get_movies_after(
+                cursor=cursor,
+                page_size=page_size,
+                **filters,
+            )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+                detail=str(e)
+            )
+        movie_responses = [MovieResponse.model_validate(movie) for movie in movies]
+        logger.info(
+            f"Movies retrieved successfully (cursor mode, "
+            f"items={len(movie_responses)}, page_size={page_size})"
+        )
+        data = {
+            "page_size": page_size,
+            "next_cursor": next_cursor,
+            "items": [response.model_dump(mode="json") for response in movie_responses]
+        }
+        await list_query_cache.set(cache_version, cache_params, data)
+        return ResponseModel(
+            status="success",
+            data=data
+        )
+
+    try:
+        movies, total_items = await movie_service.get_movies(
+            page=page,
+            page_size=page_size,
+            **filters,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail=str(e)
+        )
+
     movie_responses = [MovieResponse.model_validate(movie) for movie in movies]
-    total_items = movie_service.count_movies()
+    next_cursor = None
+    # Relevance-ranked search pages are not keyset-addressable
+    if movies and (not q or sort) and page * page_size < total_items:
+        next_cursor = movie_service.cursor_for(movies[-1], sort, order)
     # Log successful retrieval
     logger.info(
         f"Movies retrieved successfully (total_items={total_items}, "
         f"page={page}, page_size={page_size})"
     )
     
+    data = {
+        "page": page,
+        "page_size": page_size,
+        "total_items": total_items,
+        "next_cursor": next_cursor,
+        "items": [response.model_dump(mode="json") for response in movie_responses]
+    }
+    await list_query_cache.set(cache_version, cache_params, data)
+    return ResponseModel(
+        status="success",
+        data=data
+    )
+
+
+@router.get(
+    "/search",
+    response_model = ResponseModel,
+    summary = "Search movies",
+    description = "Typeahead search over titles, cast and director names, served from memory."
+)
+async def search_movies(
+        q: str,
+        genre: Optional[str] = None,
+        year: Optional[int] = None,
+        limit: int = 10,
+        movie_service: MovieService = Depends(get_movie_service)
+) -> ResponseModel:
+    """Search movies in the in-process search index.
+    Args:
+        q: Search text; words match by prefix, and longer words also
+            match with one typo.
+        genre: Optional genre name to filter by.
+        year: Optional release year to filter by.
+        limit: Maximum number of hits.
+        movie_service: The MovieService dependency.
+    Returns:
+        Matching movies ordered by relevance.
+    Raises:
+        HTTPException: 422 if limit is invalid, 503 if the search index is
+            disabled.
+    """
+    if movie_service.search_index is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Movie search index is disabled."
+        )
+    try:
+        hits = movie_service.search_movies(q, genre=genre, year=year, limit=limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail=str(e)
+        )
     return ResponseModel(
         status="success",
         data={
-            "page": page,
-            "page_size": page_size,
-            "total_items": total_items,
-            "items": movie_responses
+            "query": q,
+            "items": [MovieSearchHit(**hit) for hit in hits]
+        }
+    )
+
+
+@router.get(
+    "/trending",
+    response_model = ResponseModel,
+    summary = "Trending movies",
+    description = "Movies rated most in the recent past, ranked in memory with exponential time decay."
+)
+async def trending_movies(
+        limit: int = 10,
+        movie_service: MovieService = Depends(get_movie_service)
+) -> ResponseModel:
+    """List trending movies.
+    Args:
+        limit: Maximum number of movies.
+        movie_service: The MovieService dependency.
+    Returns:
+        Movies ordered by decayed rating activity, with the half-life
+        used for the decay.
+    Raises:
+        HTTPException: 422 if limit is invalid, 503 if trending is disabled.
+    """
+    logger.info(f"Listing trending movies (limit={limit}, route=/api/v1/movies/trending)")
+    if movie_service.trending is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Trending movies are disabled."
+        )
+    try:
+        movies = await movie_service.get_trending(limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail=str(e)
+        )
+    return ResponseModel(
+        status="success",
+        data={
+            "half_life_hours": movie_service.trending.half_life / 3600,
+            "items": [TrendingMovie(**movie) for movie in movies]
         }
     )
 
 
+async def _export_chunks(movie_service: MovieService, format: str) -> AsyncIterator[str]:
+    """Serialize the streamed catalog one batch at a time."""
+    exported = 0
+    if format == "csv":
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_CSV_FIELDS)
+        writer.writeheader()
+        yield buffer.getvalue()
+    async for rows in movie_service.export_catalog(EXPORT_BATCH_SIZE):
+        if format == "csv":
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=EXPORT_CSV_FIELDS)
+            # Genres use the "|" separator understood by scripts/import_catalog.py
+            writer.writerows({**row, "genres": "|".join(row["genres"])} for row in rows)
+            yield buffer.getvalue()
+        else:
+            yield "".join(json.dumps(row) + "\n" for row in rows)
+        exported += len(rows)
+    logger.info(f"Catalog export finished (format={format}, movies={exported})")
+
+
+@router.get(
+    "/export",
+    summary = "Export the catalog",
+    description = "Stream every movie with director, genres and rating aggregates as NDJSON or CSV."
+)
+async def export_movies(
+        format: str = "ndjson",
+        movie_service: MovieService = Depends(get_export_movie_service)
+) -> StreamingResponse:
+    """Stream the whole catalog.
+    Args:
+        format: "ndjson" (one JSON object per line) or "csv".
+        movie_service: MovieService bound to a dedicated export session.
+    Returns:
+        A streaming response fed from a server-side cursor, so memory use
+        does not depend on the size of the catalog.
+    Raises:
+        HTTPException: 422 if the format is not supported.
+    """
+    if format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail="Format must be 'ndjson' or 'csv'."
+        )
+    logger.info(f"Exporting catalog (format={format}, route=/api/v1/movies/export)")
+    return StreamingResponse(
+        _export_chunks(movie_service, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="movies.{format}"'},
+    )
+
+
 @router.get(
     "/{movie_id}",
     response_model = ResponseModel,
@@ -144,11 +419,20 @@ async def get_movie_by_id(
         movie_id: The movie ID
         movie_service: The MovieService dependency.
     Returns:
-        The movie with the specified ID.
+        The movie with the specified ID, served from the movie detail
+        cache when possible.
     Raises:
         HTTPException: 404 if movie not found
     """
-    movie = movie_service.get_movie_by_id(movie_id)
+    cached_response = movie_detail_cache.get(movie_id)
+    if cached_response is not None:
+        return ResponseModel(
+            status="success",
+            data=cached_response
+        )
+
+    cache_epoch = movie_detail_cache.epoch
+    movie = await movie_service.get_movie_by_id(movie_id)
 
     if movie is None:
         raise HTTPException(
@@ -157,6 +441,7 @@ async def get_movie_by_id(
         )
 
     movie_response = MovieResponse.model_validate(movie).model_dump()
+    movie_detail_cache.set(movie_id, movie_response, epoch=cache_epoch)
     return ResponseModel(
         status="success",
         data=movie_response
@@ -188,12 +473,12 @@ async def create_movie(
         HTTPException: 422 for validation errors
     """
     try:
-        new_movie = movie_service.create_movie(
+        new_movie = await movie_service.create_movie(
             title=movie_create.title,
             director_id=movie_create.director_id,
             release_year=movie_create.release_year,
             cast=movie_create.cast,
-            genre=genre_service.genre_ids_to_genre_list(movie_create.genres),
+            genre=await genre_service.genre_ids_to_genre_list(movie_create.genres),
         )
     except UniquenessError as e:
         raise HTTPException(
@@ -240,9 +525,9 @@ async def update_movie(
         # Convert genre IDs to Genre objects if provided
         genres = None
         if movie_update.genres is not None:
-            genres = genre_service.genre_ids_to_genre_list(movie_update.genres)
+            genres = await genre_service.genre_ids_to_genre_list(movie_update.genres)
         
-        updated_movie = movie_service.update_movie(
+        updated_movie = await movie_service.update_movie(
             movie_id=movie_id,
             title=movie_update.title,
             director_id=movie_update.director_id,
@@ -286,7 +571,7 @@ async def delete_movie(
         HTTPException: 404 if movie not found
     """
     try:
-        movie_service.delete_movie(movie_id)
+        await movie_service.delete_movie(movie_id)
     except ExistanceError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -306,18 +591,22 @@ async def delete_movie(
 async def create_rating(
         movie_id: int,
         rating_create: RatingCreate,
+        response: Response,
         rating_service: RatingService = Depends(get_rating_service)
 ) -> ResponseModel:
     """Create a new rating for a movie.
     Args:
         movie_id: The movie ID
         rating_create: The rating creation data.
+        response: The outgoing response, used to signal 202 in write-behind mode.
         rating_service: The RatingService dependency.
     Returns:
-        The created rating.
+        The created rating, or the queued rating with status 202 when
+        write-behind batching is enabled.
     Raises:
         HTTPException: 404 if movie not found
         HTTPException: 422 if score is invalid
+        HTTPException: 503 if the write-behind queue is full
     """
     # Log the incoming rating request
     logger.info(
@@ -326,10 +615,17 @@ async def create_rating(
     )
     
     try:
-        new_rating = rating_service.create_rating(
-            movie_id=movie_id,
-            score=rating_create.score
-        )
+        if rating_service.rating_buffer is not None:
+            await rating_service.enqueue_rating(
+                movie_id=movie_id,
+                score=rating_create.score
+            )
+            new_rating = None
+        else:
+            new_rating = await rating_service.create_rating(
+                movie_id=movie_id,
+                score=rating_create.score
+            )
         
         # Log successful rating save
         logger.info(
@@ -355,6 +651,16 @@ async def create_rating(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail=str(e)
         )
+    except CapacityError as e:
+        # Log warning when the write-behind queue applies backpressure
+        logger.warning(
+            f"Rating queue full (movie_id={movie_id}, rating={rating_create.score})"
+        )
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"}
+        )
     except Exception as e:
         # Log any unexpected errors
         logger.error(
@@ -362,8 +668,55 @@ async def create_rating(
         )
         raise
 
+    if new_rating is None:
+        response.status_code = status.HTTP_202_ACCEPTED
+        return ResponseModel(
+            status="success",
+            data={"movie_id": movie_id, "score": rating_create.score, "queued": True}
+        )
+
     rating_response = RatingResponse.model_validate(new_rating).model_dump()
     return ResponseModel(
         status="success",
         data=rating_response
     )
+
+
+@router.get(
+    "/{movie_id}/ratings/histogram",
+    response_model=ResponseModel,
+    summary="Get the rating distribution of a movie",
+    description="Number of ratings per score bucket from 1 to 10, read from precomputed counts."
+)
+async def get_rating_histogram(
+        movie_id: int,
+        rating_service: RatingService = Depends(get_rating_service)
+) -> ResponseModel:
+    """Get the rating histogram of a movie.
+    Args:
+        movie_id: The movie ID
+        rating_service: The RatingService dependency.
+    Returns:
+        The total number of ratings and the count of every score bucket.
+    Raises:
+        HTTPException: 404 if movie not found
+    """
+    logger.info(
+        f"Getting rating histogram (movie_id={movie_id}, "
+        f"route=/api/v1/movies/{movie_id}/ratings/histogram)"
+    )
+    try:
+        buckets = await rating_service.get_rating_histogram(movie_id)
+    except ExistanceError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    return ResponseModel(
+        status="success",
+        data={
+            "movie_id": movie_id,
+            "ratings_count": sum(bucket["count"] for bucket in buckets),
+            "buckets": [RatingHistogramBucket(**bucket) for bucket in buckets]
+        }
+    )
@@ -0,0 +1,184 @@
+import json
+from typing import Any, AsyncIterator
+
+from fastapi import APIRouter, Depends, HTTPException, status, Request
+from pydantic import ValidationError
+
+from app.api.v1.dependencies import *
+from app.api.v1.schemas import *
+from app.services import *
+from app.utils.logging_config import logger
+
+router = APIRouter(
+    prefix = "/ratings",
+    tags = ["ratings"],
+)
+
+# Number of rows validated and inserted per transaction
+BATCH_CHUNK_SIZE = 1000
+# Per-row errors reported in one response; further errors are only counted
+MAX_REPORTED_ERRORS = 1000
+
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/jsonl", "application/ndjson")
+
+
+class BatchResult:
+    """Running totals of a batch submission, reported in the response."""
+
+    def __init__(self):
+        self.received = 0
+        self.inserted = 0
+        self.failed = 0
+        self.errors: list[dict] = []
+
+    def add_error(self, index: int, error: str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"index": index, "error": error})
+
+    def to_dict(self) -> dict:
+        return {
+            "received": self.received,
+            "inserted": self.inserted,
+            "failed": self.failed,
+            "errors": sorted(self.errors, key=lambda error: error["index"]),
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+async def _write_chunk(rating_service: RatingService, chunk: list[tuple[int, Any]],
+                       result: BatchResult) -> None:
+    """Validate a chunk of raw rows and insert the valid ones in one transaction.
+
+    Args:
+        rating_service: The RatingService used to insert the ratings.
+        chunk: Pairs of (row index in the submission, raw decoded row).
+        result: Totals updated in place.
+    """
+    indexes = []
+    ratings = []
+    for index, row in chunk:
+        try:
+            item = RatingBatchItem.model_validate(row)
+        except ValidationError as e:
+            result.add_error(index, "; ".join(
+                f"{'.'.join(str(p) for p in err['loc']) or 'row'}: {err['msg']}"
+                for err in e.errors()
+            ))
+            continue
+        indexes.append(index)
+        ratings.append({"movie_id": item.movie_id, "score": item.score})
+    errors = await rating_service.create_ratings_bulk(ratings)
+    for error in errors:
+        result.add_error(indexes[error["index"]], error["error"])
+    result.inserted += len(ratings) - len(errors)
+
+
+async def _ndjson_rows(request: Request) -> AsyncIterator[tuple[int, Any]]:
+    """Decode an NDJSON request body line by line as it arrives.
+
+    Yields:
+        Pairs of (line index, decoded row); undecodable lines yield the
+        exception instead of a row.
+    """
+    buffer = b""
+    index = 0
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield index, _decode_line(line)
+                index += 1
+    if buffer.strip():
+        yield index, _decode_line(buffer)
+
+
+def _decode_line(line: bytes) -> Any:
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        return e
+
+
+@router.post(
+    ":batch",
+    response_model = ResponseModel,
+    summary = "Submit ratings in bulk",
+    description = (
+        "Create many ratings in one request. Send a JSON object "
+        "{\"ratings\": [{\"movie_id\": 1, \"score\": 8}, ...]} or stream one "
+        "rating object per line with Content-Type application/x-ndjson. "
+        "Invalid rows are reported individually and do not abort the batch."
+    ),
+    openapi_extra = {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": RatingBatchCreate.model_json_schema(),
+                },
+                "application/x-ndjson": {
+                    "schema": {"type": "string", "format": "binary"},
+                },
+            },
+        }
+    },
+)
+async def create_ratings_batch(
+        request: Request,
+        rating_service: RatingService = Depends(get_rating_service)
+) -> ResponseModel:
+    """Create ratings in bulk from a JSON array or an NDJSON stream.
+    Args:
+        request: The incoming request, read as JSON or streamed as NDJSON.
+        rating_service: The RatingService dependency.
+    Returns:
+        Counts of received, inserted and failed rows, with per-row errors.
+    Raises:
+        HTTPException: 422 if a JSON body is not a valid batch
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    streaming = content_type in NDJSON_CONTENT_TYPES
+    logger.info(
+        f"Rating batch received (mode={'ndjson' if streaming else 'json'}, "
+        f"route=/api/v1/ratings:batch)"
+    )
+
+    result = BatchResult()
+    chunk: list[tuple[int, Any]] = []
+    if streaming:
+        async for index, row in _ndjson_rows(request):
+            result.received += 1
+            if isinstance(row, ValueError):
+                result.add_error(index, f"Invalid JSON: {row}")
+                continue
+            chunk.append((index, row))
+            if len(chunk) >= BATCH_CHUNK_SIZE:
+                await _write_chunk(rating_service, chunk, result)
+                chunk = []
+    else:
+        try:
+            batch = RatingBatchCreate.model_validate_json(await request.body())
+        except ValidationError as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+                detail=str(e.errors())
+            )
+        result.received = len(batch.ratings)
+        for index, row in enumerate(batch.ratings):
+            chunk.append((index, row))
+            if len(chunk) >= BATCH_CHUNK_SIZE:
+                await _write_chunk(rating_service, chunk, result)
+                chunk = []
+    if chunk:
+        await _write_chunk(rating_service, chunk, result)
+
+    logger.info(
+        f"Rating batch processed (received={result.received}, "
+        f"inserted={result.inserted}, failed={result.failed})"
+    )
+    return ResponseModel(
+        status="success",
+        data=result.to_dict()
+    )
@@ -1,9 +1,11 @@
-from .services import get_db, get_genre_service, get_movie_service, get_director_service, get_rating_service
+from .services import get_db, get_genre_service, get_movie_service, get_export_movie_service, get_director_service, get_rating_service, rating_write_buffer
 
 __all__ = [
     "get_db",
     "get_genre_service",
     "get_movie_service",
+    "get_export_movie_service",
     "get_director_service",
     "get_rating_service",
+    "rating_write_buffer",
 ]
\ No newline at end of file
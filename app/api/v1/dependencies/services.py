@@ -1,70 +1,80 @@
-from typing import Generator
-from sqlalchemy.orm import Session
+from typing import AsyncGenerator
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Depends
 
 from app.db.session import SessionLocal
 from app.repositories import *
 from app.services import *
+from app.services.rating_write_buffer import RATING_WRITE_BEHIND
+from app.search import movie_search_index
+from app.leaderboards import movie_leaderboards, movie_trending
+from app.cache import genre_cache
 
+# Process-wide write-behind buffer for ratings, enabled with RATING_WRITE_BEHIND
+rating_write_buffer = (
+    RatingWriteBuffer(SessionLocal, leaderboards=movie_leaderboards, trending=movie_trending)
+    if RATING_WRITE_BEHIND else None
+)
 
-def get_db() -> Generator:
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Dependency for getting database session.
 
     Yields:
-        Database session that is automatically closed after request.
+        Async database session that is automatically closed after request.
     """
-    db = SessionLocal()
-    try:
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
-def get_movie_service(db: Session = Depends(get_db)) -> MovieService:
+async def get_movie_service(db: AsyncSession = Depends(get_db)) -> MovieService:
     """Dependency for getting MovieService.
 
     Args:
         db: Database session (injected by FastAPI)
     Returns:
         MovieService instance with repository dependencies."""
-    if db is None:
-        db = next(get_db())
     movie_repo = MovieRepository(db)
     director_repo = DirectorRepository(db)
-    return MovieService(movie_repo, director_repo)
+    return MovieService(movie_repo, director_repo, movie_search_index, movie_leaderboards, movie_trending)
+
+async def get_export_movie_service() -> AsyncGenerator[MovieService, None]:
+    """Dependency for getting a MovieService for streaming exports.
+
+    The service gets a dedicated session that reads from a replica when
+    one is configured and stays open until the response has been sent.
+
+    Yields:
+        MovieService instance bound to the export session."""
+    async with SessionLocal(replica_reads=True) as db:
+        yield MovieService(MovieRepository(db))
 
-def get_director_service(db: Session = Depends(get_db)) -> DirectorService:
+async def get_director_service(db: AsyncSession = Depends(get_db)) -> DirectorService:
     """Dependency for getting DirectorService.
 
     Args:
         db: Database session (injected by FastAPI)
     Returns:
         DirectorService instance with repository dependencies."""
-    if db is None:
-        db = next(get_db())
     director_repo = DirectorRepository(db)
     return DirectorService(director_repo)
 
-def get_genre_service(db: Session = Depends(get_db)) -> GenreService:
+async def get_genre_service(db: AsyncSession = Depends(get_db)) -> GenreService:
     """Dependency for getting GenreService.
 
     Args:
         db: Database session (injected by FastAPI)
     Returns:
         GenreService instance with repository dependencies."""
-    if db is None:
-        db = next(get_db())
     genre_repo = GenreRepository(db)
-    return GenreService(genre_repo)
+    return GenreService(genre_repo, genre_cache)
 
-def get_rating_service(db: Session = Depends(get_db)) -> RatingService:
+async def get_rating_service(db: AsyncSession = Depends(get_db)) -> RatingService:
     """Dependency for getting RatingService.
 
     Args:
         db: Database session (injected by FastAPI)
     Returns:
         RatingService instance with repository dependencies."""
-    if db is None:
-        db = next(get_db())
     rating_repo = RatingRepository(db)
     movie_repo = MovieRepository(db)
-    return RatingService(rating_repo, movie_repo)
+    return RatingService(rating_repo, movie_repo, rating_write_buffer, movie_leaderboards, movie_trending)
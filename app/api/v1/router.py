@@ -7,4 +7,12 @@ api_router = APIRouter()
 api_router.include_router(
     router,
     tags=["movies"]
-)
\ No newline at end of file
+)
+api_router.include_router(
+    rating_router,
+    tags=["ratings"]
+)
+api_router.include_router(
+    leaderboard_router,
+    tags=["leaderboards"]
+)
@@ -1,9 +1,11 @@
 from .movie import MovieBase, MovieCreate, MovieUpdate
-from .rating import RatingCreate
+from .rating import RatingCreate, RatingBatchItem, RatingBatchCreate
 
 __all__ = [
     "MovieBase",
     "MovieCreate",
     "MovieUpdate",
     "RatingCreate",
+    "RatingBatchItem",
+    "RatingBatchCreate",
 ]
\ No newline at end of file
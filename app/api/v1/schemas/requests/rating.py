@@ -1,3 +1,5 @@
+from typing import Any
+
 from pydantic import BaseModel, Field
 
 
@@ -8,3 +10,23 @@ class RatingCreate(BaseModel):
     - score: required, between 1 and 10
     """
     score: float = Field(..., ge=1, le=10, description="Rating score (1-10)")
+
+
+class RatingBatchItem(BaseModel):
+    """Schema for one rating inside a batch submission.
+
+    Validates:
+    - movie_id: required
+    - score: required, between 1 and 10
+    """
+    movie_id: int = Field(..., description="ID of the movie being rated")
+    score: float = Field(..., ge=1, le=10, description="Rating score (1-10)")
+
+
+class RatingBatchCreate(BaseModel):
+    """Schema for a JSON batch of ratings.
+
+    Items are validated one by one as RatingBatchItem, so a bad row is
+    reported on its own instead of rejecting the whole batch.
+    """
+    ratings: list[Any] = Field(..., description="Ratings to create, each with movie_id and score")
@@ -1,14 +1,19 @@
 from .director import DirectorBase, DirectorResponse
-from .movie import MovieBase, MovieResponse
+from .leaderboard import LeaderboardItem
+from .movie import MovieBase, MovieResponse, MovieSearchHit, TrendingMovie
 from .response import ResponseModel
-from .rating import RatingResponse
+from .rating import RatingHistogramBucket, RatingResponse
 
 
 __all__ = [
     "DirectorBase",
     "DirectorResponse",
+    "LeaderboardItem",
     "MovieBase",
     "MovieResponse",
+    "MovieSearchHit",
+    "TrendingMovie",
     "ResponseModel",
+    "RatingHistogramBucket",
     "RatingResponse",
 ]
\ No newline at end of file
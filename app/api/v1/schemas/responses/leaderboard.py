@@ -0,0 +1,14 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class LeaderboardItem(BaseModel):
+    """Schema for a ranked movie of a leaderboard."""
+    rank: int = Field(..., description="1-based position on the leaderboard")
+    id: int = Field(..., description="Unique identifier for the movie")
+    title: str = Field(..., description="Movie title")
+    release_year: Optional[int] = Field(None, description="Year the movie was released")
+    ratings_count: int = Field(..., description="Number of ratings of the movie")
+    average_rating: float = Field(..., description="Plain average rating score")
+    score: float = Field(..., description="Bayesian weighted score the movie is ranked by")
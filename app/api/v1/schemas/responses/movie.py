@@ -1,6 +1,6 @@
 from typing import Optional
 
-from pydantic import BaseModel, Field, ConfigDict, field_validator, model_validator
+from pydantic import BaseModel, Field, ConfigDict, field_validator
 
 from app.models import Genre, Movie, Director
 from .director import DirectorResponse
@@ -16,6 +16,23 @@ class MovieBase(BaseModel):
     average_rating: Optional[float] = Field(None, description="Average rating score")
     ratings_count: int = Field(0, description="Number of ratings")
 
+class MovieSearchHit(BaseModel):
+    """Schema for a movie returned by the in-process search index."""
+    id: int = Field(..., description="Unique identifier for the movie")
+    title: str = Field(..., description="Movie title")
+    release_year: Optional[int] = Field(None, description="Year the movie was released")
+    director_name: Optional[str] = Field(None, description="Name of the movie's director")
+    genres: list[str] = Field([], description="List of genre names associated with the movie")
+    score: float = Field(..., description="Relevance score, higher is better")
+
+class TrendingMovie(BaseModel):
+    """Schema for a movie returned by the trending endpoint."""
+    id: int = Field(..., description="Unique identifier for the movie")
+    title: str = Field(..., description="Movie title")
+    release_year: Optional[int] = Field(None, description="Year the movie was released")
+    trend_score: float = Field(..., description="Number of ratings, exponentially decayed by age")
+    recent_average: Optional[float] = Field(None, description="Average score weighted by the same decay")
+
 class MovieResponse(MovieBase):
     """Schema for Movie response.
 
@@ -28,16 +45,8 @@ class MovieResponse(MovieBase):
     def extract_genre_names(cls, v):
         return [genre.name for genre in v]
 
-    @model_validator(mode='before')
+    @field_validator('average_rating', mode='after')
     @classmethod
-    def compute_ratings(cls, data):
-        """Calculate average rating and count from ratings relationship."""
-        if hasattr(data, 'ratings'):
-            ratings = data.ratings
-            if ratings:
-                data.average_rating = round(sum(r.score for r in ratings) / len(ratings), 1)
-                data.ratings_count = len(ratings)
-            else:
-                data.average_rating = None
-                data.ratings_count = 0
-        return data
+    def round_average_rating(cls, v):
+        """Round the SQL-computed average rating to one decimal place."""
+        return round(v, 1) if v is not None else None
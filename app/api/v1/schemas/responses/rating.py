@@ -1,3 +1,6 @@
+from datetime import datetime
+from typing import Optional
+
 from pydantic import BaseModel, Field, ConfigDict
 
 
@@ -6,5 +9,12 @@ class RatingResponse(BaseModel):
     id: int = Field(..., description="Unique identifier for the rating")
     movie_id: int = Field(..., description="ID of the movie being rated")
     score: float = Field(..., description="Rating score (1-10)")
+    created_at: Optional[datetime] = Field(None, description="When the rating was submitted")
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class RatingHistogramBucket(BaseModel):
+    """Schema for the number of ratings of a movie in one score bucket."""
+    score: int = Field(..., description="Bucket score; counts ratings from score up to score + 1")
+    count: int = Field(..., description="Number of ratings in the bucket")
@@ -0,0 +1,17 @@
+from .lru import TTLLRUCache
+from .backends import CacheBackend, InMemoryCacheBackend, RedisCacheBackend
+from .query_cache import VersionedQueryCache
+from .genre_cache import GenreCache
+from .caches import movie_detail_cache, list_query_cache, genre_cache
+
+__all__ = [
+    "TTLLRUCache",
+    "CacheBackend",
+    "InMemoryCacheBackend",
+    "RedisCacheBackend",
+    "VersionedQueryCache",
+    "GenreCache",
+    "movie_detail_cache",
+    "list_query_cache",
+    "genre_cache",
+]
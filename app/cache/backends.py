@@ -0,0 +1,92 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from .lru import TTLLRUCache
+
+
+class CacheBackend(ABC):
+    """Key/value store shared by the query caches.
+
+    Values are strings; counters are integers stored under their own keys.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[str]:
+        """Return the value stored under key, or None."""
+
+    @abstractmethod
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        """Store value under key for ttl seconds."""
+
+    @abstractmethod
+    async def incr(self, key: str) -> int:
+        """Atomically increment the counter under key and return its new value."""
+
+    async def close(self) -> None:
+        """Release connections held by the backend."""
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """Process-local backend built on TTLLRUCache.
+
+    Every worker has its own copy, so writes made through one worker do not
+    invalidate another worker's entries. Use the Redis backend when running
+    several workers.
+    """
+
+    def __init__(self, max_size: int = 4096):
+        """Initialize the backend.
+
+        Args:
+            max_size: Maximum number of values kept.
+        """
+        self._values = TTLLRUCache(max_size=max_size)
+        self._counters: dict[str, int] = {}
+
+    async def get(self, key: str) -> Optional[str]:
+        if key in self._counters:
+            return str(self._counters[key])
+        return self._values.get(key)
+
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        self._values.ttl = ttl
+        self._values.set(key, value)
+
+    async def incr(self, key: str) -> int:
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+
+class RedisCacheBackend(CacheBackend):
+    """Backend speaking the Redis protocol, shared by every worker.
+
+    Requires the optional redis package (pip install redis).
+    """
+
+    def __init__(self, url: str):
+        """Initialize the backend.
+
+        Args:
+            url: Redis URL, e.g. redis://localhost:6379/0.
+        Raises:
+            RuntimeError: If the redis package is not installed.
+        """
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError as e:
+            raise RuntimeError(
+                "CACHE_BACKEND=redis requires the 'redis' package (pip install redis)."
+            ) from e
+        self._client = redis_asyncio.from_url(url, decode_responses=True)
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self._client.get(key)
+
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        await self._client.set(key, value, px=int(ttl * 1000))
+
+    async def incr(self, key: str) -> int:
+        return await self._client.incr(key)
+
+    async def close(self) -> None:
+        await self._client.aclose()
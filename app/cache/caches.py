@@ -0,0 +1,54 @@
+import os
+
+from dotenv import load_dotenv
+
+from .backends import CacheBackend, InMemoryCacheBackend, RedisCacheBackend
+from .genre_cache import GenreCache
+from .lru import TTLLRUCache
+from .query_cache import VersionedQueryCache
+
+load_dotenv()
+MOVIE_DETAIL_CACHE_SIZE = int(os.getenv("MOVIE_DETAIL_CACHE_SIZE", "1024"))
+MOVIE_DETAIL_CACHE_TTL = float(os.getenv("MOVIE_DETAIL_CACHE_TTL", "60"))
+GENRE_CACHE_REFRESH_INTERVAL = float(os.getenv("GENRE_CACHE_REFRESH_INTERVAL", "300"))
+
+# Serialized MovieResponse payloads keyed by movie id. Per process: writes
+# made through another worker are only picked up once the TTL expires.
+movie_detail_cache = TTLLRUCache(
+    max_size=MOVIE_DETAIL_CACHE_SIZE,
+    ttl=MOVIE_DETAIL_CACHE_TTL,
+)
+
+# "memory" keeps list results per process; "redis" shares them between
+# workers and hosts through CACHE_REDIS_URL.
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory").lower()
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+LIST_CACHE_SIZE = int(os.getenv("LIST_CACHE_SIZE", "4096"))
+LIST_CACHE_TTL = float(os.getenv("LIST_CACHE_TTL", "30"))
+
+
+def create_cache_backend() -> CacheBackend:
+    """Build the shared cache backend selected by CACHE_BACKEND.
+
+    Returns:
+        The configured cache backend.
+    Raises:
+        ValueError: If CACHE_BACKEND names an unknown backend.
+    """
+    if CACHE_BACKEND == "memory":
+        return InMemoryCacheBackend(max_size=LIST_CACHE_SIZE)
+    if CACHE_BACKEND == "redis":
+        return RedisCacheBackend(CACHE_REDIS_URL)
+    raise ValueError(f"Unknown CACHE_BACKEND '{CACHE_BACKEND}', expected 'memory' or 'redis'.")
+
+
+# Serialized movie list pages keyed by their normalized query parameters.
+# Bumped on every movie, genre or rating write.
+list_query_cache = VersionedQueryCache(
+    backend=create_cache_backend(),
+    namespace="movies:list",
+    ttl=LIST_CACHE_TTL,
+)
+
+# Every genre by id and name, loaded at startup and used by GenreService
+genre_cache = GenreCache(refresh_interval=GENRE_CACHE_REFRESH_INTERVAL)
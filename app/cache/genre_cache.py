@@ -0,0 +1,72 @@
+import time
+from typing import Iterable, Optional
+
+from app.models import Genre
+
+
+class GenreCache:
+    """Process-wide dictionary of every genre, by id and by name.
+
+    Holds detached Genre instances, so only their column attributes may be
+    used. The whole table is replaced on each load; load() is called at
+    startup, after create_genre and once the refresh interval has passed.
+
+    Attributes:
+        refresh_interval: Seconds after which the dictionary is considered
+            stale and reloaded on next use; 0 disables periodic refreshes.
+        loaded_at: Monotonic time of the last load, or None.
+    """
+
+    def __init__(self, refresh_interval: float = 300.0):
+        """Initialize an empty cache.
+
+        Args:
+            refresh_interval: Seconds between reloads; 0 disables them.
+        """
+        self.refresh_interval = refresh_interval
+        self.loaded_at: Optional[float] = None
+        self._by_id: dict[int, Genre] = {}
+        self._by_name: dict[str, Genre] = {}
+        self.loads = 0
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    @property
+    def loaded(self) -> bool:
+        return self.loaded_at is not None
+
+    def is_stale(self) -> bool:
+        """Whether the dictionary is missing or older than refresh_interval."""
+        if self.loaded_at is None:
+            return True
+        return bool(self.refresh_interval) and (
+            time.monotonic() - self.loaded_at >= self.refresh_interval
+        )
+
+    def load(self, genres: Iterable[Genre]) -> None:
+        """Replace the dictionary with the given genres.
+
+        Args:
+            genres: Every genre in the database.
+        """
+        genres = list(genres)
+        self._by_id = {genre.id: genre for genre in genres}
+        self._by_name = {genre.name: genre for genre in genres}
+        self.loaded_at = time.monotonic()
+        self.loads += 1
+
+    def get_by_id(self, genre_id: int) -> Optional[Genre]:
+        return self._by_id.get(genre_id)
+
+    def get_by_name(self, name: str) -> Optional[Genre]:
+        return self._by_name.get(name)
+
+    def stats(self) -> dict:
+        """Return size and freshness information."""
+        return {
+            "size": len(self._by_id),
+            "loads": self.loads,
+            "age_seconds": round(time.monotonic() - self.loaded_at, 3) if self.loaded_at is not None else None,
+            "refresh_interval": self.refresh_interval,
+        }
@@ -0,0 +1,97 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLLRUCache:
+    """Bounded least-recently-used cache whose entries expire after a TTL.
+
+    Meant to be used from the event loop; it does no locking of its own.
+    Every invalidation advances an epoch, and set() can be given the epoch
+    observed before loading a value so that a value loaded concurrently
+    with an invalidation is never stored.
+
+    Attributes:
+        max_size: Maximum number of entries kept.
+        ttl: Seconds an entry stays valid.
+        hits: Number of lookups answered from the cache.
+        misses: Number of lookups that found no valid entry.
+        evictions: Number of entries dropped to respect max_size.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 60.0):
+        """Initialize the cache.
+
+        Args:
+            max_size: Maximum number of entries kept.
+            ttl: Seconds an entry stays valid.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self.epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None if absent or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, epoch: Optional[int] = None) -> None:
+        """Store a value, evicting the least recently used entries if full.
+
+        Args:
+            key: Cache key.
+            value: Value to store.
+            epoch: Epoch read before the value was loaded; the value is
+                discarded if anything was invalidated since then.
+        """
+        if epoch is not None and epoch != self.epoch:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, *keys: Hashable) -> None:
+        """Drop the given keys."""
+        self.epoch += 1
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self.epoch += 1
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """Return size and hit/miss/eviction counters."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
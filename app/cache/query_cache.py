@@ -0,0 +1,140 @@
+import hashlib
+import json
+from typing import Any, Optional
+
+from app.utils.logging_config import logger
+from .backends import CacheBackend
+
+
+class VersionedQueryCache:
+    """Cache of query results invalidated by bumping a version stamp.
+
+    Every key embeds the current version, read from the backend on each
+    lookup. A write bumps the version, which makes every earlier entry
+    unreachable at once; the old entries simply expire. A result loaded
+    before a bump is stored under the old version and is never served.
+
+    Backend errors are logged and treated as misses so that the cache can
+    never take the API down. If a bump fails, the cache is bypassed
+    until the version is advanced successfully, so that results loaded
+    before the write are not served in the meantime.
+
+    Attributes:
+        namespace: Prefix of every key written by this cache.
+        ttl: Seconds an entry is kept.
+    """
+
+    def __init__(self, backend: CacheBackend, namespace: str, ttl: float = 30.0):
+        """Initialize the cache.
+
+        Args:
+            backend: Storage backend.
+            namespace: Prefix of every key written by this cache.
+            ttl: Seconds an entry is kept.
+        """
+        self.backend = backend
+        self.namespace = namespace
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        # Set while a failed bump still has to be applied
+        self._bump_pending = False
+
+    @property
+    def version_key(self) -> str:
+        return f"{self.namespace}:version"
+
+    async def version(self) -> Optional[str]:
+        """Return the current version stamp, or None if the cache is unusable.
+
+        The cache is unusable when the backend fails or when a failed bump
+        could not be retried yet.
+        """
+        if self._bump_pending and not await self.bump():
+            return None
+        try:
+            return await self.backend.get(self.version_key) or "0"
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Query cache version lookup failed ({self.namespace}): {str(e)}")
+            return None
+
+    def key_for(self, version: str, params: tuple) -> str:
+        """Build the cache key of normalized query parameters at a version."""
+        digest = hashlib.sha1(
+            json.dumps(params, separators=(",", ":"), default=str).encode("utf-8")
+        ).hexdigest()
+        return f"{self.namespace}:v{version}:{digest}"
+
+    async def get(self, version: Optional[str], params: tuple) -> Optional[Any]:
+        """Return the cached result for params at version, or None.
+
+        Args:
+            version: Version stamp returned by version().
+            params: Normalized query parameters.
+        """
+        if version is None:
+            return None
+        try:
+            cached = await self.backend.get(self.key_for(version, params))
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Query cache lookup failed ({self.namespace}): {str(e)}")
+            return None
+        if cached is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(cached)
+
+    async def set(self, version: Optional[str], params: tuple, result: Any) -> None:
+        """Store a JSON-serializable result for params at version.
+
+        Args:
+            version: Version stamp read before the result was loaded.
+            params: Normalized query parameters.
+            result: Result to store.
+        """
+        if version is None:
+            return
+        try:
+            await self.backend.set(
+                self.key_for(version, params),
+                json.dumps(result, separators=(",", ":")),
+                self.ttl,
+            )
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Query cache store failed ({self.namespace}): {str(e)}")
+
+    async def bump(self) -> bool:
+        """Invalidate every cached result by advancing the version stamp.
+
+        On failure the cache is bypassed until a later bump succeeds.
+
+        Returns:
+            True if the version was advanced.
+        """
+        try:
+            await self.backend.incr(self.version_key)
+        except Exception as e:
+            self.errors += 1
+            self._bump_pending = True
+            logger.error(f"Query cache invalidation failed ({self.namespace}): {str(e)}")
+            return False
+        self._bump_pending = False
+        return True
+
+    def stats(self) -> dict:
+        """Return hit/miss/error counters."""
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "errors": self.errors,
+            "bump_pending": self._bump_pending,
+        }
@@ -0,0 +1,94 @@
+import os
+import time
+from typing import Any
+
+from dotenv import load_dotenv
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+
+load_dotenv()
+# "queue" keeps a pool per worker; "null" opens a connection per checkout and
+# leaves pooling to an external pooler such as PgBouncer.
+DB_POOL_MODE = os.getenv("DB_POOL_MODE", "queue").lower()
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool that records how long checkouts wait.
+
+    Attributes:
+        checkouts: Number of successful checkouts.
+        timeouts: Number of checkouts that gave up after pool_timeout.
+        wait_total: Total seconds spent waiting for connections.
+        wait_max: Longest single wait in seconds.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        waited = time.perf_counter() - start
+        self.checkouts += 1
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+        return connection
+
+
+def engine_pool_options() -> dict[str, Any]:
+    """Build create_async_engine pool arguments from the DB_POOL_* settings.
+
+    Returns:
+        Keyword arguments selecting and sizing the connection pool.
+    """
+    if DB_POOL_MODE == "null":
+        return {"poolclass": NullPool, "pool_pre_ping": DB_POOL_PRE_PING}
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
+def pool_status(engine: AsyncEngine) -> dict[str, Any]:
+    """Report live statistics of an engine's connection pool.
+
+    Args:
+        engine: Async engine whose pool is inspected.
+    Returns:
+        Pool occupancy and checkout wait statistics.
+    """
+    pool = engine.pool
+    if not isinstance(pool, InstrumentedQueuePool):
+        return {"mode": DB_POOL_MODE, "class": type(pool).__name__}
+    return {
+        "mode": "queue",
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        # overflow() is negative while the pool is below pool_size
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": DB_MAX_OVERFLOW,
+        "timeout": DB_POOL_TIMEOUT,
+        "checkouts": pool.checkouts,
+        "timeouts": pool.timeouts,
+        "wait_avg_ms": round(pool.wait_total / pool.checkouts * 1000, 3) if pool.checkouts else 0.0,
+        "wait_max_ms": round(pool.wait_max * 1000, 3),
+    }
@@ -0,0 +1,67 @@
+import functools
+import random
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Sequence, TypeVar
+
+from sqlalchemy import Delete, Insert, Update
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+
+T = TypeVar("T")
+
+# Set while a read-only service method runs; reads are then served by a replica
+_replica_reads: ContextVar[bool] = ContextVar("replica_reads", default=False)
+
+
+def replica_read(method: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    """Mark an async service method as read-only so it may use a replica.
+
+    The session still falls back to the primary once it has written
+    anything, so reads after a write in the same request see that write.
+    """
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs) -> T:
+        token = _replica_reads.set(True)
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            _replica_reads.reset(token)
+    return wrapper
+
+
+class RoutingSession(Session):
+    """Session that sends replica-safe reads to read replicas.
+
+    Statements go to the primary unless they run inside a replica_read
+    method or the session was opened with replica_reads=True. Flushes and
+    INSERT/UPDATE/DELETE statements always go to the primary and pin the
+    session to it for the rest of its life.
+    """
+
+    def __init__(self, *args, primary: AsyncEngine,
+                 replicas: Sequence[AsyncEngine] = (),
+                 replica_reads: bool = False, **kwargs):
+        """Initialize the session.
+
+        Args:
+            primary: Engine for writes and for reads outside replica_read.
+            replicas: Engines serving replica reads; when empty everything
+                goes to the primary.
+            replica_reads: Serve every read of this session from a replica,
+                for read-only sessions that outlive a replica_read call
+                such as streaming exports.
+        """
+        super().__init__(*args, **kwargs)
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.replica_reads = replica_reads
+        self._pinned_to_primary = False
+
+    def get_bind(self, mapper: Any = None, clause: Any = None, **kw) -> Engine:
+        if self._flushing or isinstance(clause, (Insert, Update, Delete)):
+            self._pinned_to_primary = True
+        if (self._pinned_to_primary or not self.replicas
+                or not (self.replica_reads or _replica_reads.get())):
+            return self.primary.sync_engine
+        return random.choice(self.replicas).sync_engine
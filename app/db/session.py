@@ -1,8 +1,46 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.engine import make_url, URL
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 import os
 from dotenv import load_dotenv
+
+from app.db.pool import engine_pool_options
+from app.db.routing import RoutingSession
 load_dotenv()
 DATABASE_URL = os.getenv("DATABASE_URL")
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
\ No newline at end of file
+# Comma-separated read replica URLs used by replica_read service methods
+DATABASE_REPLICA_URLS = [
+    url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()
+]
+
+# Async drivers used in place of the synchronous ones named in DATABASE_URL
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def to_async_url(database_url: str) -> URL:
+    """Return DATABASE_URL with its driver swapped for an asyncio driver.
+
+    Alembic and the maintenance scripts keep using the synchronous URL.
+    """
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend in ASYNC_DRIVERS:
+        url = url.set(drivername=ASYNC_DRIVERS[backend])
+    return url
+
+
+engine = create_async_engine(to_async_url(DATABASE_URL), **engine_pool_options())
+replica_engines = [
+    create_async_engine(to_async_url(url), **engine_pool_options())
+    for url in DATABASE_REPLICA_URLS
+]
+SessionLocal = async_sessionmaker(
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    primary=engine,
+    replicas=replica_engines,
+    autoflush=False,
+    expire_on_commit=False,
+)
@@ -3,4 +3,7 @@ class ExistanceError(Exception):
     pass
 class UniquenessError(Exception):
     """Exception raised when a uniqueness constraint is violated."""
-    pass
\ No newline at end of file
+    pass
+class CapacityError(Exception):
+    """Exception raised when a bounded resource cannot accept more work."""
+    pass
@@ -0,0 +1,23 @@
+from .leaderboard import LeaderboardEntry, MovieLeaderboards, normalize_scope
+from .leaderboards import (
+    LEADERBOARD_MAX_LIMIT,
+    LEADERBOARD_REFRESH_SECONDS,
+    TRENDING_REFRESH_SECONDS,
+    TRENDING_WINDOW_HALF_LIVES,
+    movie_leaderboards,
+    movie_trending,
+)
+from .trending import TrendingTracker
+
+__all__ = [
+    "LeaderboardEntry",
+    "MovieLeaderboards",
+    "normalize_scope",
+    "TrendingTracker",
+    "LEADERBOARD_MAX_LIMIT",
+    "LEADERBOARD_REFRESH_SECONDS",
+    "TRENDING_REFRESH_SECONDS",
+    "TRENDING_WINDOW_HALF_LIVES",
+    "movie_leaderboards",
+    "movie_trending",
+]
@@ -0,0 +1,288 @@
+import bisect
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Optional
+
+from app.models import Movie
+
+OVERALL_SCOPE = "overall"
+_SCOPE_PATTERN = re.compile(r"^(genre|decade):(.+)$")
+_DECADE_PATTERN = re.compile(r"^(\d{3,4})s?$")
+# Re-rank every board once the global mean moves this far from the prior
+PRIOR_TOLERANCE = 0.05
+
+
+def normalize_scope(scope: str) -> str:
+    """Convert a requested scope to the key of its board.
+
+    Scopes are "overall", "genre:<name>" (case-insensitive) and
+    "decade:<year>", where any year of the decade is accepted, with or
+    without a trailing "s" (e.g. "decade:1990s").
+
+    Raises:
+        ValueError: If the scope is malformed.
+    """
+    scope = scope.strip().lower()
+    if scope == OVERALL_SCOPE:
+        return scope
+    match = _SCOPE_PATTERN.match(scope)
+    if match is None:
+        raise ValueError("Scope must be 'overall', 'genre:<name>' or 'decade:<year>'.")
+    kind, value = match.group(1), match.group(2).strip()
+    if kind == "genre":
+        return f"genre:{value}"
+    decade = _DECADE_PATTERN.match(value)
+    if decade is None:
+        raise ValueError("Decade must be a year such as 1990 or 1990s.")
+    return f"decade:{int(decade.group(1)) // 10 * 10}"
+
+
+@dataclass
+class LeaderboardEntry:
+    """Rating totals and ranking metadata of one movie."""
+    id: int
+    title: str
+    release_year: Optional[int]
+    genres: list[str] = field(default_factory=list)
+    ratings_count: int = 0
+    ratings_sum: float = 0.0
+    # Weighted score the movie is currently filed under in its boards
+    score: float = 0.0
+
+    @classmethod
+    def from_movie(cls, movie: Movie) -> "LeaderboardEntry":
+        """Build an entry from a movie with genres loaded."""
+        return cls(
+            id=movie.id,
+            title=movie.title,
+            release_year=movie.release_year,
+            genres=[genre.name for genre in movie.genres],
+            ratings_count=movie.ratings_count or 0,
+            ratings_sum=movie.ratings_sum or 0.0,
+        )
+
+    @classmethod
+    def from_row(cls, row: Any) -> "LeaderboardEntry":
+        """Build an entry from a row of MovieRepository.stream_catalog."""
+        return cls(
+            id=row.id,
+            title=row.title,
+            release_year=row.release_year,
+            genres=row.genres.split("|") if row.genres else [],
+            ratings_count=row.ratings_count,
+            ratings_sum=row.ratings_sum,
+        )
+
+    @property
+    def scopes(self) -> list[str]:
+        """Keys of the boards this movie ranks in."""
+        scopes = [OVERALL_SCOPE]
+        if self.release_year is not None:
+            scopes.append(f"decade:{self.release_year // 10 * 10}")
+        scopes.extend(dict.fromkeys(f"genre:{name.lower()}" for name in self.genres))
+        return scopes
+
+
+class MovieLeaderboards:
+    """In-process top-rated boards, overall, per genre and per decade.
+
+    Movies are ranked by a Bayesian average that pulls movies with few
+    ratings towards the mean of all ratings:
+
+        score = (ratings_sum + min_votes * prior_mean) / (ratings_count + min_votes)
+
+    Each board is a list of (-score, movie id) kept sorted with bisect,
+    so a new rating moves its movie in O(log n) comparisons and the top
+    N of a board are read in O(N). Only rated movies are ranked.
+
+    The prior mean is the mean of all ratings at the last rebuild. When
+    the running mean drifts more than PRIOR_TOLERANCE away from it, every
+    board is re-ranked from the in-memory totals.
+
+    The boards live in one process and only see ratings and movie changes
+    written by it. Changes made by other workers or by the maintenance
+    scripts appear after the next full rebuild, which the application runs
+    every LEADERBOARD_REFRESH_SECONDS.
+
+    Attributes:
+        min_votes: Weight of the prior, in ratings.
+        prior_mean: Mean rating the scores are currently weighted towards.
+        built_at: Unix time of the last full rebuild, or None.
+    """
+
+    def __init__(self, min_votes: int = 10):
+        self.min_votes = min_votes
+        self.prior_mean = 0.0
+        self._entries: dict[int, LeaderboardEntry] = {}
+        self._boards: dict[str, list[tuple[float, int]]] = {}
+        self._ratings_count = 0
+        self._ratings_sum = 0.0
+        self.built_at: Optional[float] = None
+        self.build_seconds: Optional[float] = None
+        self.reweight_count = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, movie_id: int) -> bool:
+        return movie_id in self._entries
+
+    @property
+    def mean(self) -> float:
+        """Mean of every rating currently counted."""
+        return self._ratings_sum / self._ratings_count if self._ratings_count else 0.0
+
+    def rebuild(self, entries: Iterable[LeaderboardEntry]) -> None:
+        """Replace every board with the given movies.
+
+        Args:
+            entries: One entry per movie, rated or not.
+        """
+        start = time.perf_counter()
+        self._entries = {entry.id: entry for entry in entries}
+        self._ratings_count = sum(entry.ratings_count for entry in self._entries.values())
+        self._ratings_sum = sum(entry.ratings_sum for entry in self._entries.values())
+        self._reweight()
+        self.built_at = time.time()
+        self.build_seconds = time.perf_counter() - start
+
+    def _reweight(self) -> None:
+        """Re-score every movie against the current mean and re-sort the boards."""
+        self.prior_mean = self.mean
+        boards: dict[str, list[tuple[float, int]]] = {}
+        for entry in self._entries.values():
+            if not entry.ratings_count:
+                continue
+            entry.score = self._weighted(entry)
+            for scope in entry.scopes:
+                boards.setdefault(scope, []).append((-entry.score, entry.id))
+        for board in boards.values():
+            board.sort()
+        self._boards = boards
+        self.reweight_count += 1
+
+    def _weighted(self, entry: LeaderboardEntry) -> float:
+        return ((entry.ratings_sum + self.min_votes * self.prior_mean)
+                / (entry.ratings_count + self.min_votes))
+
+    def _file(self, entry: LeaderboardEntry) -> None:
+        """Insert a rated movie into its boards under its current score."""
+        if not entry.ratings_count:
+            return
+        entry.score = self._weighted(entry)
+        for scope in entry.scopes:
+            bisect.insort(self._boards.setdefault(scope, []), (-entry.score, entry.id))
+
+    def _unfile(self, entry: LeaderboardEntry) -> None:
+        """Remove a movie from the boards it is filed in."""
+        if not entry.ratings_count:
+            return
+        key = (-entry.score, entry.id)
+        for scope in entry.scopes:
+            board = self._boards.get(scope)
+            if board is None:
+                continue
+            position = bisect.bisect_left(board, key)
+            if position < len(board) and board[position] == key:
+                del board[position]
+            if not board:
+                del self._boards[scope]
+
+    def upsert_movie(self, movie: Movie) -> None:
+        """Add a movie or refresh its title, year, genres and totals.
+
+        Args:
+            movie: Movie with genres loaded.
+        """
+        self.remove(movie.id)
+        entry = LeaderboardEntry.from_movie(movie)
+        self._entries[entry.id] = entry
+        self._ratings_count += entry.ratings_count
+        self._ratings_sum += entry.ratings_sum
+        self._file(entry)
+
+    def remove(self, movie_id: int) -> None:
+        """Remove a movie from every board; unknown ids are ignored.
+
+        Args:
+            movie_id: ID of the movie to remove.
+        """
+        entry = self._entries.pop(movie_id, None)
+        if entry is None:
+            return
+        self._unfile(entry)
+        self._ratings_count -= entry.ratings_count
+        self._ratings_sum -= entry.ratings_sum
+
+    def record(self, movie_id: int, count: int, total: float) -> None:
+        """Count new ratings of a movie and move it within its boards.
+
+        Movies this process does not know about are ignored.
+
+        Args:
+            movie_id: ID of the rated movie.
+            count: Number of new ratings.
+            total: Sum of their scores.
+        """
+        entry = self._entries.get(movie_id)
+        if entry is None:
+            return
+        self._unfile(entry)
+        entry.ratings_count += count
+        entry.ratings_sum += total
+        self._ratings_count += count
+        self._ratings_sum += total
+        if abs(self.mean - self.prior_mean) > PRIOR_TOLERANCE:
+            self._reweight()
+        else:
+            self._file(entry)
+
+    def record_many(self, ratings: list[dict]) -> None:
+        """Count a batch of ratings given as dicts with movie_id and score."""
+        totals: dict[int, list] = {}
+        for rating in ratings:
+            count_sum = totals.setdefault(rating["movie_id"], [0, 0.0])
+            count_sum[0] += 1
+            count_sum[1] += rating["score"]
+        for movie_id, (count, total) in totals.items():
+            self.record(movie_id, count, total)
+
+    def top(self, scope: str, limit: int = 10) -> list[dict]:
+        """Return the best movies of a board.
+
+        Args:
+            scope: Board key returned by normalize_scope.
+            limit: Maximum number of movies.
+        Returns:
+            Ranked movies, best first; empty if nothing in the scope is rated.
+        """
+        items = []
+        for rank, (_, movie_id) in enumerate(self._boards.get(scope, [])[:limit], start=1):
+            entry = self._entries[movie_id]
+            items.append({
+                "rank": rank,
+                "id": entry.id,
+                "title": entry.title,
+                "release_year": entry.release_year,
+                "ratings_count": entry.ratings_count,
+                "average_rating": round(entry.ratings_sum / entry.ratings_count, 2),
+                "score": round(entry.score, 3),
+            })
+        return items
+
+    def scopes(self) -> dict[str, int]:
+        """Return the number of ranked movies of every non-empty board."""
+        return {scope: len(board) for scope, board in sorted(self._boards.items())}
+
+    def stats(self) -> dict:
+        """Return board sizes, weighting and build information."""
+        return {
+            "movies": len(self._entries),
+            "boards": len(self._boards),
+            "min_votes": self.min_votes,
+            "prior_mean": round(self.prior_mean, 4),
+            "reweights": self.reweight_count,
+            "built_at": self.built_at,
+            "build_ms": round(self.build_seconds * 1000, 3) if self.build_seconds is not None else None,
+        }
@@ -0,0 +1,29 @@
+import os
+
+from dotenv import load_dotenv
+
+from .leaderboard import MovieLeaderboards
+from .trending import TrendingTracker
+
+load_dotenv()
+MOVIE_LEADERBOARDS = os.getenv("MOVIE_LEADERBOARDS", "true").lower() in ("1", "true", "yes")
+LEADERBOARD_MIN_VOTES = int(os.getenv("LEADERBOARD_MIN_VOTES", "10"))
+LEADERBOARD_MAX_LIMIT = int(os.getenv("LEADERBOARD_MAX_LIMIT", "100"))
+# Seconds between full rebuilds from the database; 0 rebuilds only at startup
+LEADERBOARD_REFRESH_SECONDS = float(os.getenv("LEADERBOARD_REFRESH_SECONDS", "300"))
+MOVIE_TRENDING = os.getenv("MOVIE_TRENDING", "true").lower() in ("1", "true", "yes")
+TRENDING_HALF_LIFE_HOURS = float(os.getenv("TRENDING_HALF_LIFE_HOURS", "72"))
+# Ratings older than this many half-lives weigh under 0.4% and are not
+# loaded at startup
+TRENDING_WINDOW_HALF_LIVES = float(os.getenv("TRENDING_WINDOW_HALF_LIVES", "8"))
+# Seconds between rebuilds from the ratings table; 0 rebuilds only at startup
+TRENDING_REFRESH_SECONDS = float(os.getenv("TRENDING_REFRESH_SECONDS", "300"))
+
+# Built at startup, rebuilt every LEADERBOARD_REFRESH_SECONDS and kept
+# current by MovieService and rating writes in between; None when the
+# in-process leaderboards are disabled.
+movie_leaderboards = MovieLeaderboards(LEADERBOARD_MIN_VOTES) if MOVIE_LEADERBOARDS else None
+# Built from recent ratings at startup, rebuilt every
+# TRENDING_REFRESH_SECONDS and fed by rating writes in between; None when
+# trending is disabled.
+movie_trending = TrendingTracker(TRENDING_HALF_LIFE_HOURS * 3600) if MOVIE_TRENDING else None
@@ -0,0 +1,130 @@
+import heapq
+import math
+import time
+from typing import Iterable, Optional
+
+# Rebase the accumulators once their growth factor exceeds e**REBASE_EXPONENT,
+# far below the float overflow at e**709
+REBASE_EXPONENT = 50.0
+# Accumulators whose decayed count falls below this are dropped on rebase
+MIN_WEIGHT = 1e-3
+
+
+class TrendingTracker:
+    """Exponentially decayed rating activity per movie, kept in memory.
+
+    Every rating adds weight exp(rate * (t - t0)) to its movie's count and
+    score accumulators, where rate = ln 2 / half_life and t0 is a shared
+    reference time. Values scaled to t0 decay at the same rate for every
+    movie, so they rank movies exactly like their decayed values at any
+    later time. A rating therefore costs O(1) and no window scan is needed.
+
+    Accumulators are rescaled to a new reference time before the weights
+    grow too large, and negligible ones are dropped then.
+
+    The tracker lives in one process and is fed only by ratings written
+    through it. Ratings from other workers, the bulk importer or the
+    reconcile script are counted at the next rebuild from the ratings
+    table, which the application runs every TRENDING_REFRESH_SECONDS.
+
+    Attributes:
+        half_life: Seconds after which a rating counts half as much.
+    """
+
+    def __init__(self, half_life: float = 72 * 3600.0):
+        self.half_life = half_life
+        self._rate = math.log(2) / half_life
+        self._reference = time.time()
+        # movie id -> [decayed count, decayed score sum], scaled to _reference
+        self._totals: dict[int, list[float]] = {}
+        self.built_at: Optional[float] = None
+        self.build_seconds: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._totals)
+
+    def _weight(self, timestamp: float) -> float:
+        exponent = self._rate * (timestamp - self._reference)
+        if exponent > REBASE_EXPONENT:
+            self._rebase(timestamp)
+            exponent = 0.0
+        return math.exp(exponent)
+
+    def _rebase(self, reference: float) -> None:
+        """Rescale every accumulator to a new reference time."""
+        factor = math.exp(-self._rate * (reference - self._reference))
+        self._reference = reference
+        totals = {}
+        for movie_id, (count, total) in self._totals.items():
+            if count * factor >= MIN_WEIGHT:
+                totals[movie_id] = [count * factor, total * factor]
+        self._totals = totals
+
+    def rebuild(self, ratings: Iterable[tuple[int, float, float]]) -> None:
+        """Replace every accumulator with the given ratings.
+
+        Args:
+            ratings: Tuples of (movie_id, score, unix timestamp).
+        """
+        start = time.perf_counter()
+        self._reference = time.time()
+        self._totals = {}
+        for movie_id, score, timestamp in ratings:
+            self.record(movie_id, score, timestamp)
+        self.built_at = time.time()
+        self.build_seconds = time.perf_counter() - start
+
+    def record(self, movie_id: int, score: float, timestamp: Optional[float] = None) -> None:
+        """Add one rating to its movie's accumulators.
+
+        Args:
+            movie_id: ID of the rated movie.
+            score: Rating score.
+            timestamp: Unix time of the rating; defaults to now.
+        """
+        weight = self._weight(time.time() if timestamp is None else timestamp)
+        totals = self._totals.get(movie_id)
+        if totals is None:
+            totals = self._totals[movie_id] = [0.0, 0.0]
+        totals[0] += weight
+        totals[1] += weight * score
+
+    def record_many(self, ratings: list[dict], timestamp: Optional[float] = None) -> None:
+        """Add a batch of ratings given as dicts with movie_id and score."""
+        timestamp = time.time() if timestamp is None else timestamp
+        for rating in ratings:
+            self.record(rating["movie_id"], rating["score"], timestamp)
+
+    def remove(self, movie_id: int) -> None:
+        """Forget a movie; unknown ids are ignored."""
+        self._totals.pop(movie_id, None)
+
+    def top(self, limit: int = 10, now: Optional[float] = None) -> list[dict]:
+        """Return the movies with the most decayed rating activity.
+
+        Args:
+            limit: Maximum number of movies.
+            now: Unix time the values are decayed to; defaults to now.
+        Returns:
+            Dicts with movie_id, trend_score (decayed number of ratings) and
+            recent_average (decay-weighted average score), best first.
+        """
+        factor = math.exp(-self._rate * ((time.time() if now is None else now) - self._reference))
+        best = heapq.nlargest(limit, self._totals.items(), key=lambda item: (item[1][0], -item[0]))
+        return [
+            {
+                "movie_id": movie_id,
+                "trend_score": round(count * factor, 4),
+                "recent_average": round(total / count, 2) if count else None,
+            }
+            for movie_id, (count, total) in best
+        ]
+
+    def stats(self) -> dict:
+        """Return tracker size, half-life and build information."""
+        return {
+            "movies": len(self._totals),
+            "half_life_hours": round(self.half_life / 3600, 3),
+            "built_at": self.built_at,
+            "build_ms": round(self.build_seconds * 1000, 3) if self.build_seconds is not None else None,
+        }
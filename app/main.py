@@ -1,3 +1,8 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable
+
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
@@ -6,8 +11,21 @@ from starlette.exceptions import HTTPException as StarletteHTTPException
 
 
 from app.api.v1 import api_router
+from app.api.v1.dependencies import rating_write_buffer
 from app.db.base import Base
-from app.db.session import engine
+from app.cache import genre_cache, list_query_cache, movie_detail_cache
+from app.repositories import GenreRepository, MovieRepository, RatingRepository
+from app.search import MOVIE_SEARCH_INDEX_REFRESH_SECONDS, movie_search_index
+from app.leaderboards import (
+    LEADERBOARD_REFRESH_SECONDS,
+    LeaderboardEntry,
+    TRENDING_REFRESH_SECONDS,
+    TRENDING_WINDOW_HALF_LIVES,
+    movie_leaderboards,
+    movie_trending,
+)
+from app.db.pool import pool_status
+from app.db.session import SessionLocal, engine, replica_engines
 from app.utils.logging_config import logger
 
 
@@ -15,11 +33,106 @@ from app.utils.logging_config import logger
 logger.info("Initializing Movie Rating API...")
 
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+def _as_utc(moment: datetime) -> datetime:
+    """Treat naive timestamps, as returned by SQLite, as UTC."""
+    return moment if moment.tzinfo is not None else moment.replace(tzinfo=timezone.utc)
+
+
+async def rebuild_search_index() -> None:
+    """Rebuild the search index from every movie."""
+    async with SessionLocal() as session:
+        movie_search_index.rebuild(await MovieRepository(session).find_movies())
+    logger.info(f"Movie search index built ({movie_search_index.stats()})")
+
+
+async def rebuild_leaderboards() -> None:
+    """Rebuild the leaderboards from the movie catalog."""
+    async with SessionLocal() as session:
+        movie_leaderboards.rebuild([
+            LeaderboardEntry.from_row(row)
+            async for rows in MovieRepository(session).stream_catalog()
+            for row in rows
+        ])
+    logger.info(f"Movie leaderboards built ({movie_leaderboards.stats()})")
+
+
+async def rebuild_trending() -> None:
+    """Rebuild the trending tracker from the ratings of its time window."""
+    since = datetime.now(timezone.utc) - timedelta(
+        seconds=movie_trending.half_life * TRENDING_WINDOW_HALF_LIVES
+    )
+    async with SessionLocal() as session:
+        movie_trending.rebuild([
+            (row.movie_id, row.score, _as_utc(row.created_at).timestamp())
+            async for rows in RatingRepository(session).stream_since(since)
+            for row in rows
+        ])
+    logger.info(f"Trending tracker built ({movie_trending.stats()})")
+
+
+async def _refresh_periodically(name: str, rebuild: Callable[[], Awaitable[None]], interval: float) -> None:
+    """Run rebuild every interval seconds until cancelled.
+
+    In-process structures only see writes made by their own worker; the
+    periodic rebuild brings in everything written elsewhere. A failed
+    rebuild keeps the current data and is retried on the next tick.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await rebuild()
+        except Exception as e:
+            logger.error(f"Periodic rebuild of the {name} failed: {str(e)}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create tables and start background workers on startup, drain them on shutdown."""
+    # Create database tables
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with SessionLocal() as session:
+        genre_cache.load(await GenreRepository(session).get_all())
+    refresh_tasks: list[asyncio.Task] = []
+    if movie_search_index is not None:
+        await rebuild_search_index()
+        if MOVIE_SEARCH_INDEX_REFRESH_SECONDS > 0:
+            refresh_tasks.append(asyncio.create_task(
+                _refresh_periodically("search index", rebuild_search_index, MOVIE_SEARCH_INDEX_REFRESH_SECONDS),
+                name="search-index-refresh",
+            ))
+    if movie_leaderboards is not None:
+        await rebuild_leaderboards()
+        if LEADERBOARD_REFRESH_SECONDS > 0:
+            refresh_tasks.append(asyncio.create_task(
+                _refresh_periodically("leaderboards", rebuild_leaderboards, LEADERBOARD_REFRESH_SECONDS),
+                name="leaderboard-refresh",
+            ))
+    if movie_trending is not None:
+        await rebuild_trending()
+        if TRENDING_REFRESH_SECONDS > 0:
+            refresh_tasks.append(asyncio.create_task(
+                _refresh_periodically("trending tracker", rebuild_trending, TRENDING_REFRESH_SECONDS),
+                name="trending-refresh",
+            ))
+    if rating_write_buffer is not None:
+        rating_write_buffer.start()
+    yield
+    for task in refresh_tasks:
+        task.cancel()
+    await asyncio.gather(*refresh_tasks, return_exceptions=True)
+    if rating_write_buffer is not None:
+        # Guarantee that every accepted rating is written before exiting
+        await rating_write_buffer.stop()
+    await engine.dispose()
+    for replica in replica_engines:
+        await replica.dispose()
+    await list_query_cache.backend.close()
+
 
 # Create FastAPI application
 app = FastAPI(
+    lifespan=lifespan,
     title="Movie Rating API",
     description="A simple Movie Rating API built with FastAPI.",
     version="1.0.0",
@@ -43,7 +156,8 @@ async def custom_http_exception_handler(request: Request, exc: StarletteHTTPExce
                 "code": exc.status_code,
                 "message": exc.detail
             }
-        }
+        },
+        headers=getattr(exc, "headers", None)
     )
 
 
@@ -89,8 +203,22 @@ async def root():
 
 @app.get("/health", tags=["health"])
 async def health_check():
-    """Health check endpoint."""
-    return {"status": "healthy"}
+    """Health check endpoint with live connection pool and cache statistics."""
+    return {
+        "status": "healthy",
+        "database": {
+            "pool": pool_status(engine),
+            "replicas": [pool_status(replica) for replica in replica_engines],
+        },
+        "caches": {
+            "movie_detail": movie_detail_cache.stats(),
+            "movie_list": list_query_cache.stats(),
+            "genres": genre_cache.stats(),
+        },
+        "search_index": movie_search_index.stats() if movie_search_index is not None else None,
+        "leaderboards": movie_leaderboards.stats() if movie_leaderboards is not None else None,
+        "trending": movie_trending.stats() if movie_trending is not None else None,
+    }
 
 
 if __name__ == "__main__":
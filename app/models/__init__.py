@@ -2,6 +2,9 @@ from .director import Director
 from .genre import Genre
 from .movie import Movie
 from .rating import Rating
-from .associations import MovieGenreAssociation
+from .rating_histogram import RatingHistogram, HISTOGRAM_BUCKETS, bucket_for
+from .person import Person
+from .associations import MovieGenreAssociation, MovieCastAssociation
+from .search import movie_search
 
-__all__ = ["Director", "Genre", "Movie", "Rating", "MovieGenreAssociation"]
\ No newline at end of file
+__all__ = ["Director", "Genre", "Movie", "Rating", "RatingHistogram", "HISTOGRAM_BUCKETS", "bucket_for", "MovieGenreAssociation", "Person", "MovieCastAssociation", "movie_search"]
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Table, Column, Integer, ForeignKey
+from sqlalchemy import Table, Column, Integer, ForeignKey, Index
 from sqlalchemy.orm import declarative_base
 from app.db.base import Base
 
@@ -7,4 +7,17 @@ class MovieGenreAssociation(Base):
     __tablename__ = 'movie_genre_association'
 
     movie_id = Column(Integer, ForeignKey('movies.id'), primary_key=True)
-    genre_id = Column(Integer, ForeignKey('genres.id'), primary_key=True)
\ No newline at end of file
+    genre_id = Column(Integer, ForeignKey('genres.id'), primary_key=True)
+
+    __table_args__ = (
+        # The primary key serves movie -> genres; this serves genre -> movies
+        Index("ix_movie_genre_association_genre_id_movie_id", "genre_id", "movie_id"),
+    )
+
+class MovieCastAssociation(Base):
+    __tablename__ = 'movie_cast'
+
+    movie_id = Column(Integer, ForeignKey('movies.id', ondelete="CASCADE"), primary_key=True)
+    person_id = Column(Integer, ForeignKey('people.id', ondelete="CASCADE"), primary_key=True, index=True)
+    # Billing order, as listed in Movie.cast
+    position = Column(Integer, nullable=False, default=0)
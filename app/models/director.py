@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Table, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Table, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship, declarative_base
 from .associations import MovieGenreAssociation
 
@@ -13,4 +13,14 @@ class Director(Base):
     birth_year = Column(Integer)
     description = Column(String)
 
-    movies = relationship("Movie", back_populates="director")
\ No newline at end of file
+    movies = relationship("Movie", back_populates="director")
+
+    __table_args__ = (
+        # Serves name ILIKE '%x%' searches, which cannot use ix_directors_name
+        Index(
+            "ix_directors_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
\ No newline at end of file
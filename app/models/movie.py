@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Table, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, Table, DateTime, ForeignKey, Index, case
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship, declarative_base
 from .associations import MovieGenreAssociation
 
@@ -9,13 +10,22 @@ class Movie(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, unique=True, nullable=False, index=True)
-    release_year = Column(Integer)
+    release_year = Column(Integer, index=True)
+    # Display string kept for API compatibility; the normalized credits
+    # live in movie_cast and are rewritten whenever it changes.
     cast = Column(String)
     director_id = Column(
         Integer,
         ForeignKey("directors.id", ondelete="CASCADE"),
-        nullable=False
+        nullable=False,
+        index=True,
     )
+    # Running rating aggregates, maintained by RatingRepository on every insert
+    ratings_count = Column(Integer, nullable=False, default=0, server_default="0")
+    ratings_sum = Column(Float, nullable=False, default=0.0, server_default="0")
+    # ratings_sum / ratings_count, or 0 without ratings, stored so that
+    # sorting and filtering by rating can use an index
+    rating_average = Column(Float, nullable=False, default=0.0, server_default="0")
 
     director = relationship(
         "Director",
@@ -26,8 +36,49 @@ class Movie(Base):
         secondary="movie_genre_association",
         back_populates="movies",
     )
+    cast_members = relationship(
+        "Person",
+        secondary="movie_cast",
+        back_populates="movies",
+        order_by="MovieCastAssociation.position",
+        # Written through movie_cast rows by MovieRepository.replace_cast
+        viewonly=True,
+    )
+    # Never loaded implicitly: rating aggregates are computed in SQL and
+    # ratings are removed in bulk by MovieRepository.delete.
     ratings = relationship(
         "Rating",
         back_populates="movie",
-        cascade="all, delete-orphan"
-    )
\ No newline at end of file
+        cascade="all, delete-orphan",
+        lazy="raise_on_sql",
+        passive_deletes=True,
+    )
+
+    __table_args__ = (
+        # Serves title ILIKE '%x%' searches, which cannot use ix_movies_title
+        Index(
+            "ix_movies_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        # Sort keys of the movie list, with id as tie-breaker for keyset pages
+        Index("ix_movies_rating_average_id", "rating_average", "id"),
+        Index("ix_movies_ratings_count_id", "ratings_count", "id"),
+        # Year range filtered by minimum rating, e.g. best-rated of a decade
+        Index("ix_movies_release_year_rating_average", "release_year", "rating_average"),
+    )
+
+    @hybrid_property
+    def average_rating(self):
+        """Average rating score, or None when the movie has no ratings."""
+        if not self.ratings_count:
+            return None
+        return self.rating_average
+
+    @average_rating.expression
+    def average_rating(cls):
+        return case(
+            (cls.ratings_count > 0, cls.rating_average),
+            else_=None,
+        )
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, Index, func
+from sqlalchemy.orm import relationship
+
+from app.db.base import Base
+
+
+class Person(Base):
+    __tablename__ = 'people'
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False)
+
+    movies = relationship(
+        "Movie",
+        secondary="movie_cast",
+        back_populates="cast_members",
+        viewonly=True,
+    )
+
+    __table_args__ = (
+        # One person per name regardless of case; also serves the
+        # case-insensitive cast_member filter
+        Index("ix_people_name_lower", func.lower(name), unique=True),
+    )
@@ -1,13 +1,29 @@
-from sqlalchemy import Column, Integer, Float, String, ForeignKey, DateTime
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, Integer, Float, String, ForeignKey, DateTime, func
 from sqlalchemy.orm import relationship, declarative_base
 
 from app.db.base import Base
 
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
 class Rating(Base):
     __tablename__ = 'movie_ratings'
 
     id = Column(Integer, primary_key=True)
-    movie_id = Column(Integer, ForeignKey('movies.id'), nullable=False)
+    movie_id = Column(Integer, ForeignKey('movies.id'), nullable=False, index=True)
     score = Column(Float, nullable=False)
+    # Set by the application on ORM and bulk inserts; the server default
+    # covers rows written by other tools. Indexed for time window reads.
+    created_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=_utcnow,
+        server_default=func.now(),
+        index=True,
+    )
 
-    movie = relationship("Movie", back_populates="ratings")
\ No newline at end of file
+    movie = relationship("Movie", back_populates="ratings")
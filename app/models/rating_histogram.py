@@ -0,0 +1,38 @@
+from sqlalchemy import Column, Integer, ForeignKey
+
+from app.db.base import Base
+
+# Scores are floats from 1 to 10; bucket k counts scores in [k, k + 1),
+# with 10 only holding perfect scores
+HISTOGRAM_BUCKETS = tuple(range(1, 11))
+
+
+def bucket_for(score: float) -> int:
+    """Return the histogram bucket of a rating score."""
+    return min(max(int(score), HISTOGRAM_BUCKETS[0]), HISTOGRAM_BUCKETS[-1])
+
+
+class RatingHistogram(Base):
+    """Number of ratings of a movie per score bucket.
+
+    One fixed-width row per rated movie, incremented by RatingRepository
+    in the same transaction as the ratings, so reading a distribution
+    never touches movie_ratings.
+    """
+    __tablename__ = 'movie_rating_histograms'
+
+    movie_id = Column(Integer, ForeignKey('movies.id', ondelete='CASCADE'), primary_key=True)
+    bucket_1 = Column(Integer, nullable=False, default=0, server_default="0")
+    bucket_2 = Column(Integer, nullable=False, default=0, server_default="0")
+    bucket_3 = Column(Integer, nullable=False, default=0, server_default="0")
+    bucket_4 = Column(Integer, nullable=False, default=0, server_default="0")
+    bucket_5 = Column(Integer, nullable=False, default=0, server_default="0")
+    bucket_6 = Column(Integer, nullable=False, default=0, server_default="0")
+    bucket_7 = Column(Integer, nullable=False, default=0, server_default="0")
+    bucket_8 = Column(Integer, nullable=False, default=0, server_default="0")
+    bucket_9 = Column(Integer, nullable=False, default=0, server_default="0")
+    bucket_10 = Column(Integer, nullable=False, default=0, server_default="0")
+
+    def counts(self) -> list[int]:
+        """Return the bucket counts in score order."""
+        return [getattr(self, f"bucket_{bucket}") for bucket in HISTOGRAM_BUCKETS]
@@ -0,0 +1,65 @@
+from sqlalchemy import DDL, column, event, table
+
+from app.db.base import Base
+
+# Full-text index used for title/director search on SQLite. PostgreSQL uses
+# pg_trgm GIN indexes on movies.title and directors.name instead.
+movie_search = table(
+    "movie_search",
+    column("rowid"),
+    column("title"),
+    column("director_name"),
+)
+
+# FTS5 table with the trigram tokenizer, keyed by movie id and kept in sync
+# by triggers so that every write path (ORM, bulk, raw SQL) is covered.
+SQLITE_MOVIE_SEARCH_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS movie_search "
+    "USING fts5(title, director_name, tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS movie_search_ai AFTER INSERT ON movies BEGIN "
+    "INSERT INTO movie_search (rowid, title, director_name) "
+    "VALUES (new.id, new.title, (SELECT name FROM directors WHERE id = new.director_id)); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS movie_search_au AFTER UPDATE OF title, director_id ON movies BEGIN "
+    "UPDATE movie_search SET title = new.title, "
+    "director_name = (SELECT name FROM directors WHERE id = new.director_id) "
+    "WHERE rowid = new.id; "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS movie_search_ad AFTER DELETE ON movies BEGIN "
+    "DELETE FROM movie_search WHERE rowid = old.id; "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS movie_search_director_au AFTER UPDATE OF name ON directors BEGIN "
+    "UPDATE movie_search SET director_name = new.name "
+    "WHERE rowid IN (SELECT id FROM movies WHERE director_id = new.id); "
+    "END",
+)
+
+# Rebuilds the index from the base tables; used when it is first created.
+SQLITE_MOVIE_SEARCH_REBUILD = (
+    "DELETE FROM movie_search",
+    "INSERT INTO movie_search (rowid, title, director_name) "
+    "SELECT movies.id, movies.title, directors.name "
+    "FROM movies JOIN directors ON directors.id = movies.director_id",
+)
+
+
+@event.listens_for(Base.metadata, "before_create")
+def _create_trigram_extension(target, connection, **kw):
+    """Enable pg_trgm before the GIN trigram indexes are created."""
+    if connection.dialect.name == "postgresql":
+        connection.execute(DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_sqlite_search_index(target, connection, **kw):
+    """Create and fill the FTS5 search table when running on SQLite."""
+    if connection.dialect.name != "sqlite":
+        return
+    exists = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'movie_search'"
+    ).first()
+    for statement in SQLITE_MOVIE_SEARCH_DDL:
+        connection.exec_driver_sql(statement)
+    if not exists:
+        for statement in SQLITE_MOVIE_SEARCH_REBUILD:
+            connection.exec_driver_sql(statement)
@@ -1,4 +1,5 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import Director
 
@@ -6,27 +7,27 @@ class DirectorRepository:
     """Repository encapsulating database operations for Director.
 
     Attributes:
-        session: Active SQLAlchemy session used for queries and commits.
+        session: Active SQLAlchemy async session used for queries and commits.
     """
 
-    def __init__(self, session: Session):
-        """Initialize the repository with a SQLAlchemy session.
+    def __init__(self, session: AsyncSession):
+        """Initialize the repository with a SQLAlchemy async session.
 
         Args:
-            session: SQLAlchemy Session instance.
+            session: SQLAlchemy AsyncSession instance.
         """
         self.session = session
 
-    def add(self, director: Director) -> None:
+    async def add(self, director: Director) -> None:
         """Persist a new director.
 
         Args:
             director: Director instance to add.
         """
         self.session.add(director)
-        self.session.commit()
+        await self.session.commit()
 
-    def get_by_id(self, director_id: int) -> Director | None:
+    async def get_by_id(self, director_id: int) -> Director | None:
         """Fetch a single director by its primary key.
 
         Args:
@@ -34,9 +35,9 @@ class DirectorRepository:
         Returns:
             The Director instance if found; otherwise None.
         """
-        return self.session.query(Director).filter(Director.id == director_id).first()
+        return await self.session.get(Director, director_id)
 
-    def get_by_name(self, name: str) -> Director | None:
+    async def get_by_name(self, name: str) -> Director | None:
         """Fetch a single director by its name.
 
         Args:
@@ -44,4 +45,5 @@ class DirectorRepository:
         Returns:
             The Director instance if found; otherwise None.
         """
-        return self.session.query(Director).filter(Director.name == name).first()
\ No newline at end of file
+        result = await self.session.scalars(select(Director).where(Director.name == name))
+        return result.first()
\ No newline at end of file
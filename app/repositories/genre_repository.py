@@ -1,4 +1,5 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import Genre
 
@@ -6,27 +7,36 @@ class GenreRepository:
     """Repository encapsulating database operations for Genre.
 
     Attributes:
-        session: Active SQLAlchemy session used for queries and commits.
+        session: Active SQLAlchemy async session used for queries and commits.
     """
 
-    def __init__(self, session: Session):
-        """Initialize the repository with a SQLAlchemy session.
+    def __init__(self, session: AsyncSession):
+        """Initialize the repository with a SQLAlchemy async session.
 
         Args:
-            session: SQLAlchemy Session instance.
+            session: SQLAlchemy AsyncSession instance.
         """
         self.session = session
 
-    def add(self, genre: Genre) -> None:
+    async def add(self, genre: Genre) -> None:
         """Persist a new genre.
 
         Args:
             genre: Genre instance to add.
         """
         self.session.add(genre)
-        self.session.commit()
+        await self.session.commit()
 
-    def get_by_id(self, genre_id: int) -> Genre | None:
+    async def get_all(self) -> list[Genre]:
+        """Fetch every genre.
+
+        Returns:
+            List of all Genre instances.
+        """
+        result = await self.session.scalars(select(Genre).order_by(Genre.id))
+        return list(result.all())
+
+    async def get_by_id(self, genre_id: int) -> Genre | None:
         """Fetch a single genre by its primary key.
 
         Args:
@@ -34,9 +44,9 @@ class GenreRepository:
         Returns:
             The Genre instance if found; otherwise None.
         """
-        return self.session.query(Genre).filter(Genre.id == genre_id).first()
+        return await self.session.get(Genre, genre_id)
 
-    def get_by_name(self, name: str) -> Genre | None:
+    async def get_by_name(self, name: str) -> Genre | None:
         """Fetch a single genre by its name.
 
         Args:
@@ -44,4 +54,31 @@ class GenreRepository:
         Returns:
             The Genre instance if found; otherwise None.
         """
-        return self.session.query(Genre).filter(Genre.name == name).first()
\ No newline at end of file
+        result = await self.session.scalars(select(Genre).where(Genre.name == name))
+        return result.first()
+
+    async def get_by_ids(self, genre_ids: list[int]) -> list[Genre]:
+        """Fetch the genres with the given ids in a single IN query.
+
+        Args:
+            genre_ids: Genre identifiers.
+        Returns:
+            The Genre instances found, in no particular order.
+        """
+        if not genre_ids:
+            return []
+        result = await self.session.scalars(select(Genre).where(Genre.id.in_(set(genre_ids))))
+        return list(result.all())
+
+    async def get_by_names(self, names: list[str]) -> list[Genre]:
+        """Fetch the genres with the given names in a single IN query.
+
+        Args:
+            names: Genre names to match.
+        Returns:
+            The Genre instances found, in no particular order.
+        """
+        if not names:
+            return []
+        result = await self.session.scalars(select(Genre).where(Genre.name.in_(set(names))))
+        return list(result.all())
\ No newline at end of file
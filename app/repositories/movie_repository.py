@@ -1,44 +1,147 @@
-from typing import Optional, Type
+from typing import Any, AsyncIterator, Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy import Select, and_, bindparam, delete, exists, func, insert, literal_column, or_, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
 
-from app.models import Movie, Genre, Director, MovieGenreAssociation
+from app.models import (
+    Movie, Genre, Director, MovieGenreAssociation, MovieCastAssociation, Person, Rating, RatingHistogram,
+    movie_search,
+)
+
+# Relationships rendered by MovieResponse, loaded in bulk so serializing a
+# page does not fire one lazy load per movie and relationship.
+MOVIE_RESPONSE_LOAD_OPTIONS = (
+    joinedload(Movie.director),
+    selectinload(Movie.genres),
+)
+
+# Columns the movie list can be sorted by, keyed by the public sort name.
+# Each is paired with id as tie-breaker and served by an index on both.
+MOVIE_SORT_COLUMNS = {
+    "id": Movie.id,
+    "title": Movie.title,
+    "release_year": Movie.release_year,
+    # Unrated movies store 0 and therefore sort as the lowest rated
+    "average_rating": Movie.rating_average,
+    "ratings_count": Movie.ratings_count,
+}
 
 class MovieRepository:
     """Repository encapsulating database operations for Movie.
 
     Attributes:
-        session: Active SQLAlchemy session used for queries and commits.
+        session: Active SQLAlchemy async session used for queries and commits.
     """
 
-    def __init__(self, session: Session):
-        """Initialize the repository with a SQLAlchemy session.
+    def __init__(self, session: AsyncSession):
+        """Initialize the repository with a SQLAlchemy async session.
 
         Args:
-            session: SQLAlchemy Session instance.
+            session: SQLAlchemy AsyncSession instance.
         """
         self.session = session
 
-    def add(self, movie: Movie) -> None:
-        """Persist a new movie.
+    async def create(self, movie: Movie,
+                     genres: list[Genre] = (),
+                     cast_names: list[str] = ()) -> None:
+        """Persist a new movie with its genres and cast in one transaction.
+
+        The movie is flushed to obtain its id, then its genre and cast
+        associations are written with one multi-row INSERT each and
+        everything is committed together.
 
         Args:
             movie: Movie instance to add.
+            genres: Genres to associate with the movie.
+            cast_names: Distinct cast member names in billing order.
         """
         self.session.add(movie)
-        self.session.commit()
+        await self.session.flush()
+        await self.add_genres(movie, genres)
+        await self.add_cast(movie, cast_names)
+        await self.session.commit()
 
-    def get_by_id(self, movie_id: int) -> Optional[Movie]:
+    async def get_by_id(self, movie_id: int) -> Optional[Movie]:
         """Fetch a single movie by its primary key.
 
+        Relationships rendered in responses are loaded eagerly and any
+        instance already in the session is refreshed from the row.
+
         Args:
             movie_id: Movie identifier.
         Returns:
             The Movie instance if found; otherwise None.
         """
-        return self.session.query(Movie).filter(Movie.id == movie_id).first()
+        result = await self.session.execute(
+            select(Movie)
+            .options(*MOVIE_RESPONSE_LOAD_OPTIONS)
+            .where(Movie.id == movie_id)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalars().first()
+
+    async def exists(self, movie_id: int) -> bool:
+        """Check whether a movie exists without loading it.
+
+        Args:
+            movie_id: Movie identifier.
+        Returns:
+            True if a movie with this id exists.
+        """
+        return await self.session.scalar(
+            select(exists().where(Movie.id == movie_id))
+        )
+
+    async def get_existing_ids(self, movie_ids: list[int]) -> set[int]:
+        """Return which of the given movie ids exist, with a single IN query.
+
+        Args:
+            movie_ids: Movie identifiers to check.
+        Returns:
+            Set of ids that belong to existing movies.
+        """
+        if not movie_ids:
+            return set()
+        result = await self.session.scalars(
+            select(Movie.id).where(Movie.id.in_(set(movie_ids)))
+        )
+        return set(result.all())
+
+    async def get_summaries(self, movie_ids: list[int]) -> dict[int, tuple]:
+        """Fetch id, title and release year of several movies with one IN query.
+
+        Args:
+            movie_ids: Movie identifiers to fetch.
+        Returns:
+            Mapping of movie id to (title, release_year) for the movies
+            that exist.
+        """
+        if not movie_ids:
+            return {}
+        result = await self.session.execute(
+            select(Movie.id, Movie.title, Movie.release_year).where(Movie.id.in_(set(movie_ids)))
+        )
+        return {movie_id: (title, release_year) for movie_id, title, release_year in result.all()}
+
+    async def get_rating_totals(self, movie_id: int) -> Optional[tuple[int, float]]:
+        """Fetch the running rating aggregates stored on a movie.
+
+        Args:
+            movie_id: Movie identifier.
+        Returns:
+            Tuple of (ratings_count, ratings_sum), or None if the movie
+            does not exist.
+        """
+        result = await self.session.execute(
+            select(Movie.ratings_count, Movie.ratings_sum).where(Movie.id == movie_id)
+        )
+        row = result.first()
+        return tuple(row) if row is not None else None
 
-    def get_by_title(self, title: str) -> Optional[Movie]:
+    async def get_by_title(self, title: str) -> Optional[Movie]:
         """Fetch a single movie by its title.
 
         Args:
@@ -46,85 +149,423 @@ class MovieRepository:
         Returns:
             The Movie instance if found; otherwise None.
         """
-        return self.session.query(Movie).filter(Movie.title == title).first()
+        result = await self.session.scalars(select(Movie).where(Movie.title == title))
+        return result.first()
 
-    def find_movies(self, *,
-                    title: str = None,
-                    director: str = None,
-                    release_year: int = None,
-                    genre: Genre = None) -> list[Type[Movie]]:
-        """Find movies matching given criteria.
+    def _dialect_name(self) -> str:
+        """Return the name of the database dialect behind the session."""
+        return self.session.get_bind().dialect.name
+
+    def _apply_filters(self, query: Select, *,
+                       title: str = None,
+                       director: str = None,
+                       release_year: int = None,
+                       genre: Genre = None,
+                       cast_member: str = None,
+                       search: str = None,
+                       year_from: int = None,
+                       year_to: int = None,
+                       min_rating: float = None) -> Select:
+        """Apply the listing filters shared by finding and counting.
 
         Args:
+            query: Select statement over Movie.
             title: Title to filter by (optional).
             director: Director to filter by (optional).
             release_year: Release year to filter by (optional).
             genre: Genre to filter by (optional).
+            cast_member: Exact cast member name, case-insensitive (optional).
+            search: Text matched against titles and director names (optional).
+            year_from: Earliest release year, inclusive (optional).
+            year_to: Latest release year, inclusive (optional).
+            min_rating: Minimum average rating; excludes unrated movies (optional).
         Returns:
-            List of Movie instances matching criteria.
+            The statement with all filters applied.
         """
-        query = self.session.query(Movie)
+        use_fts = search and self._uses_fts(search)
         if title:
-            query = query.filter(Movie.title.ilike(f"%{title}%"))
-        if director:
+            query = query.where(Movie.title.ilike(f"%{title}%"))
+        if director or (search and not use_fts):
             query = query.join(Movie.director)
-            query = query.filter(Director.name.ilike(f"%{director}%"))
+        if director:
+            query = query.where(Director.name.ilike(f"%{director}%"))
+        if search:
+            if use_fts:
+                # Quoted as a single FTS5 phrase; trigram phrases match substrings
+                phrase = '"' + search.replace('"', '""') + '"'
+                query = query.join(movie_search, movie_search.c.rowid == Movie.id)
+                query = query.where(
+                    literal_column("movie_search").op("MATCH")(bindparam("search_phrase", phrase))
+                )
+            else:
+                query = query.where(or_(
+                    Movie.title.ilike(f"%{search}%"),
+                    Director.name.ilike(f"%{search}%"),
+                ))
         if release_year:
-            query = query.filter(Movie.release_year == release_year)
+            query = query.where(Movie.release_year == release_year)
+        if year_from is not None:
+            query = query.where(Movie.release_year >= year_from)
+        if year_to is not None:
+            query = query.where(Movie.release_year <= year_to)
+        if min_rating is not None:
+            query = query.where(Movie.rating_average >= min_rating)
         if genre:
-            query = query.join(Movie.genres)
-            query = query.filter(Genre.name == genre)
-        return query.all()
+            query = query.join(
+                MovieGenreAssociation,
+                MovieGenreAssociation.movie_id == Movie.id,
+            )
+            query = query.where(MovieGenreAssociation.genre_id == genre.id)
+        if cast_member:
+            # Resolved through ix_people_name_lower and ix_movie_cast_person_id
+            query = query.join(
+                MovieCastAssociation,
+                MovieCastAssociation.movie_id == Movie.id,
+            ).join(Person, Person.id == MovieCastAssociation.person_id)
+            query = query.where(func.lower(Person.name) == cast_member.lower())
+        return query
+
+    def _uses_fts(self, search: str) -> bool:
+        """Whether a search runs on the SQLite FTS5 table.
+
+        The trigram tokenizer cannot match fewer than three characters, so
+        shorter searches fall back to ILIKE.
+        """
+        return self._dialect_name() == "sqlite" and len(search) >= 3
+
+    def _search_ordering(self, search: str) -> tuple:
+        """Return ORDER BY clauses ranking search matches by relevance.
+
+        PostgreSQL ranks by pg_trgm similarity to the title or director
+        name, SQLite by FTS5 bm25. Other databases keep the id ordering.
+        """
+        if self._uses_fts(search):
+            # bm25() is lower for better matches
+            return (func.bm25(literal_column("movie_search")), Movie.id)
+        if self._dialect_name() == "postgresql":
+            rank = func.greatest(
+                func.similarity(Movie.title, search),
+                func.similarity(Director.name, search),
+            )
+            return (rank.desc(), Movie.id)
+        return (Movie.id,)
+
+    def _sort_ordering(self, sort: str, descending: bool) -> tuple:
+        """Return ORDER BY clauses for a sort column with id as tie-breaker."""
+        if sort == "id":
+            return (Movie.id.desc(),) if descending else (Movie.id,)
+        if descending:
+            return (MOVIE_SORT_COLUMNS[sort].desc(), Movie.id.desc())
+        return (MOVIE_SORT_COLUMNS[sort], Movie.id)
+
+    def _seek(self, sort: str, descending: bool, after_value: Any, after_id: int):
+        """Return the keyset condition selecting rows after (after_value, after_id).
+
+        NULL sort values come first in ascending order on SQLite and last
+        on PostgreSQL, so the condition places them the way the ORDER BY
+        of the running database does.
+        """
+        id_after = Movie.id < after_id if descending else Movie.id > after_id
+        if sort == "id":
+            return id_after
+        column = MOVIE_SORT_COLUMNS[sort]
+        nulls_first = (self._dialect_name() == "postgresql") == descending
+        if after_value is None:
+            condition = and_(column.is_(None), id_after)
+            return or_(condition, column.is_not(None)) if nulls_first else condition
+        value_after = column < after_value if descending else column > after_value
+        condition = or_(value_after, and_(column == after_value, id_after))
+        if column.nullable and not nulls_first:
+            condition = or_(condition, column.is_(None))
+        return condition
+
+    async def find_movies(self, *,
+                          title: str = None,
+                          director: str = None,
+                          release_year: int = None,
+                          genre: Genre = None,
+                          cast_member: str = None,
+                          search: str = None,
+                          year_from: int = None,
+                          year_to: int = None,
+                          min_rating: float = None,
+                          sort: Optional[str] = None,
+                          descending: bool = False,
+                          offset: int = 0,
+                          limit: Optional[int] = None,
+                          after_id: Optional[int] = None,
+                          after_value: Any = None) -> list[Movie]:
+        """Find movies matching given criteria.
 
-    def add_genre_to_movie(self, movie: Movie, genre: Genre) -> None:
-        """Associate a genre with a movie.
+        Pagination is applied in SQL over a stable ordering by the sort
+        column and then the primary key, either with LIMIT/OFFSET or, when
+        after_id is given, as a keyset seek that starts right after the
+        row (after_value, after_id). Without a sort, searches are ordered
+        by relevance instead and do not support after_id.
 
         Args:
-            movie: Movie instance to update.
-            genre: Genre instance to associate.
+            title: Title to filter by (optional).
+            director: Director to filter by (optional).
+            release_year: Release year to filter by (optional).
+            genre: Genre to filter by (optional).
+            cast_member: Exact cast member name, case-insensitive (optional).
+            search: Text matched against titles and director names,
+                ranking results by relevance (optional).
+            year_from: Earliest release year, inclusive (optional).
+            year_to: Latest release year, inclusive (optional).
+            min_rating: Minimum average rating; excludes unrated movies (optional).
+            sort: Key of MOVIE_SORT_COLUMNS to order by (optional).
+            descending: Whether to sort in descending order.
+            offset: Number of matching rows to skip.
+            limit: Maximum number of rows to return (optional).
+            after_id: Only return movies ordered after this id (optional).
+            after_value: Sort column value of the after_id movie.
+        Returns:
+            List of Movie instances matching criteria.
+        Raises:
+            ValueError: If the sort is unknown, or both search and after_id
+                are given without a sort.
+        """
+        if sort is not None and sort not in MOVIE_SORT_COLUMNS:
+            raise ValueError(f"Unknown sort '{sort}'.")
+        if search and sort is None and after_id is not None:
+            raise ValueError("Search results cannot be paginated with a cursor.")
+        query = self._apply_filters(
+            select(Movie),
+            title=title,
+            director=director,
+            release_year=release_year,
+            genre=genre,
+            cast_member=cast_member,
+            search=search,
+            year_from=year_from,
+            year_to=year_to,
+            min_rating=min_rating,
+        )
+        if search and sort is None:
+            ordering = self._search_ordering(search)
+        else:
+            sort = sort or "id"
+            ordering = self._sort_ordering(sort, descending)
+            if after_id is not None:
+                query = query.where(self._seek(sort, descending, after_value, after_id))
+        query = query.options(*MOVIE_RESPONSE_LOAD_OPTIONS).order_by(*ordering)
+        if offset:
+            query = query.offset(offset)
+        if limit is not None:
+            query = query.limit(limit)
+        result = await self.session.scalars(query)
+        return list(result.unique().all())
+
+    async def count_movies(self, *,
+                           title: str = None,
+                           director: str = None,
+                           release_year: int = None,
+                           genre: Genre = None,
+                           cast_member: str = None,
+                           search: str = None,
+                           year_from: int = None,
+                           year_to: int = None,
+                           min_rating: float = None) -> int:
+        """Count movies matching given criteria.
+
+        Args:
+            title: Title to filter by (optional).
+            director: Director to filter by (optional).
+            release_year: Release year to filter by (optional).
+            genre: Genre to filter by (optional).
+            cast_member: Exact cast member name, case-insensitive (optional).
+            search: Text matched against titles and director names (optional).
+            year_from: Earliest release year, inclusive (optional).
+            year_to: Latest release year, inclusive (optional).
+            min_rating: Minimum average rating; excludes unrated movies (optional).
+        Returns:
+            Number of Movie rows matching criteria.
+        """
+        query = self._apply_filters(
+            select(func.count(Movie.id)).select_from(Movie),
+            title=title,
+            director=director,
+            release_year=release_year,
+            genre=genre,
+            cast_member=cast_member,
+            search=search,
+            year_from=year_from,
+            year_to=year_to,
+            min_rating=min_rating,
+        )
+        return await self.session.scalar(query)
+
+    async def add_genres(self, movie: Movie, genres: list[Genre]) -> None:
+        """Associate genres with a movie using a single multi-row INSERT.
+
+        Nothing is committed; the caller's commit makes it durable.
+
+        Args:
+            movie: Movie instance to update; must already have an id.
+            genres: Genre instances to associate.
         """
-        self.session.add(MovieGenreAssociation(movie_id=movie.id, genre_id=genre.id))
-        self.session.commit()
+        if not genres:
+            return
+        await self.session.execute(
+            insert(MovieGenreAssociation),
+            [{"movie_id": movie.id, "genre_id": genre.id} for genre in genres],
+        )
 
-    def update(self, movie: Movie) -> None:
+    async def update(self, movie: Movie) -> None:
         """Update an existing movie.
 
         Args:
             movie: Movie instance to update.
         """
-        self.session.commit()
+        await self.session.commit()
 
-    def delete(self, movie: Movie) -> None:
+    async def delete(self, movie: Movie) -> None:
         """Delete a movie from the database.
 
         Args:
             movie: Movie instance to delete.
         """
-        self.session.delete(movie)
-        self.session.commit()
+        # Ratings and credits are removed in bulk instead of being loaded
+        # for the ORM cascade
+        await self.session.execute(
+            delete(Rating)
+            .where(Rating.movie_id == movie.id)
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.execute(
+            delete(RatingHistogram)
+            .where(RatingHistogram.movie_id == movie.id)
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.execute(
+            delete(MovieCastAssociation)
+            .where(MovieCastAssociation.movie_id == movie.id)
+        )
+        await self.session.delete(movie)
+        await self.session.commit()
+
+    async def update_movie_genres(self, movie: Movie, genres: list[Genre]) -> None:
+        """Replace the genres associated with a movie.
 
-    def update_movie_genres(self, movie: Movie, genres: list[Genre]) -> None:
-        """Update the genres associated with a movie.
+        Nothing is committed; update() commits it together with the
+        other changes to the movie.
 
         Args:
             movie: Movie instance to update.
             genres: List of Genre instances to associate with the movie.
         """
         # Remove existing genre associations
-        self.session.query(MovieGenreAssociation).filter(
-            MovieGenreAssociation.movie_id == movie.id
-        ).delete()
-        
-        # Add new genre associations
-        for genre in genres:
-            self.session.add(MovieGenreAssociation(movie_id=movie.id, genre_id=genre.id))
-        
-        self.session.commit()
-
-    def count(self):
+        await self.session.execute(
+            delete(MovieGenreAssociation)
+            .where(MovieGenreAssociation.movie_id == movie.id)
+        )
+        await self.add_genres(movie, genres)
+
+    async def replace_cast(self, movie: Movie, names: list[str]) -> None:
+        """Replace the normalized cast of a movie.
+
+        People are matched by name, case-insensitively; missing ones are
+        created. Concurrent creation of the same person is tolerated.
+        Nothing is committed; update() commits it.
+
+        Args:
+            movie: Movie instance to update.
+            names: Distinct cast member names in billing order.
+        """
+        await self.session.execute(
+            delete(MovieCastAssociation)
+            .where(MovieCastAssociation.movie_id == movie.id)
+        )
+        await self.add_cast(movie, names)
+
+    async def add_cast(self, movie: Movie, names: list[str]) -> None:
+        """Credit cast members on a movie using a single multi-row INSERT.
+
+        Nothing is committed; the caller's commit makes it durable.
+
+        Args:
+            movie: Movie instance to update; must already have an id.
+            names: Distinct cast member names in billing order.
+        """
+        if names:
+            people = await self._get_or_create_people(names)
+            await self.session.execute(
+                insert(MovieCastAssociation),
+                [
+                    {"movie_id": movie.id, "person_id": people[name.lower()], "position": position}
+                    for position, name in enumerate(names)
+                ],
+            )
+
+    async def _get_or_create_people(self, names: list[str]) -> dict[str, int]:
+        """Return person ids keyed by lowercased name, creating missing people."""
+        lowered = {name.lower(): name for name in names}
+        people = await self._find_people(lowered)
+        missing = [{"name": name} for key, name in lowered.items() if key not in people]
+        if missing:
+            if self._dialect_name() == "postgresql":
+                statement = postgresql_insert(Person).on_conflict_do_nothing()
+            elif self._dialect_name() == "sqlite":
+                statement = sqlite_insert(Person).on_conflict_do_nothing()
+            else:
+                statement = insert(Person)
+            await self.session.execute(statement, missing)
+            people = await self._find_people(lowered)
+        return people
+
+    async def _find_people(self, lowered: dict[str, str]) -> dict[str, int]:
+        result = await self.session.execute(
+            select(Person.id, Person.name)
+            .where(func.lower(Person.name).in_(list(lowered)))
+        )
+        return {name.lower(): person_id for person_id, name in result.all()}
+
+    async def stream_catalog(self, batch_size: int = 1000) -> AsyncIterator[list]:
+        """Stream every movie with its director, genres and rating totals.
+
+        Rows are fetched from a server-side cursor batch_size at a time,
+        so memory use does not grow with the size of the catalog. Genre
+        names are aggregated in SQL, separated by "|".
+
+        Args:
+            batch_size: Rows fetched per round trip.
+        Yields:
+            Lists of at most batch_size rows with id, title, release_year,
+            director, cast, genres, ratings_count, ratings_sum and
+            average_rating.
+        """
+        genre_names = (
+            select(func.aggregate_strings(Genre.name, "|"))
+            .join(MovieGenreAssociation, MovieGenreAssociation.genre_id == Genre.id)
+            .where(MovieGenreAssociation.movie_id == Movie.id)
+            .correlate(Movie)
+            .scalar_subquery()
+        )
+        query = (
+            select(
+                Movie.id,
+                Movie.title,
+                Movie.release_year,
+                Director.name.label("director"),
+                Movie.cast,
+                genre_names.label("genres"),
+                Movie.ratings_count,
+                Movie.ratings_sum,
+                Movie.average_rating.label("average_rating"),
+            )
+            .join(Movie.director)
+            .order_by(Movie.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.session.stream(query)
+        async for partition in result.partitions():
+            yield partition
+
+    async def count(self) -> int:
         """Count total number of movies in the database.
 
         Returns:
             Total count of Movie instances.
         """
-        return self.session.query(Movie).count()
\ No newline at end of file
+        return await self.session.scalar(select(func.count(Movie.id)))
@@ -1,34 +1,131 @@
-from typing import Optional
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import AsyncIterator, Optional
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Rating
+from app.models import HISTOGRAM_BUCKETS, Movie, Rating, RatingHistogram, bucket_for
+
+HISTOGRAM_COLUMNS = tuple(f"bucket_{bucket}" for bucket in HISTOGRAM_BUCKETS)
 
 
 class RatingRepository:
     """Repository encapsulating database operations for Rating.
 
     Attributes:
-        session: Active SQLAlchemy session used for queries and commits.
+        session: Active SQLAlchemy async session used for queries and commits.
     """
 
-    def __init__(self, session: Session):
-        """Initialize the repository with a SQLAlchemy session.
+    def __init__(self, session: AsyncSession):
+        """Initialize the repository with a SQLAlchemy async session.
 
         Args:
-            session: SQLAlchemy Session instance.
+            session: SQLAlchemy AsyncSession instance.
         """
         self.session = session
 
-    def add(self, rating: Rating) -> None:
-        """Persist a new rating.
+    async def add(self, rating: Rating) -> None:
+        """Persist a new rating and update the movie's running aggregates.
+
+        The insert, the update of movies.ratings_count, ratings_sum and
+        rating_average, and the histogram increment are committed in the
+        same transaction.
 
         Args:
             rating: Rating instance to add.
         """
         self.session.add(rating)
-        self.session.commit()
+        await self.session.execute(
+            update(Movie)
+            .where(Movie.id == rating.movie_id)
+            .values(
+                ratings_count=Movie.ratings_count + 1,
+                ratings_sum=Movie.ratings_sum + rating.score,
+                # SET expressions see the values from before the update
+                rating_average=(Movie.ratings_sum + rating.score) / (Movie.ratings_count + 1),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        counts = dict.fromkeys(HISTOGRAM_COLUMNS, 0)
+        counts[f"bucket_{bucket_for(rating.score)}"] = 1
+        await self.session.execute(self._histogram_upsert(), {"movie_id": rating.movie_id, **counts})
+        await self.session.commit()
+
+    async def add_many(self, ratings: list[dict]) -> None:
+        """Persist many ratings in one transaction with a multi-row INSERT.
+
+        The running aggregates and the histogram of every affected movie
+        are incremented with one executemany statement each, in the same
+        transaction as the insert.
+
+        Args:
+            ratings: Rating rows as dicts with movie_id and score keys.
+        """
+        if not ratings:
+            return
+        await self.session.execute(insert(Rating), ratings)
+        totals: dict[int, list] = {}
+        histograms: dict[int, dict[str, int]] = {}
+        for rating in ratings:
+            count_sum = totals.setdefault(rating["movie_id"], [0, 0.0])
+            count_sum[0] += 1
+            count_sum[1] += rating["score"]
+            counts = histograms.get(rating["movie_id"])
+            if counts is None:
+                counts = histograms[rating["movie_id"]] = dict.fromkeys(HISTOGRAM_COLUMNS, 0)
+            counts[f"bucket_{bucket_for(rating['score'])}"] += 1
+        movies = Movie.__table__
+        await self.session.execute(
+            update(movies)
+            .where(movies.c.id == bindparam("b_movie_id"))
+            .values(
+                ratings_count=movies.c.ratings_count + bindparam("b_count"),
+                ratings_sum=movies.c.ratings_sum + bindparam("b_sum"),
+                rating_average=(movies.c.ratings_sum + bindparam("b_sum"))
+                / (movies.c.ratings_count + bindparam("b_count")),
+            ),
+            [
+                {"b_movie_id": movie_id, "b_count": count, "b_sum": total}
+                for movie_id, (count, total) in totals.items()
+            ],
+        )
+        await self.session.execute(
+            self._histogram_upsert(),
+            [{"movie_id": movie_id, **counts} for movie_id, counts in histograms.items()],
+        )
+        await self.session.commit()
+
+    def _histogram_upsert(self):
+        """Return an INSERT adding bucket counts to a movie's histogram row.
+
+        The row is created on a movie's first rating; later calls add the
+        given counts to it through ON CONFLICT DO UPDATE.
+        """
+        if self.session.get_bind().dialect.name == "postgresql":
+            statement = postgresql_insert(RatingHistogram)
+        else:
+            statement = sqlite_insert(RatingHistogram)
+        return statement.on_conflict_do_update(
+            index_elements=[RatingHistogram.movie_id],
+            set_={
+                column: getattr(RatingHistogram, column) + getattr(statement.excluded, column)
+                for column in HISTOGRAM_COLUMNS
+            },
+        )
+
+    async def get_histogram(self, movie_id: int) -> Optional[list[int]]:
+        """Fetch the rating counts of a movie per score bucket.
 
-    def get_by_id(self, rating_id: int) -> Optional[Rating]:
+        Args:
+            movie_id: Movie identifier.
+        Returns:
+            Counts of buckets 1 to 10, or None if the movie has no ratings.
+        """
+        histogram = await self.session.get(RatingHistogram, movie_id, populate_existing=True)
+        return histogram.counts() if histogram is not None else None
+
+    async def get_by_id(self, rating_id: int) -> Optional[Rating]:
         """Fetch a single rating by its primary key.
 
         Args:
@@ -36,9 +133,9 @@ class RatingRepository:
         Returns:
             The Rating instance if found; otherwise None.
         """
-        return self.session.query(Rating).filter(Rating.id == rating_id).first()
+        return await self.session.get(Rating, rating_id)
 
-    def get_by_movie_id(self, movie_id: int) -> list[Rating]:
+    async def get_by_movie_id(self, movie_id: int) -> list[Rating]:
         """Fetch all ratings for a specific movie.
 
         Args:
@@ -46,4 +143,29 @@ class RatingRepository:
         Returns:
             List of Rating instances for the movie.
         """
-        return self.session.query(Rating).filter(Rating.movie_id == movie_id).all()
+        result = await self.session.scalars(
+            select(Rating).where(Rating.movie_id == movie_id)
+        )
+        return list(result.all())
+
+    async def stream_since(self, since: datetime, batch_size: int = 1000) -> AsyncIterator[list]:
+        """Stream ratings created at or after a point in time.
+
+        The range is read through ix_movie_ratings_created_at, batch_size
+        rows per round trip.
+
+        Args:
+            since: Earliest creation time to include.
+            batch_size: Rows fetched per round trip.
+        Yields:
+            Lists of at most batch_size rows with movie_id, score and
+            created_at, oldest first.
+        """
+        result = await self.session.stream(
+            select(Rating.movie_id, Rating.score, Rating.created_at)
+            .where(Rating.created_at >= since)
+            .order_by(Rating.created_at)
+            .execution_options(yield_per=batch_size)
+        )
+        async for partition in result.partitions():
+            yield partition
@@ -0,0 +1,9 @@
+from .index import MovieSearchIndex, tokenize
+from .indexes import MOVIE_SEARCH_INDEX_REFRESH_SECONDS, movie_search_index
+
+__all__ = [
+    "MovieSearchIndex",
+    "tokenize",
+    "MOVIE_SEARCH_INDEX_REFRESH_SECONDS",
+    "movie_search_index",
+]
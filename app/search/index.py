@@ -0,0 +1,260 @@
+import bisect
+import re
+import time
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+from app.models import Movie
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+# Relative weight of a match in each indexed field
+FIELD_WEIGHTS = {"title": 3.0, "director": 2.0, "cast": 1.0}
+# Score multiplier by how a query token matched an indexed term
+EXACT_MATCH = 1.0
+PREFIX_MATCH = 0.6
+FUZZY_MATCH = 0.4
+# Query tokens shorter than this are never matched fuzzily
+FUZZY_MIN_LENGTH = 4
+
+
+def tokenize(text: Optional[str]) -> list[str]:
+    """Split text into lowercase, accent-free word tokens."""
+    if not text:
+        return []
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    folded = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return _TOKEN_PATTERN.findall(folded)
+
+
+def _deletions(term: str) -> set[str]:
+    """Return every string obtained by deleting one character from term."""
+    return {term[:i] + term[i + 1:] for i in range(len(term))}
+
+
+def _within_one_edit(a: str, b: str) -> bool:
+    """Whether a and b differ by at most one insertion, deletion,
+    substitution or transposition of adjacent characters."""
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) == len(b):
+        diffs = [i for i in range(len(a)) if a[i] != b[i]]
+        if len(diffs) == 1:
+            return True
+        return (len(diffs) == 2 and diffs[1] == diffs[0] + 1
+                and a[diffs[0]] == b[diffs[1]] and a[diffs[1]] == b[diffs[0]])
+    shorter, longer = (a, b) if len(a) < len(b) else (b, a)
+    for i in range(len(shorter)):
+        if shorter[i] != longer[i]:
+            return shorter[i:] == longer[i + 1:]
+    return True
+
+
+@dataclass
+class MovieDocument:
+    """Indexed view of a movie, also returned as a search hit."""
+    id: int
+    title: str
+    release_year: Optional[int]
+    director_name: Optional[str]
+    cast: Optional[str]
+    genres: list[str] = field(default_factory=list)
+    # Weight of each indexed term, keeping the best field it occurs in
+    terms: dict[str, float] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_movie(cls, movie: Movie) -> "MovieDocument":
+        """Build a document from a movie with director and genres loaded."""
+        document = cls(
+            id=movie.id,
+            title=movie.title,
+            release_year=movie.release_year,
+            director_name=movie.director.name if movie.director else None,
+            cast=movie.cast,
+            genres=[genre.name for genre in movie.genres],
+        )
+        for field_name, text in (
+                ("title", document.title),
+                ("director", document.director_name),
+                ("cast", document.cast)):
+            weight = FIELD_WEIGHTS[field_name]
+            for term in tokenize(text):
+                document.terms[term] = max(document.terms.get(term, 0.0), weight)
+        return document
+
+    def to_hit(self, score: float) -> dict:
+        """Serialize the document as a search hit."""
+        return {
+            "id": self.id,
+            "title": self.title,
+            "release_year": self.release_year,
+            "director_name": self.director_name,
+            "genres": list(self.genres),
+            "score": round(score, 3),
+        }
+
+
+class MovieSearchIndex:
+    """In-process inverted index over titles, cast and director names.
+
+    Every query token must match a term of the movie, exactly, as a
+    prefix of the term, or (for tokens of FUZZY_MIN_LENGTH characters or
+    more) within one edit. Prefix lookups use a sorted vocabulary; fuzzy
+    lookups use a single-deletion neighbourhood map, so neither scans the
+    vocabulary. Hits are ranked by field weight times match quality.
+
+    The index lives in one process and is only updated by writes made in
+    that process. Movies written by other workers or by the bulk importer
+    appear after the next full rebuild, which the application runs every
+    MOVIE_SEARCH_INDEX_REFRESH_SECONDS.
+
+    Attributes:
+        built_at: Unix time of the last full rebuild, or None.
+    """
+
+    def __init__(self):
+        self._documents: dict[int, MovieDocument] = {}
+        self._postings: dict[str, dict[int, float]] = {}
+        self._vocabulary: list[str] = []
+        self._deletion_map: dict[str, set[str]] = {}
+        self.built_at: Optional[float] = None
+        self.build_seconds: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def __contains__(self, movie_id: int) -> bool:
+        return movie_id in self._documents
+
+    def rebuild(self, movies: Iterable[Movie]) -> None:
+        """Replace the whole index with the given movies.
+
+        Args:
+            movies: Movies with director and genres loaded.
+        """
+        start = time.perf_counter()
+        self._documents.clear()
+        self._postings.clear()
+        self._vocabulary.clear()
+        self._deletion_map.clear()
+        for movie in movies:
+            self.add(movie)
+        self.built_at = time.time()
+        self.build_seconds = time.perf_counter() - start
+
+    def add(self, movie: Movie) -> None:
+        """Index a movie, replacing any previous version of it.
+
+        Args:
+            movie: Movie with director and genres loaded.
+        """
+        self.remove(movie.id)
+        document = MovieDocument.from_movie(movie)
+        self._documents[document.id] = document
+        for term, weight in document.terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                bisect.insort(self._vocabulary, term)
+                if len(term) >= FUZZY_MIN_LENGTH - 1:
+                    for variant in _deletions(term):
+                        self._deletion_map.setdefault(variant, set()).add(term)
+            postings[document.id] = weight
+
+    def remove(self, movie_id: int) -> None:
+        """Remove a movie from the index; unknown ids are ignored.
+
+        Args:
+            movie_id: ID of the movie to remove.
+        """
+        document = self._documents.pop(movie_id, None)
+        if document is None:
+            return
+        for term in document.terms:
+            postings = self._postings[term]
+            postings.pop(movie_id, None)
+            if postings:
+                continue
+            del self._postings[term]
+            del self._vocabulary[bisect.bisect_left(self._vocabulary, term)]
+            for variant in _deletions(term):
+                variants = self._deletion_map.get(variant)
+                if variants is not None:
+                    variants.discard(term)
+                    if not variants:
+                        del self._deletion_map[variant]
+
+    def _matching_terms(self, token: str) -> dict[str, float]:
+        """Return the indexed terms a query token matches, with match quality."""
+        matches: dict[str, float] = {}
+        position = bisect.bisect_left(self._vocabulary, token)
+        while position < len(self._vocabulary) and self._vocabulary[position].startswith(token):
+            term = self._vocabulary[position]
+            matches[term] = EXACT_MATCH if term == token else PREFIX_MATCH
+            position += 1
+        if len(token) >= FUZZY_MIN_LENGTH:
+            candidates = set(self._deletion_map.get(token, ()))
+            for variant in _deletions(token):
+                if variant in self._postings:
+                    candidates.add(variant)
+                candidates.update(self._deletion_map.get(variant, ()))
+            for term in candidates:
+                if term not in matches and _within_one_edit(token, term):
+                    matches[term] = FUZZY_MATCH
+        return matches
+
+    def search(self, query: str, *,
+               genre: Optional[str] = None,
+               year: Optional[int] = None,
+               limit: int = 10) -> list[dict]:
+        """Find the best matching movies for a query.
+
+        Args:
+            query: Free text; every token must match.
+            genre: Only return movies with this genre, case-insensitive (optional).
+            year: Only return movies released this year (optional).
+            limit: Maximum number of hits.
+        Returns:
+            Hits ordered by descending score, then title.
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+        scores: Optional[dict[int, float]] = None
+        for token in tokens:
+            token_scores: dict[int, float] = {}
+            for term, quality in self._matching_terms(token).items():
+                for movie_id, weight in self._postings[term].items():
+                    if scores is not None and movie_id not in scores:
+                        continue
+                    token_scores[movie_id] = max(token_scores.get(movie_id, 0.0), weight * quality)
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {movie_id: scores[movie_id] + score
+                          for movie_id, score in token_scores.items()}
+            if not scores:
+                return []
+        genre = genre.lower() if genre else None
+        hits = []
+        for movie_id, score in scores.items():
+            document = self._documents[movie_id]
+            if year is not None and document.release_year != year:
+                continue
+            if genre is not None and genre not in (name.lower() for name in document.genres):
+                continue
+            hits.append((score, document))
+        hits.sort(key=lambda hit: (-hit[0], hit[1].title))
+        return [document.to_hit(score) for score, document in hits[:limit]]
+
+    def stats(self) -> dict:
+        """Return index size and build information."""
+        return {
+            "documents": len(self._documents),
+            "terms": len(self._postings),
+            "built_at": self.built_at,
+            "build_ms": round(self.build_seconds * 1000, 3) if self.build_seconds is not None else None,
+        }
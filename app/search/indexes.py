@@ -0,0 +1,15 @@
+import os
+
+from dotenv import load_dotenv
+
+from .index import MovieSearchIndex
+
+load_dotenv()
+MOVIE_SEARCH_INDEX = os.getenv("MOVIE_SEARCH_INDEX", "false").lower() in ("1", "true", "yes")
+# Seconds between full rebuilds from the database; 0 rebuilds only at startup
+MOVIE_SEARCH_INDEX_REFRESH_SECONDS = float(os.getenv("MOVIE_SEARCH_INDEX_REFRESH_SECONDS", "300"))
+
+# Built at startup, rebuilt every MOVIE_SEARCH_INDEX_REFRESH_SECONDS and kept
+# current by MovieService writes in between; None when the in-process search
+# index is disabled.
+movie_search_index = MovieSearchIndex() if MOVIE_SEARCH_INDEX else None
@@ -2,10 +2,12 @@ from .director_service import DirectorService
 from .movie_service import MovieService
 from .genre_service import GenreService
 from .rating_service import RatingService
+from .rating_write_buffer import RatingWriteBuffer
 
 __all__ = [
     "DirectorService",
     "MovieService",
     "GenreService",
     "RatingService",
+    "RatingWriteBuffer",
 ]
\ No newline at end of file
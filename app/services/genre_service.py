@@ -3,50 +3,127 @@ from typing import Optional
 from app.models import Genre
 from app.repositories import GenreRepository
 from app.exceptions.service_exception import ExistanceError
+from app.db.routing import replica_read
+from app.cache import GenreCache, list_query_cache
 
 
 class GenreService:
     """Service layer for Genre-related operations."""
-    def __init__(self, genre_repository: GenreRepository):
-        """Initialize the GenreService with a GenreRepository."""
+    def __init__(self, genre_repository: GenreRepository,
+                 genre_cache: Optional[GenreCache] = None):
+        """Initialize the GenreService with a GenreRepository.
+
+        When a genre_cache is given, lookups are answered from it; the
+        database is only queried to reload it or for names and ids it does
+        not know, which may have been created by another worker.
+        """
         self.genre_repository = genre_repository
+        self.genre_cache = genre_cache
+
+    @replica_read
+    async def refresh_genre_cache(self) -> None:
+        """Reload the genre cache from the database."""
+        if self.genre_cache is not None:
+            self.genre_cache.load(await self.genre_repository.get_all())
+
+    async def _fresh_genre_cache(self) -> Optional[GenreCache]:
+        """Return the genre cache, reloading it first if it is stale."""
+        if self.genre_cache is not None and self.genre_cache.is_stale():
+            await self.refresh_genre_cache()
+        return self.genre_cache
 
-    def get_genre_by_id(self, genre_id: int) -> Optional[Genre]:
-        return self.genre_repository.get_by_id(genre_id)
+    @replica_read
+    async def get_genre_by_id(self, genre_id: int) -> Optional[Genre]:
+        cache = await self._fresh_genre_cache()
+        if cache is not None and (genre := cache.get_by_id(genre_id)) is not None:
+            return genre
+        genre = await self.genre_repository.get_by_id(genre_id)
+        if genre is not None and cache is not None:
+            await self.refresh_genre_cache()
+        return genre
 
-    def get_genre_by_name(self, name: str) -> Optional[Genre]:
-        return self.genre_repository.get_by_name(name)
+    @replica_read
+    async def get_genre_by_name(self, name: str) -> Optional[Genre]:
+        cache = await self._fresh_genre_cache()
+        if cache is not None and (genre := cache.get_by_name(name)) is not None:
+            return genre
+        genre = await self.genre_repository.get_by_name(name)
+        if genre is not None and cache is not None:
+            await self.refresh_genre_cache()
+        return genre
 
-    def create_genre(self, name: str, description: str = None) -> Genre:
+    async def create_genre(self, name: str, description: str = None) -> Genre:
         # Check if genre already exists
-        existing_genre = self.get_genre_by_name(name)
+        existing_genre = await self.genre_repository.get_by_name(name)
         if existing_genre:
             raise ExistanceError(f"Genre with name '{name}' already exists.")
         new_genre = Genre(name=name, description=description)
-        self.genre_repository.add(new_genre)
+        await self.genre_repository.add(new_genre)
+        await list_query_cache.bump()
+        await self.refresh_genre_cache()
         return new_genre
 
-    def genre_names_to_genre_list(self, genre_names: list[str]) -> list[Genre]:
-        """Convert a list of genre names to a list of Genre objects."""
-        genres = []
-        for name in genre_names:
-            genre = self.get_genre_by_name(name)
-            if genre:
-                genres.append(genre)
-            else:
-                raise ExistanceError(f"Genre with name '{name}' does not exist.")
-        return genres
-
-    def genre_ids_to_genre_list(self, genre_ids: list[int]) -> list[Genre]:
-        """Convert a list of genre IDs to a list of Genre objects."""
-        genres = []
-        for genre_id in genre_ids:
-            genre = self.get_genre_by_id(genre_id)
-            if genre:
-                genres.append(genre)
-            else:
-                raise ExistanceError(f"Genre with ID '{genre_id}' does not exist.")
-        return genres
+    @replica_read
+    async def genre_names_to_genre_list(self, genre_names: list[str]) -> list[Genre]:
+        """Convert a list of genre names to a list of Genre objects.
+
+        Names are resolved from the genre cache; any it does not know are
+        looked up with a single query. Repeated names are
+        returned once, in order of first appearance.
+
+        Raises:
+            ExistanceError: Naming every genre that does not exist.
+        """
+        names = list(dict.fromkeys(genre_names))
+        found = await self._cached_genres(names, key="name")
+        missing = [name for name in names if name not in found]
+        if missing:
+            found.update(
+                (genre.name, genre) for genre in await self.genre_repository.get_by_names(missing)
+            )
+            missing = [name for name in names if name not in found]
+        if len(missing) == 1:
+            raise ExistanceError(f"Genre with name '{missing[0]}' does not exist.")
+        if missing:
+            raise ExistanceError(
+                "Genres with names " + ", ".join(f"'{name}'" for name in missing) + " do not exist."
+            )
+        return [found[name] for name in names]
+
+    @replica_read
+    async def genre_ids_to_genre_list(self, genre_ids: list[int]) -> list[Genre]:
+        """Convert a list of genre IDs to a list of Genre objects.
+
+        IDs are resolved from the genre cache; any it does not know are
+        looked up with a single query. Repeated IDs are
+        returned once, in order of first appearance.
+
+        Raises:
+            ExistanceError: Naming every genre ID that does not exist.
+        """
+        genre_ids = list(dict.fromkeys(genre_ids))
+        found = await self._cached_genres(genre_ids, key="id")
+        missing = [genre_id for genre_id in genre_ids if genre_id not in found]
+        if missing:
+            found.update(
+                (genre.id, genre) for genre in await self.genre_repository.get_by_ids(missing)
+            )
+            missing = [genre_id for genre_id in genre_ids if genre_id not in found]
+        if len(missing) == 1:
+            raise ExistanceError(f"Genre with ID '{missing[0]}' does not exist.")
+        if missing:
+            raise ExistanceError(
+                "Genres with IDs " + ", ".join(f"'{genre_id}'" for genre_id in missing) + " do not exist."
+            )
+        return [found[genre_id] for genre_id in genre_ids]
+
+    async def _cached_genres(self, keys: list, key: str) -> dict:
+        """Return the genres of the cache matching ids or names, keyed by them."""
+        cache = await self._fresh_genre_cache()
+        if cache is None:
+            return {}
+        lookup = cache.get_by_id if key == "id" else cache.get_by_name
+        return {value: genre for value in keys if (genre := lookup(value)) is not None}
 
     @staticmethod
     def genre_list_to_genre_names(genres: list[Genre]) -> list[str]:
@@ -1,68 +1,324 @@
-from typing import Optional, Type, List
+from typing import Any, AsyncIterator, Optional, List, Tuple
 
 from app.models import Movie, Genre
 from app.repositories import MovieRepository, DirectorRepository
+from app.repositories.movie_repository import MOVIE_SORT_COLUMNS
 from app.exceptions.service_exception import *
+from app.db.routing import replica_read
+from app.cache import list_query_cache, movie_detail_cache
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.cast import parse_cast
+from app.search import MovieSearchIndex
+from app.leaderboards import LEADERBOARD_MAX_LIMIT, MovieLeaderboards, TrendingTracker, normalize_scope
 
 
 class MovieService:
     """Service layer for Movie-related operations."""
     def __init__(self, movie_repository: MovieRepository,
-                 director_repository: DirectorRepository = None):
-        """Initialize the MovieService with a MovieRepository."""
+                 director_repository: DirectorRepository = None,
+                 search_index: Optional[MovieSearchIndex] = None,
+                 leaderboards: Optional[MovieLeaderboards] = None,
+                 trending: Optional[TrendingTracker] = None):
+        """Initialize the MovieService with a MovieRepository.
+
+        When a search_index is given, search_movies is served from it and
+        movie writes keep it up to date; the same holds for leaderboards
+        and get_leaderboard, and for trending and get_trending.
+        """
         self.movie_repository = movie_repository
         self.director_repository = director_repository
+        self.search_index = search_index
+        self.leaderboards = leaderboards
+        self.trending = trending
+
+    @replica_read
+    async def get_movie_by_id(self, movie_id: int) -> Optional[Movie]:
+        return await self.movie_repository.get_by_id(movie_id)
+
+    async def get_movie_by_title(self, title: str) -> Optional[Movie]:
+        return await self.movie_repository.get_by_title(title)
+
+    @replica_read
+    async def get_movies(self, page: int = 1, page_size: int = 10, *,
+                          title: Optional[str] = None,
+                          release_year: Optional[int] = None,
+                          director_name: Optional[str] = None,
+                          genre: Optional[Genre] = None,
+                          cast_member: Optional[str] = None,
+                          search: Optional[str] = None,
+                          year_from: Optional[int] = None,
+                          year_to: Optional[int] = None,
+                          min_rating: Optional[float] = None,
+                          sort: Optional[str] = None,
+                          order: str = "asc"
+                         ) -> Tuple[list[Movie], int]:
+        """Return one page of movies and the total number of matches.
+
+        With search, movies whose title or director name contains the text
+        are returned, best matches first unless a sort is given.
+
+        Args:
+            page: 1-based page number.
+            page_size: Number of movies per page.
+            title: Title substring to filter by (optional).
+            release_year: Release year to filter by (optional).
+            director_name: Director name substring to filter by (optional).
+            genre: Genre to filter by (optional).
+            cast_member: Name of a cast member to filter by (optional).
+            search: Text to search titles and director names for (optional).
+            year_from: Earliest release year, inclusive (optional).
+            year_to: Latest release year, inclusive (optional).
+            min_rating: Minimum average rating; excludes unrated movies (optional).
+            sort: One of id, title, release_year, average_rating or
+                ratings_count (optional; defaults to id, or relevance
+                when searching).
+            order: "asc" or "desc".
+        Returns:
+            Tuple of (movies on the requested page, filtered total count).
+        Raises:
+            ValueError: If page or page_size is not a positive integer, or
+                the sort, order or year range is invalid.
+        """
+        if page < 1 or page_size < 1:
+            raise ValueError("Page and page_size must be positive integers.")
+        self._check_listing(sort, order, year_from, year_to)
+        filters = dict(
+            title=title,
+            director=director_name,
+            release_year=release_year,
+            genre=genre,
+            cast_member=cast_member,
+            search=search.strip() if search else None,
+            year_from=year_from,
+            year_to=year_to,
+            min_rating=min_rating,
+        )
+        total = await self.movie_repository.count_movies(**filters)
+        if total == 0 or (page - 1) * page_size >= total:
+            return [], total
+        movies = await self.movie_repository.find_movies(
+            **filters,
+            sort=sort,
+            descending=order == "desc",
+            offset=(page - 1) * page_size,
+            limit=page_size,
+        )
+        return movies, total
 
-    def get_movie_by_id(self, movie_id: int) -> Optional[Movie]:
-        return self.movie_repository.get_by_id(movie_id)
+    @replica_read
+    async def get_movies_after(self, cursor: Optional[str] = None,
+                               page_size: int = 10, *,
+                               title: Optional[str] = None,
+                               release_year: Optional[int] = None,
+                               director_name: Optional[str] = None,
+                               genre: Optional[Genre] = None,
+                               cast_member: Optional[str] = None,
+                               search: Optional[str] = None,
+                               year_from: Optional[int] = None,
+                               year_to: Optional[int] = None,
+                               min_rating: Optional[float] = None,
+                               sort: Optional[str] = None,
+                               order: str = "asc"
+                               ) -> Tuple[list[Movie], Optional[str]]:
+        """Return the page of movies that follows a keyset cursor.
 
-    def get_movie_by_title(self, title: str) -> Optional[Movie]:
-        return self.movie_repository.get_by_title(title)
+        Unlike get_movies, the cost of a page does not depend on how far
+        into the result set it is, and no total count is computed.
 
-    def get_movies(self, page: int = 1, page_size: int = 10, *,
-                    title: Optional[str] = None,
-                    release_year: Optional[int] = None,
-                    director_name: Optional[str] = None,
-                    genre: Optional[Genre] = None
-                   ) -> list[Type[Movie]]:
-        result_movies = self.movie_repository.find_movies(
+        Args:
+            cursor: Cursor returned with the previous page; empty or None
+                starts from the first movie.
+            page_size: Number of movies per page.
+            title: Title substring to filter by (optional).
+            release_year: Release year to filter by (optional).
+            director_name: Director name substring to filter by (optional).
+            genre: Genre to filter by (optional).
+            cast_member: Name of a cast member to filter by (optional).
+            search: Text to search titles and director names for; only
+                supported together with a sort, since relevance-ranked
+                results are paginated with get_movies (optional).
+            year_from: Earliest release year, inclusive (optional).
+            year_to: Latest release year, inclusive (optional).
+            min_rating: Minimum average rating; excludes unrated movies (optional).
+            sort: Sort key as in get_movies (optional; defaults to id).
+            order: "asc" or "desc".
+        Returns:
+            Tuple of (movies on the page, cursor for the next page or None
+            when this is the last page).
+        Raises:
+            ValueError: If page_size is not positive, the cursor is invalid
+                or was issued for another sort, the sort, order or year
+                range is invalid, or a search is requested without a sort.
+        """
+        if page_size < 1:
+            raise ValueError("Page size must be a positive integer.")
+        if search and sort is None:
+            raise ValueError("Search results cannot be paginated with a cursor.")
+        self._check_listing(sort, order, year_from, year_to)
+        sort = sort or "id"
+        position = decode_cursor(cursor)
+        after_id = after_value = None
+        if position is not None:
+            after_id = position.get("id")
+            after_value = position.get("k")
+            if not isinstance(after_id, int):
+                raise ValueError("Invalid pagination cursor.")
+            if (position.get("s", "id"), position.get("o", "asc")) != (sort, order):
+                raise ValueError("Pagination cursor was issued for a different sort order.")
+        movies = await self.movie_repository.find_movies(
             title=title,
             director=director_name,
             release_year=release_year,
             genre=genre,
+            cast_member=cast_member,
+            search=search.strip() if search else None,
+            year_from=year_from,
+            year_to=year_to,
+            min_rating=min_rating,
+            sort=sort,
+            descending=order == "desc",
+            limit=page_size + 1,
+            after_id=after_id,
+            after_value=after_value,
         )
-        return self.paginator(result_movies, page, page_size)
+        if len(movies) <= page_size:
+            return movies, None
+        movies = movies[:page_size]
+        return movies, self.cursor_for(movies[-1], sort, order)
+
+    def search_movies(self, query: str, *,
+                      genre: Optional[str] = None,
+                      year: Optional[int] = None,
+                      limit: int = 10) -> list[dict]:
+        """Search the in-process index by title, cast and director name.
+
+        Args:
+            query: Search text; the last word may be incomplete.
+            genre: Genre name to filter by (optional).
+            year: Release year to filter by (optional).
+            limit: Maximum number of hits.
+        Returns:
+            Search hits ordered by relevance.
+        Raises:
+            ValueError: If limit is not positive.
+        """
+        if limit < 1:
+            raise ValueError("Limit must be a positive integer.")
+        return self.search_index.search(query, genre=genre, year=year, limit=limit)
+
+    def get_leaderboard(self, scope: str, limit: int = 10) -> tuple[str, list[dict]]:
+        """Return the top-rated movies of a leaderboard.
+
+        Args:
+            scope: "overall", "genre:<name>" or "decade:<year>".
+            limit: Maximum number of movies.
+        Returns:
+            Tuple of (normalized scope, ranked movies best first).
+        Raises:
+            ValueError: If the scope is malformed or limit is out of range.
+        """
+        if not 1 <= limit <= LEADERBOARD_MAX_LIMIT:
+            raise ValueError(f"Limit must be between 1 and {LEADERBOARD_MAX_LIMIT}.")
+        scope = normalize_scope(scope)
+        return scope, self.leaderboards.top(scope, limit)
+
+    @replica_read
+    async def get_trending(self, limit: int = 10) -> list[dict]:
+        """Return the movies rated most in the recent past.
+
+        Movies are ranked in memory by their exponentially decayed number
+        of ratings; only the titles of the returned movies are read from
+        the database, with one IN query.
+
+        Args:
+            limit: Maximum number of movies.
+        Returns:
+            Dicts with id, title, release_year, trend_score and
+            recent_average, best first.
+        Raises:
+            ValueError: If limit is out of range.
+        """
+        if not 1 <= limit <= LEADERBOARD_MAX_LIMIT:
+            raise ValueError(f"Limit must be between 1 and {LEADERBOARD_MAX_LIMIT}.")
+        top = self.trending.top(limit)
+        summaries = await self.movie_repository.get_summaries([item["movie_id"] for item in top])
+        trending = []
+        for item in top:
+            # Movies deleted by another worker are still tracked here
+            if item["movie_id"] not in summaries:
+                continue
+            title, release_year = summaries[item["movie_id"]]
+            trending.append({
+                "id": item["movie_id"],
+                "title": title,
+                "release_year": release_year,
+                "trend_score": item["trend_score"],
+                "recent_average": item["recent_average"],
+            })
+        return trending
+
+    async def export_catalog(self, batch_size: int = 1000) -> AsyncIterator[list[dict]]:
+        """Stream the whole catalog for export, batch_size movies at a time.
+
+        Args:
+            batch_size: Movies fetched per round trip.
+        Yields:
+            Lists of export rows with director and genre names joined in.
+        """
+        async for rows in self.movie_repository.stream_catalog(batch_size):
+            yield [
+                {
+                    "id": row.id,
+                    "title": row.title,
+                    "release_year": row.release_year,
+                    "director": row.director,
+                    "cast": row.cast,
+                    "genres": row.genres.split("|") if row.genres else [],
+                    "ratings_count": row.ratings_count,
+                    "average_rating": round(row.average_rating, 1) if row.average_rating is not None else None,
+                }
+                for row in rows
+            ]
 
     @staticmethod
-    def paginator(input_list: list[Type[Movie]], page: int, page_size: int) -> list[Type[Movie]]:
-        """Utility function to paginate a list of items."""
-        # Check if page and page_size are valid
-        if len(input_list) == 0:
-            return []
-        if page < 1 or page_size < 1:
-            raise ValueError("Page and page_size must be positive integers.")
-        max_page = (len(input_list) + page_size - 1) // page_size
-        if page > max_page:
-            raise ValueError("Page number exceeds maximum number of pages.")
-
-        start_index = (page - 1) * page_size
-        end_index = start_index + page_size
-        if start_index >= len(input_list):
-            return []
-        if end_index >= len(input_list):
-            return input_list[start_index:]
-        return input_list[start_index:end_index]
-
-    def create_movie(self, title: str,
-                     director_id: int,
-                     release_year: int = None,
-                     cast: str = None,
-                     genre: List[Genre] = [],
-                     ) -> Movie:
-        existing_movie = self.get_movie_by_title(title)
+    def _check_listing(sort: Optional[str], order: str,
+                       year_from: Optional[int], year_to: Optional[int]) -> None:
+        """Validate the sort and year range of a listing.
+
+        Raises:
+            ValueError: If the sort or order is unknown, or year_from is
+                after year_to.
+        """
+        if sort is not None and sort not in MOVIE_SORT_COLUMNS:
+            raise ValueError(f"Sort must be one of: {', '.join(MOVIE_SORT_COLUMNS)}.")
+        if order not in ("asc", "desc"):
+            raise ValueError("Order must be 'asc' or 'desc'.")
+        if year_from is not None and year_to is not None and year_from > year_to:
+            raise ValueError("year_from must not be after year_to.")
+
+    @staticmethod
+    def cursor_for(movie: Movie, sort: Optional[str] = None, order: str = "asc") -> str:
+        """Build the cursor that resumes a listing right after a movie.
+
+        Cursors of the default id ordering only hold the id; other sorts
+        also record the sort value of the movie and the sort itself.
+        """
+        sort = sort or "id"
+        if sort == "id" and order == "asc":
+            return encode_cursor({"id": movie.id})
+        value: Any = getattr(movie, MOVIE_SORT_COLUMNS[sort].key)
+        return encode_cursor({"id": movie.id, "k": value, "s": sort, "o": order})
+
+    async def create_movie(self, title: str,
+                           director_id: int,
+                           release_year: int = None,
+                           cast: str = None,
+                           genre: List[Genre] = [],
+                           ) -> Movie:
+        existing_movie = await self.get_movie_by_title(title)
         if existing_movie:
             raise UniquenessError(f"Movie with title '{title}' already exists.")
-        director = self.director_repository.get_by_id(director_id)
+        director = await self.director_repository.get_by_id(director_id)
         if not director:
             raise ExistanceError(f"Director with ID '{director_id}' does not exist.")
         new_movie = Movie(
@@ -71,17 +327,22 @@ class MovieService:
             release_year=release_year,
             cast=cast,
         )
-        self.movie_repository.add(new_movie)
-        for g in genre:
-            self.movie_repository.add_genre_to_movie(new_movie, g)
-        return new_movie
-
-    def update_movie(self, movie_id: int,
-                     title: str = None,
-                     director_id: int = None,
-                     release_year: int = None,
-                     cast: str = None,
-                     genres: List[Genre] = None) -> Movie:
+        await self.movie_repository.create(new_movie, genre, parse_cast(cast))
+        await list_query_cache.bump()
+        # Reload with relationships eagerly loaded for the response
+        movie = await self.get_movie_by_id(new_movie.id)
+        if self.search_index is not None:
+            self.search_index.add(movie)
+        if self.leaderboards is not None:
+            self.leaderboards.upsert_movie(movie)
+        return movie
+
+    async def update_movie(self, movie_id: int,
+                           title: str = None,
+                           director_id: int = None,
+                           release_year: int = None,
+                           cast: str = None,
+                           genres: List[Genre] = None) -> Movie:
         """Update an existing movie.
         
         Args:
@@ -99,20 +360,20 @@ class MovieService:
             ExistanceError: If movie or director does not exist
             UniquenessError: If new title conflicts with existing movie
         """
-        movie = self.get_movie_by_id(movie_id)
+        movie = await self.movie_repository.get_by_id(movie_id)
         if not movie:
             raise ExistanceError(f"Movie with ID '{movie_id}' does not exist.")
         
         # Update title if provided
         if title is not None and title != movie.title:
-            existing_movie = self.get_movie_by_title(title)
+            existing_movie = await self.get_movie_by_title(title)
             if existing_movie:
                 raise UniquenessError(f"Movie with title '{title}' already exists.")
             movie.title = title
         
         # Update director if provided
         if director_id is not None:
-            director = self.director_repository.get_by_id(director_id)
+            director = await self.director_repository.get_by_id(director_id)
             if not director:
                 raise ExistanceError(f"Director with ID '{director_id}' does not exist.")
             movie.director_id = director_id
@@ -125,12 +386,22 @@ class MovieService:
         
         # Update genres if provided
         if genres is not None:
-            self.movie_repository.update_movie_genres(movie, genres)
+            await self.movie_repository.update_movie_genres(movie, genres)
+        if cast is not None:
+            await self.movie_repository.replace_cast(movie, parse_cast(cast))
         
-        self.movie_repository.update(movie)
+        await self.movie_repository.update(movie)
+        movie_detail_cache.invalidate(movie_id)
+        await list_query_cache.bump()
+        # Reload with relationships eagerly loaded for the response
+        movie = await self.get_movie_by_id(movie_id)
+        if self.search_index is not None:
+            self.search_index.add(movie)
+        if self.leaderboards is not None:
+            self.leaderboards.upsert_movie(movie)
         return movie
 
-    def delete_movie(self, movie_id: int) -> None:
+    async def delete_movie(self, movie_id: int) -> None:
         """Delete a movie by ID.
         
         Args:
@@ -139,11 +410,20 @@ class MovieService:
         Raises:
             ExistanceError: If movie does not exist
         """
-        movie = self.get_movie_by_id(movie_id)
+        movie = await self.movie_repository.get_by_id(movie_id)
         if not movie:
             raise ExistanceError(f"Movie with ID '{movie_id}' does not exist.")
-        self.movie_repository.delete(movie)
+        await self.movie_repository.delete(movie)
+        movie_detail_cache.invalidate(movie_id)
+        await list_query_cache.bump()
+        if self.search_index is not None:
+            self.search_index.remove(movie_id)
+        if self.leaderboards is not None:
+            self.leaderboards.remove(movie_id)
+        if self.trending is not None:
+            self.trending.remove(movie_id)
 
-    def count_movies(self) -> int:
+    @replica_read
+    async def count_movies(self) -> int:
         """Return the total number of movies."""
-        return self.movie_repository.count()
\ No newline at end of file
+        return await self.movie_repository.count()
\ No newline at end of file
@@ -1,19 +1,34 @@
 from typing import Optional
 
-from app.models import Rating, Movie
+from app.models import HISTOGRAM_BUCKETS, Rating, Movie
 from app.repositories import RatingRepository, MovieRepository
 from app.exceptions.service_exception import ExistanceError
+from app.cache import list_query_cache, movie_detail_cache
+from app.leaderboards import MovieLeaderboards, TrendingTracker
+from .rating_write_buffer import RatingWriteBuffer
 
 
 class RatingService:
     """Service layer for Rating-related operations."""
     def __init__(self, rating_repository: RatingRepository,
-                 movie_repository: MovieRepository):
-        """Initialize the RatingService with repositories."""
+                 movie_repository: MovieRepository,
+                 rating_buffer: Optional[RatingWriteBuffer] = None,
+                 leaderboards: Optional[MovieLeaderboards] = None,
+                 trending: Optional[TrendingTracker] = None):
+        """Initialize the RatingService with repositories.
+
+        When a rating_buffer is given, enqueue_rating writes ratings behind
+        the request instead of committing them one by one. When
+        leaderboards or trending are given, every committed rating is
+        counted in them.
+        """
         self.rating_repository = rating_repository
         self.movie_repository = movie_repository
+        self.rating_buffer = rating_buffer
+        self.leaderboards = leaderboards
+        self.trending = trending
 
-    def create_rating(self, movie_id: int, score: float) -> Rating:
+    async def create_rating(self, movie_id: int, score: float) -> Rating:
         """Create a new rating for a movie.
         
         Args:
@@ -28,8 +43,7 @@ class RatingService:
             ValueError: If score is not between 1 and 10
         """
         # Check if movie exists
-        movie = self.movie_repository.get_by_id(movie_id)
-        if not movie:
+        if not await self.movie_repository.exists(movie_id):
             raise ExistanceError(f"Movie with ID '{movie_id}' does not exist.")
         
         # Validate score
@@ -41,10 +55,70 @@ class RatingService:
             movie_id=movie_id,
             score=score
         )
-        self.rating_repository.add(new_rating)
+        await self.rating_repository.add(new_rating)
+        movie_detail_cache.invalidate(movie_id)
+        await list_query_cache.bump()
+        if self.leaderboards is not None:
+            self.leaderboards.record(movie_id, 1, score)
+        if self.trending is not None:
+            self.trending.record(movie_id, score, new_rating.created_at.timestamp())
         return new_rating
 
-    def get_ratings_for_movie(self, movie_id: int) -> list[Rating]:
+    async def enqueue_rating(self, movie_id: int, score: float) -> None:
+        """Validate a rating and queue it on the write-behind buffer.
+
+        Args:
+            movie_id: ID of the movie to rate
+            score: Rating score (1-10)
+
+        Raises:
+            ExistanceError: If movie does not exist
+            ValueError: If score is not between 1 and 10
+            CapacityError: If the buffer is full
+        """
+        if not await self.movie_repository.exists(movie_id):
+            raise ExistanceError(f"Movie with ID '{movie_id}' does not exist.")
+        if score < 1 or score > 10:
+            raise ValueError("Score must be between 1 and 10.")
+        self.rating_buffer.submit(movie_id, score)
+
+    async def create_ratings_bulk(self, ratings: list[dict]) -> list[dict]:
+        """Create many already-validated ratings in one transaction.
+
+        Movie existence is checked for the whole batch with a single IN
+        query; ratings for unknown movies are reported and skipped while
+        the rest are inserted with a multi-row INSERT.
+
+        Args:
+            ratings: Rating rows as dicts with movie_id and score keys
+
+        Returns:
+            Errors as dicts with the index of the rejected rating in the
+            input list and an error message
+        """
+        existing = await self.movie_repository.get_existing_ids(
+            [rating["movie_id"] for rating in ratings]
+        )
+        rows = []
+        errors = []
+        for index, rating in enumerate(ratings):
+            if rating["movie_id"] in existing:
+                rows.append({"movie_id": rating["movie_id"], "score": rating["score"]})
+            else:
+                errors.append({
+                    "index": index,
+                    "error": f"Movie with ID '{rating['movie_id']}' does not exist.",
+                })
+        await self.rating_repository.add_many(rows)
+        movie_detail_cache.invalidate(*existing)
+        await list_query_cache.bump()
+        if self.leaderboards is not None:
+            self.leaderboards.record_many(rows)
+        if self.trending is not None:
+            self.trending.record_many(rows)
+        return errors
+
+    async def get_ratings_for_movie(self, movie_id: int) -> list[Rating]:
         """Get all ratings for a specific movie.
         
         Args:
@@ -53,9 +127,31 @@ class RatingService:
         Returns:
             List of Rating instances
         """
-        return self.rating_repository.get_by_movie_id(movie_id)
+        return await self.rating_repository.get_by_movie_id(movie_id)
+
+    async def get_rating_histogram(self, movie_id: int) -> list[dict]:
+        """Get the distribution of a movie's rating scores.
+
+        Served from the per-movie bucket counts, so the cost does not
+        depend on the number of ratings.
+
+        Args:
+            movie_id: ID of the movie
+
+        Returns:
+            One dict per score bucket, 1 to 10, with score and count keys
+
+        Raises:
+            ExistanceError: If movie does not exist
+        """
+        counts = await self.rating_repository.get_histogram(movie_id)
+        if counts is None:
+            if not await self.movie_repository.exists(movie_id):
+                raise ExistanceError(f"Movie with ID '{movie_id}' does not exist.")
+            counts = [0] * len(HISTOGRAM_BUCKETS)
+        return [{"score": bucket, "count": count} for bucket, count in zip(HISTOGRAM_BUCKETS, counts)]
 
-    def calculate_average_rating(self, movie_id: int) -> Optional[float]:
+    async def calculate_average_rating(self, movie_id: int) -> Optional[float]:
         """Calculate the average rating for a movie.
         
         Args:
@@ -64,12 +160,13 @@ class RatingService:
         Returns:
             Average rating score, or None if no ratings exist
         """
-        ratings = self.get_ratings_for_movie(movie_id)
-        if not ratings:
+        totals = await self.movie_repository.get_rating_totals(movie_id)
+        if not totals or not totals[0]:
             return None
-        return sum(r.score for r in ratings) / len(ratings)
+        count, total = totals
+        return total / count
 
-    def get_ratings_count(self, movie_id: int) -> int:
+    async def get_ratings_count(self, movie_id: int) -> int:
         """Get the count of ratings for a movie.
         
         Args:
@@ -78,4 +175,5 @@ class RatingService:
         Returns:
             Number of ratings
         """
-        return len(self.get_ratings_for_movie(movie_id))
+        totals = await self.movie_repository.get_rating_totals(movie_id)
+        return totals[0] if totals else 0
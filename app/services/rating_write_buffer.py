@@ -0,0 +1,264 @@
+import asyncio
+import os
+from collections import deque
+from typing import Callable, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import list_query_cache, movie_detail_cache
+from app.exceptions.service_exception import CapacityError
+from app.leaderboards import MovieLeaderboards, TrendingTracker
+from app.repositories import MovieRepository, RatingRepository
+from app.utils.logging_config import logger
+
+load_dotenv()
+RATING_WRITE_BEHIND = os.getenv("RATING_WRITE_BEHIND", "false").lower() in ("1", "true", "yes")
+RATING_BUFFER_MAX_SIZE = int(os.getenv("RATING_BUFFER_MAX_SIZE", "10000"))
+RATING_BUFFER_BATCH_SIZE = int(os.getenv("RATING_BUFFER_BATCH_SIZE", "500"))
+RATING_BUFFER_FLUSH_INTERVAL = float(os.getenv("RATING_BUFFER_FLUSH_INTERVAL", "0.5"))
+RATING_BUFFER_RETRY_BACKOFF = float(os.getenv("RATING_BUFFER_RETRY_BACKOFF", "0.5"))
+RATING_BUFFER_MAX_RETRIES = int(os.getenv("RATING_BUFFER_MAX_RETRIES", "5"))
+
+
+class RatingWriteBuffer:
+    """Bounded in-process queue that writes ratings behind the request.
+
+    Ratings are accepted into a fixed-size queue and flushed by a background
+    asyncio task as multi-row INSERTs, whenever batch_size ratings are
+    waiting or flush_interval seconds have passed. A full queue rejects new ratings
+    with CapacityError instead of growing without bound.
+
+    A batch that fails to write goes back to the front of the queue and is
+    retried after an exponential backoff. Only ratings that violate a
+    constraint on their own are dropped.
+
+    Attributes:
+        max_size: Maximum number of ratings waiting to be written.
+        batch_size: Number of ratings written per INSERT.
+        flush_interval: Maximum seconds a rating waits before being flushed.
+        retry_backoff: Seconds to wait after the first failed flush; doubled
+            after every further consecutive failure.
+        max_retries: Number of doublings of the backoff, and of retries made
+            on shutdown before the remaining ratings are given up.
+    """
+
+    def __init__(self, session_factory: Callable[[], AsyncSession],
+                 max_size: int = RATING_BUFFER_MAX_SIZE,
+                 batch_size: int = RATING_BUFFER_BATCH_SIZE,
+                 flush_interval: float = RATING_BUFFER_FLUSH_INTERVAL,
+                 retry_backoff: float = RATING_BUFFER_RETRY_BACKOFF,
+                 max_retries: int = RATING_BUFFER_MAX_RETRIES,
+                 leaderboards: Optional[MovieLeaderboards] = None,
+                 trending: Optional[TrendingTracker] = None):
+        """Initialize the buffer.
+
+        Args:
+            session_factory: Callable returning a new SQLAlchemy AsyncSession.
+            max_size: Maximum number of queued ratings.
+            batch_size: Number of ratings per flushed batch.
+            flush_interval: Seconds between time-based flushes.
+            retry_backoff: Seconds to wait after the first failed flush.
+            max_retries: Maximum number of backoff doublings and shutdown retries.
+            leaderboards: Leaderboards that flushed ratings are counted in (optional).
+            trending: Trending tracker that flushed ratings are counted in (optional).
+        """
+        self.session_factory = session_factory
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retry_backoff = retry_backoff
+        self.max_retries = max_retries
+        self.leaderboards = leaderboards
+        self.trending = trending
+        self._queue: deque[dict] = deque()
+        self._batch_ready = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        # Consecutive flushes that failed and put their batch back
+        self._failures = 0
+        self.flushed_count = 0
+        self.rejected_count = 0
+        self.failed_count = 0
+        self.retried_count = 0
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def submit(self, movie_id: int, score: float) -> None:
+        """Queue a validated rating for writing.
+
+        Args:
+            movie_id: ID of the rated movie.
+            score: Rating score.
+        Raises:
+            CapacityError: If the queue is full or the buffer is shutting down.
+        """
+        if self._stopping or len(self._queue) >= self.max_size:
+            self.rejected_count += 1
+            raise CapacityError("Rating queue is full, retry later.")
+        self._queue.append({"movie_id": movie_id, "score": score})
+        if len(self._queue) >= self.batch_size:
+            self._batch_ready.set()
+
+    def start(self) -> None:
+        """Start the background flusher task on the running event loop."""
+        if self._task is not None:
+            return
+        self._stopping = False
+        self._task = asyncio.create_task(self._run(), name="rating-write-buffer")
+        logger.info(
+            f"Rating write-behind buffer started (max_size={self.max_size}, "
+            f"batch_size={self.batch_size}, flush_interval={self.flush_interval})"
+        )
+
+    @property
+    def retry_delay(self) -> float:
+        """Seconds to wait before retrying after the current run of failures."""
+        if not self._failures:
+            return 0.0
+        return self.retry_backoff * 2 ** min(self._failures - 1, self.max_retries)
+
+    async def stop(self) -> None:
+        """Stop accepting ratings, then flush everything still queued.
+
+        Failed flushes are retried up to max_retries times; ratings still
+        queued after that are counted as failed and discarded.
+        """
+        self._stopping = True
+        self._batch_ready.set()
+        if self._task is not None:
+            try:
+                await self._task
+            except Exception as e:
+                # The queue is still drained below
+                logger.error(f"Rating write-behind flusher failed: {str(e)}")
+            self._task = None
+        retries = 0
+        while self._queue:
+            await self.flush()
+            if not self._failures:
+                continue
+            retries += 1
+            if retries > self.max_retries:
+                self.failed_count += len(self._queue)
+                logger.error(
+                    f"Discarding {len(self._queue)} buffered ratings after "
+                    f"{self.max_retries} failed retries on shutdown"
+                )
+                self._queue.clear()
+                break
+            await asyncio.sleep(self.retry_delay)
+        logger.info(
+            f"Rating write-behind buffer stopped (flushed={self.flushed_count}, "
+            f"rejected={self.rejected_count}, failed={self.failed_count}, "
+            f"retried={self.retried_count})"
+        )
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._batch_ready.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._batch_ready.clear()
+            while self._queue:
+                await self.flush()
+                if self._failures:
+                    await asyncio.sleep(self.retry_delay)
+                    break
+                if len(self._queue) < self.batch_size:
+                    break
+
+    async def flush(self) -> int:
+        """Write one batch of queued ratings.
+
+        Ratings whose movie was deleted after they were queued are dropped.
+        If the batch fails to write it is put back at the front of the queue
+        for a later retry. If it violates a constraint, its ratings are
+        written one at a time and only the ones that fail on their own are
+        dropped.
+
+        Returns:
+            Number of ratings written.
+        """
+        async with self._flush_lock:
+            batch = [
+                self._queue.popleft()
+                for _ in range(min(self.batch_size, len(self._queue)))
+            ]
+            if not batch:
+                return 0
+            try:
+                rows = await self._write(batch)
+            except IntegrityError as e:
+                logger.warning(
+                    f"Buffered batch of {len(batch)} ratings was rejected, "
+                    f"writing them one by one: {e.orig}"
+                )
+                rows = []
+                for position, rating in enumerate(batch):
+                    try:
+                        rows.extend(await self._write([rating]))
+                    except IntegrityError as e:
+                        self.failed_count += 1
+                        logger.error(
+                            f"Dropped buffered rating of movie {rating['movie_id']} "
+                            f"(score {rating['score']}): {e.orig}"
+                        )
+                    except Exception as e:
+                        self._requeue(batch[position:], e)
+                        break
+                else:
+                    self._failures = 0
+            except Exception as e:
+                self._requeue(batch, e)
+                return 0
+            else:
+                self._failures = 0
+            if rows:
+                movie_detail_cache.invalidate(*{rating["movie_id"] for rating in rows})
+                await list_query_cache.bump()
+                if self.leaderboards is not None:
+                    self.leaderboards.record_many(rows)
+                if self.trending is not None:
+                    self.trending.record_many(rows)
+            self.flushed_count += len(rows)
+            return len(rows)
+
+    async def _write(self, ratings: list[dict]) -> list[dict]:
+        """Insert the ratings of existing movies in one transaction and return them."""
+        async with self.session_factory() as session:
+            try:
+                existing = await MovieRepository(session).get_existing_ids(
+                    [rating["movie_id"] for rating in ratings]
+                )
+                rows = [rating for rating in ratings if rating["movie_id"] in existing]
+                await RatingRepository(session).add_many(rows)
+            except Exception:
+                await session.rollback()
+                raise
+        return rows
+
+    def _requeue(self, ratings: list[dict], error: Exception) -> None:
+        """Put unwritten ratings back at the front of the queue, in order."""
+        self._queue.extendleft(reversed(ratings))
+        self._failures += 1
+        self.retried_count += len(ratings)
+        logger.warning(
+            f"Failed to flush {len(ratings)} buffered ratings, retrying in "
+            f"{self.retry_delay:.1f}s: {str(error)}"
+        )
+
+    def stats(self) -> dict:
+        """Return queue depth and lifetime counters."""
+        return {
+            "queued": len(self._queue),
+            "max_size": self.max_size,
+            "flushed": self.flushed_count,
+            "rejected": self.rejected_count,
+            "failed": self.failed_count,
+            "retried": self.retried_count,
+        }
@@ -0,0 +1,22 @@
+from typing import Optional
+
+
+def parse_cast(cast: Optional[str]) -> list[str]:
+    """Split a comma-separated cast string into distinct names.
+
+    Args:
+        cast: Cast as stored in Movie.cast, e.g. "Actor A, Actor B".
+    Returns:
+        Names in billing order, stripped, without blanks or repeats
+        (compared case-insensitively).
+    """
+    if not cast:
+        return []
+    names = []
+    seen = set()
+    for name in cast.split(","):
+        name = " ".join(name.split())
+        if name and name.lower() not in seen:
+            seen.add(name.lower())
+            names.append(name)
+    return names
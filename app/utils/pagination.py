@@ -0,0 +1,52 @@
+"""
+Cursor helpers for keyset pagination.
+
+Cursors are opaque to clients: a URL-safe base64 encoding of a small
+JSON object holding the sort key of the last row returned.
+"""
+
+import base64
+import binascii
+import json
+from typing import Any, Optional
+
+
+def encode_cursor(payload: dict[str, Any]) -> str:
+    """
+    Encode a keyset position as an opaque cursor string.
+
+    Args:
+        payload: JSON-serializable mapping describing the last row seen
+
+    Returns:
+        URL-safe cursor string without padding
+    """
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[dict[str, Any]]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    An empty cursor means "start from the beginning" and decodes to None.
+
+    Args:
+        cursor: Cursor string received from the client
+
+    Returns:
+        The decoded payload, or None for an empty cursor
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if not cursor:
+        return None
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError):
+        raise ValueError("Invalid pagination cursor.")
+    if not isinstance(payload, dict):
+        raise ValueError("Invalid pagination cursor.")
+    return payload
@@ -0,0 +1,266 @@
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable
+
+from dotenv import load_dotenv
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import to_async_url
+from app.models import Director, Genre, Movie, Person
+from app.repositories import DirectorRepository, GenreRepository, MovieRepository, RatingRepository
+
+load_dotenv()
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+# Tables that grow with the catalog; a full scan of any of them is a
+# regression unless the check explicitly allows it. genres stays tiny.
+LARGE_TABLES = {"movies", "movie_ratings", "movie_rating_histograms", "movie_genre_association", "movie_cast", "people", "directors"}
+
+# A SCAN row names a full table scan unless it walks an index or the rowid
+SQLITE_SCAN = re.compile(
+    r"^SCAN (\w+)(?: AS \w+)?(?!\w| AS )(?!.*\bUSING (?:(?:COVERING )?INDEX|INTEGER PRIMARY KEY)\b)"
+)
+# Any SCAN row, index walks included; a walk that feeds a sort reads every row
+SQLITE_ANY_SCAN = re.compile(r"^SCAN (\w+)")
+SQLITE_TEMP_SORT = "USE TEMP B-TREE FOR "
+# A full-text table queried through MATCH (idxStr starting with M)
+SQLITE_FTS_MATCH = re.compile(r"^SCAN (\w+) VIRTUAL TABLE INDEX \d+:M")
+
+
+@dataclass
+class PlanCheck:
+    """A repository call whose statements must not fully scan large tables.
+
+    Attributes:
+        name: Label printed in the report.
+        run: Coroutine function executing the repository call.
+        allow: Tables that may be scanned on every database.
+        allow_sqlite: Tables that may additionally be scanned on SQLite,
+            which has no index able to serve substring filters.
+        ordered_walk: Tables read in rowid order up to LIMIT. SQLite reports
+            such a walk as a plain SCAN, which is accepted for these tables
+            as long as the plan has no temp B-tree.
+        require_sqlite: Full-text tables the statements must query with
+            MATCH on SQLite.
+    """
+    name: str
+    run: Callable[[AsyncSession], Awaitable[Any]]
+    allow: set[str] = field(default_factory=set)
+    allow_sqlite: set[str] = field(default_factory=set)
+    ordered_walk: set[str] = field(default_factory=set)
+    require_sqlite: set[str] = field(default_factory=set)
+
+
+def build_checks(sample: dict) -> list[PlanCheck]:
+    """List every read query of the repositories, using sample values."""
+    movies = MovieRepository
+    ratings = RatingRepository
+    movie_id = sample["movie_id"]
+    title = sample["title"]
+    fragment = title[1:4]
+    director_name = sample["director_name"]
+    genre = sample["genre"]
+    person = sample["person"]
+
+    async def stream(session):
+        async for _ in movies(session).stream_catalog(100):
+            break
+
+    async def stream_recent(session):
+        since = datetime.now(timezone.utc) - timedelta(days=1)
+        async for _ in ratings(session).stream_since(since, 100):
+            break
+
+    return [
+        PlanCheck("movie get_by_id", lambda s: movies(s).get_by_id(movie_id)),
+        PlanCheck("movie exists", lambda s: movies(s).exists(movie_id)),
+        PlanCheck("movie get_existing_ids", lambda s: movies(s).get_existing_ids([movie_id, movie_id + 1])),
+        PlanCheck("movie get_rating_totals", lambda s: movies(s).get_rating_totals(movie_id)),
+        PlanCheck("movie get_by_title", lambda s: movies(s).get_by_title(title)),
+        # An unfiltered page reads the primary key index in order up to LIMIT
+        PlanCheck("find_movies page", lambda s: movies(s).find_movies(limit=10), ordered_walk={"movies"}),
+        PlanCheck("find_movies keyset", lambda s: movies(s).find_movies(after_id=movie_id, limit=10)),
+        PlanCheck("find_movies title", lambda s: movies(s).find_movies(title=fragment, limit=10),
+                  allow_sqlite={"movies"}),
+        PlanCheck("find_movies director", lambda s: movies(s).find_movies(director=director_name, limit=10),
+                  allow_sqlite={"movies", "directors"}),
+        PlanCheck("find_movies release_year",
+                  lambda s: movies(s).find_movies(release_year=sample["release_year"], limit=10)),
+        PlanCheck("find_movies genre", lambda s: movies(s).find_movies(genre=genre, limit=10)),
+        PlanCheck("find_movies cast_member", lambda s: movies(s).find_movies(cast_member=person, limit=10)),
+        # Searches of three or more characters go through the FTS5 trigram table
+        PlanCheck("find_movies search", lambda s: movies(s).find_movies(search=fragment, limit=10),
+                  require_sqlite={"movie_search"}),
+        # Sorted pages walk the (sort column, id) index in order up to LIMIT
+        PlanCheck("find_movies sort average_rating",
+                  lambda s: movies(s).find_movies(sort="average_rating", descending=True, limit=10)),
+        PlanCheck("find_movies sort ratings_count keyset",
+                  lambda s: movies(s).find_movies(sort="ratings_count", after_id=movie_id, after_value=0, limit=10)),
+        PlanCheck("find_movies sort title", lambda s: movies(s).find_movies(sort="title", limit=10)),
+        PlanCheck("find_movies year range min_rating",
+                  lambda s: movies(s).find_movies(year_from=1990, year_to=1999, min_rating=7,
+                                                  sort="average_rating", descending=True, limit=10)),
+        PlanCheck("count_movies year range min_rating",
+                  lambda s: movies(s).count_movies(year_from=1990, year_to=1999, min_rating=7)),
+        PlanCheck("count_movies genre", lambda s: movies(s).count_movies(genre=genre)),
+        PlanCheck("count_movies release_year",
+                  lambda s: movies(s).count_movies(release_year=sample["release_year"])),
+        PlanCheck("count_movies cast_member", lambda s: movies(s).count_movies(cast_member=person)),
+        PlanCheck("movie count", lambda s: movies(s).count(), allow={"movies"}),
+        # The export reads every movie by design; the per-movie genre
+        # subquery must still use an index
+        PlanCheck("movie stream_catalog", stream, allow={"movies"}),
+        PlanCheck("movie get_summaries", lambda s: movies(s).get_summaries([movie_id, movie_id + 1])),
+        PlanCheck("rating stream_since", stream_recent),
+        PlanCheck("rating get_histogram", lambda s: ratings(s).get_histogram(movie_id)),
+        PlanCheck("rating get_by_movie_id", lambda s: ratings(s).get_by_movie_id(movie_id)),
+        PlanCheck("genre get_by_name", lambda s: GenreRepository(s).get_by_name(genre.name)),
+        PlanCheck("genre get_by_names", lambda s: GenreRepository(s).get_by_names([genre.name])),
+        PlanCheck("genre get_by_ids", lambda s: GenreRepository(s).get_by_ids([genre.id])),
+        PlanCheck("director get_by_name", lambda s: DirectorRepository(s).get_by_name(director_name)),
+    ]
+
+
+async def explain(session: AsyncSession, statement: str, parameters: Any,
+                  ordered_walk: set[str] = frozenset()) -> tuple[list[str], set[str]]:
+    """Return the large tables a statement scans in full and the FTS tables it matches.
+
+    Args:
+        session: Session the statement is explained in.
+        statement: SQL statement as sent to the driver.
+        parameters: Its bound parameters.
+        ordered_walk: Tables whose plain SQLite SCAN is a walk in rowid order
+            when the plan has no temp B-tree.
+    """
+    connection = await session.connection()
+    if connection.dialect.name == "postgresql":
+        result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+        plan = result.scalar_one()
+        plan = json.loads(plan) if isinstance(plan, str) else plan
+        scanned = []
+        nodes = [plan[0]["Plan"]]
+        while nodes:
+            node = nodes.pop()
+            if node["Node Type"] == "Seq Scan" and node.get("Relation Name") in LARGE_TABLES:
+                scanned.append(node["Relation Name"])
+            nodes.extend(node.get("Plans", []))
+        return scanned, set()
+    result = await connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+    details = [row[-1] for row in result]
+    sorted_after = any(detail.startswith(SQLITE_TEMP_SORT) for detail in details)
+    scanned = []
+    matched = set()
+    for detail in details:
+        fts = SQLITE_FTS_MATCH.match(detail)
+        if fts:
+            matched.add(fts.group(1))
+        match = (SQLITE_ANY_SCAN if sorted_after else SQLITE_SCAN).match(detail)
+        if not match or match.group(1) not in LARGE_TABLES:
+            continue
+        # A rowid walk is reported as a plain SCAN; without a sort step it
+        # stops at LIMIT instead of reading the whole table
+        if detail == f"SCAN {match.group(1)}" and match.group(1) in ordered_walk and not sorted_after:
+            continue
+        scanned.append(match.group(1))
+    return scanned, matched
+
+
+async def load_sample(session: AsyncSession) -> dict:
+    """Pick existing values to query for, so that plans reflect real data."""
+    movie = (await session.scalars(
+        select(Movie).where(Movie.release_year.is_not(None)).order_by(Movie.id).limit(1)
+    )).first()
+    if movie is None:
+        raise RuntimeError("The database has no movies; seed it before running the check.")
+    director = await session.get(Director, movie.director_id)
+    genre = (await session.scalars(select(Genre).order_by(Genre.id).limit(1))).first()
+    person = (await session.scalars(select(Person.name).order_by(Person.id).limit(1))).first()
+    return {
+        "movie_id": movie.id,
+        "title": movie.title,
+        "release_year": movie.release_year,
+        "director_name": director.name,
+        "genre": genre or Genre(id=0, name=""),
+        "person": person or "",
+    }
+
+
+async def run_checks(verbose: bool = False) -> bool:
+    """EXPLAIN every repository read query and report full scans."""
+    engine = create_async_engine(to_async_url(DATABASE_URL), poolclass=NullPool)
+    captured: list[tuple[str, Any]] = []
+    capturing = False
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if capturing:
+            captured.append((statement, parameters))
+
+    failures = 0
+    try:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            dialect = (await session.connection()).dialect.name
+            if dialect == "postgresql":
+                # Small seeded tables are cheaper to scan, which would hide a
+                # missing index; make the planner use one whenever it can.
+                await (await session.connection()).exec_driver_sql("SET enable_seqscan = off")
+            sample = await load_sample(session)
+            for check in build_checks(sample):
+                captured.clear()
+                capturing = True
+                try:
+                    await check.run(session)
+                finally:
+                    capturing = False
+                allowed = check.allow | (check.allow_sqlite if dialect == "sqlite" else set())
+                scanned = set()
+                matched = set()
+                for statement, parameters in captured:
+                    tables, fts_tables = await explain(session, statement, parameters, check.ordered_walk)
+                    scanned.update(tables)
+                    matched.update(fts_tables)
+                regressions = sorted(scanned - allowed)
+                unmatched = sorted(check.require_sqlite - matched) if dialect == "sqlite" else []
+                if regressions or unmatched:
+                    failures += 1
+                    problems = []
+                    if regressions:
+                        problems.append(f"full scan of {', '.join(regressions)}")
+                    if unmatched:
+                        problems.append(f"no full-text match on {', '.join(unmatched)}")
+                    print(f"FAIL {check.name}: {'; '.join(problems)}")
+                    if verbose:
+                        for statement, _ in captured:
+                            print(f"     {' '.join(statement.split())}")
+                else:
+                    print(f"ok   {check.name}")
+    except Exception as e:
+        print(f"Database connection or query failed during the plan check: {e}")
+        return False
+    finally:
+        await engine.dispose()
+
+    if failures:
+        print(f"{failures} query plan regression(s) found.")
+        return False
+    print("All query plans use indexes.")
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="EXPLAIN every repository read query and fail on full scans of large tables."
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="print the SQL of failing checks")
+    args = parser.parse_args()
+    sys.exit(0 if asyncio.run(run_checks(verbose=args.verbose)) else 1)
@@ -0,0 +1,293 @@
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import time
+from typing import Any, Iterable, Iterator, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import Connection, create_engine, delete, func, insert, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models import Director, Genre, Movie, MovieCastAssociation, MovieGenreAssociation, Person
+from app.utils.cast import parse_cast
+
+load_dotenv()
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+engine = create_engine(DATABASE_URL)
+
+DEFAULT_BATCH_SIZE = 5000
+# Genres may be separated by "|" or "," in CSV files
+GENRE_SEPARATOR = re.compile(r"[|,]")
+MAX_REPORTED_ERRORS = 20
+
+
+def read_records(path: str, fmt: str) -> Iterator[tuple[int, Any]]:
+    """Stream raw records from a CSV or JSONL file, one at a time.
+
+    JSONL lines are yielded undecoded, so that a malformed line is
+    reported and skipped by normalize_record like any other invalid row.
+
+    Args:
+        path: File to read, or "-" for standard input.
+        fmt: "csv" or "jsonl".
+    Yields:
+        Tuples of (line number, record dict or raw JSONL line).
+    """
+    handle = sys.stdin if path == "-" else open(path, newline="", encoding="utf-8")
+    try:
+        if fmt == "csv":
+            reader = csv.DictReader(handle)
+            for record in reader:
+                yield reader.line_num, record
+        else:
+            for line_number, line in enumerate(handle, start=1):
+                if line.strip():
+                    yield line_number, line
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+
+def normalize_record(record: Any) -> dict:
+    """Validate a raw record and convert it to the importer's row shape.
+
+    Accepted fields are title, director, release_year, genres (list or
+    separated string) and cast (list or comma-separated string).
+
+    Args:
+        record: CSV row dict, or a raw JSONL line holding a JSON object.
+    Raises:
+        ValueError: If the line is not a JSON object, the record has no
+            title or director, or an invalid year.
+    """
+    if isinstance(record, str):
+        try:
+            record = json.loads(record)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"invalid JSON ({e})")
+    if not isinstance(record, dict):
+        raise ValueError(f"expected a JSON object, got {type(record).__name__}")
+    title = (record.get("title") or "").strip()
+    director = (record.get("director") or "").strip()
+    if not title:
+        raise ValueError("missing title")
+    if not director:
+        raise ValueError("missing director")
+    release_year = record.get("release_year")
+    release_year = int(release_year) if release_year not in (None, "") else None
+    if release_year is not None and not 1888 <= release_year <= 2100:
+        raise ValueError(f"release_year {release_year} out of range")
+    genres = record.get("genres") or []
+    if isinstance(genres, str):
+        genres = GENRE_SEPARATOR.split(genres)
+    genres = list(dict.fromkeys(name.strip() for name in genres if name and name.strip()))
+    cast = record.get("cast")
+    if isinstance(cast, list):
+        cast = ", ".join(str(name) for name in cast)
+    cast = cast or None
+    return {
+        "title": title,
+        "director": director,
+        "release_year": release_year,
+        "genres": genres,
+        "cast": cast,
+    }
+
+
+def batched(records: Iterable[Any], size: int) -> Iterator[list]:
+    """Group an iterable into lists of at most size items."""
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class CatalogImporter:
+    """Upserts movies, directors, genres and cast in batches.
+
+    Directors, genres and people are resolved through in-memory maps
+    loaded once at start, so only unseen names cost a query. Movies are
+    upserted by title with a multi-row INSERT ... ON CONFLICT DO UPDATE
+    and their genre and cast associations are replaced. Each batch is
+    committed on its own.
+
+    Attributes:
+        connection: Open connection the import runs on.
+        directors: Director id by name.
+        genres: Genre id by name.
+        people: Person id by lowercased name.
+    """
+
+    def __init__(self, connection: Connection):
+        self.connection = connection
+        self.dialect = connection.dialect.name
+        if self.dialect not in ("postgresql", "sqlite"):
+            raise ValueError(f"Unsupported database dialect '{self.dialect}'.")
+        self.directors = {
+            name: director_id
+            for director_id, name in connection.execute(select(Director.id, Director.name))
+        }
+        self.genres = {name: genre_id for genre_id, name in connection.execute(select(Genre.id, Genre.name))}
+        self.people = {
+            name.lower(): person_id
+            for person_id, name in connection.execute(select(Person.id, Person.name))
+        }
+
+    def _insert(self, model):
+        """Return a dialect-specific INSERT supporting ON CONFLICT clauses."""
+        if self.dialect == "postgresql":
+            return postgresql_insert(model)
+        return sqlite_insert(model)
+
+    def _resolve_directors(self, names: set[str]) -> None:
+        # directors.name is not unique, so new directors are inserted as-is;
+        # the map keeps one id per name for the rest of the import
+        missing = sorted(names - self.directors.keys())
+        if missing:
+            result = self.connection.execute(
+                insert(Director).returning(Director.id, Director.name),
+                [{"name": name} for name in missing],
+            )
+            self.directors.update((name, director_id) for director_id, name in result)
+
+    def _resolve_genres(self, names: set[str]) -> None:
+        missing = sorted(names - self.genres.keys())
+        if missing:
+            self.connection.execute(
+                self._insert(Genre).on_conflict_do_nothing(),
+                [{"name": name} for name in missing],
+            )
+            result = self.connection.execute(
+                select(Genre.id, Genre.name).where(Genre.name.in_(missing))
+            )
+            self.genres.update((name, genre_id) for genre_id, name in result)
+
+    def _resolve_people(self, names: set[str]) -> None:
+        missing = {name.lower(): name for name in names if name.lower() not in self.people}
+        if missing:
+            self.connection.execute(
+                self._insert(Person).on_conflict_do_nothing(),
+                [{"name": name} for name in missing.values()],
+            )
+            result = self.connection.execute(
+                select(Person.id, Person.name).where(func.lower(Person.name).in_(list(missing)))
+            )
+            self.people.update((name.lower(), person_id) for person_id, name in result)
+
+    def import_batch(self, rows: list[dict]) -> int:
+        """Upsert one batch of normalized rows and commit it.
+
+        Args:
+            rows: Rows returned by normalize_record.
+        Returns:
+            Number of movies written.
+        """
+        # A title may only be upserted once per statement; the last row wins
+        rows = list({row["title"]: row for row in rows}.values())
+        credits = {row["title"]: parse_cast(row["cast"]) for row in rows}
+        self._resolve_directors({row["director"] for row in rows})
+        self._resolve_genres({name for row in rows for name in row["genres"]})
+        self._resolve_people({name for names in credits.values() for name in names})
+
+        statement = self._insert(Movie)
+        statement = statement.on_conflict_do_update(
+            index_elements=[Movie.title],
+            set_={
+                "release_year": statement.excluded.release_year,
+                "director_id": statement.excluded.director_id,
+                "cast": statement.excluded.cast,
+            },
+        ).returning(Movie.id, Movie.title)
+        result = self.connection.execute(statement, [
+            {
+                "title": row["title"],
+                "release_year": row["release_year"],
+                "director_id": self.directors[row["director"]],
+                "cast": row["cast"],
+            }
+            for row in rows
+        ])
+        movie_ids = {title: movie_id for movie_id, title in result}
+
+        # Replace the associations of every upserted movie
+        ids = list(movie_ids.values())
+        self.connection.execute(delete(MovieGenreAssociation).where(MovieGenreAssociation.movie_id.in_(ids)))
+        self.connection.execute(delete(MovieCastAssociation).where(MovieCastAssociation.movie_id.in_(ids)))
+        genre_rows = [
+            {"movie_id": movie_ids[row["title"]], "genre_id": self.genres[name]}
+            for row in rows
+            for name in row["genres"]
+        ]
+        if genre_rows:
+            self.connection.execute(insert(MovieGenreAssociation), genre_rows)
+        cast_rows = [
+            {"movie_id": movie_ids[title], "person_id": self.people[name.lower()], "position": position}
+            for title, names in credits.items()
+            for position, name in enumerate(names)
+        ]
+        if cast_rows:
+            self.connection.execute(insert(MovieCastAssociation), cast_rows)
+        self.connection.commit()
+        return len(rows)
+
+
+def import_catalog(path: str, fmt: str, batch_size: int = DEFAULT_BATCH_SIZE) -> bool:
+    """Import a movie catalog file and report throughput."""
+    start = time.perf_counter()
+    written = 0
+    errors = 0
+
+    def valid_rows() -> Iterator[dict]:
+        nonlocal errors
+        for line_number, record in read_records(path, fmt):
+            try:
+                yield normalize_record(record)
+            except (ValueError, TypeError, AttributeError) as e:
+                errors += 1
+                if errors <= MAX_REPORTED_ERRORS:
+                    print(f"   - line {line_number}: skipped ({e})")
+
+    try:
+        with engine.connect() as connection:
+            importer = CatalogImporter(connection)
+            for batch in batched(valid_rows(), batch_size):
+                written += importer.import_batch(batch)
+                elapsed = time.perf_counter() - start
+                print(f"Imported {written} movies ({written / elapsed:,.0f} rows/sec)")
+    except Exception as e:
+        print(f"Import failed after {written} movies: {e}")
+        return False
+
+    elapsed = time.perf_counter() - start
+    print("Import Successful!")
+    print(f"   - Movies written: {written}")
+    print(f"   - Rows skipped: {errors}")
+    print(f"   - Elapsed: {elapsed:.1f}s ({written / elapsed if elapsed else 0:,.0f} rows/sec)")
+    print("Running API workers serve cached lists until they expire and add the movies to search")
+    print("and leaderboards at their next periodic rebuild.")
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Bulk import movies, directors, genres and cast from a CSV or JSONL file."
+    )
+    parser.add_argument("path", help="CSV or JSONL file, or - for standard input")
+    parser.add_argument("--format", choices=("csv", "jsonl"),
+                        help="input format (default: from the file extension)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"movies per transaction (default: {DEFAULT_BATCH_SIZE})")
+    args = parser.parse_args()
+    fmt = args.format or ("csv" if args.path.lower().endswith(".csv") else "jsonl")
+    sys.exit(0 if import_catalog(args.path, fmt, args.batch_size) else 1)
@@ -0,0 +1,168 @@
+import argparse
+import os
+import sys
+
+from dotenv import load_dotenv
+from sqlalchemy import case, create_engine, delete, func, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models import HISTOGRAM_BUCKETS, Movie, Rating, RatingHistogram
+
+load_dotenv()
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+engine = create_engine(DATABASE_URL)
+
+# Sums are floats, so allow for rounding differences when comparing them
+SUM_TOLERANCE = 1e-6
+
+
+def find_drift(session: Session) -> list[tuple[int, int, float, int, float]]:
+    """Compare the running aggregates on movies with the movie_ratings table.
+
+    Returns:
+        Rows of (movie_id, stored_count, stored_sum, actual_count, actual_sum)
+        for every movie whose stored aggregates disagree with its ratings.
+    """
+    stats = (
+        select(
+            Rating.movie_id.label("movie_id"),
+            func.count(Rating.id).label("ratings_count"),
+            func.sum(Rating.score).label("ratings_sum"),
+        )
+        .group_by(Rating.movie_id)
+        .subquery()
+    )
+    actual_count = func.coalesce(stats.c.ratings_count, 0)
+    actual_sum = func.coalesce(stats.c.ratings_sum, 0.0)
+    actual_average = case((actual_count > 0, actual_sum / actual_count), else_=0.0)
+    rows = session.execute(
+        select(Movie.id, Movie.ratings_count, Movie.ratings_sum, actual_count, actual_sum)
+        .outerjoin(stats, stats.c.movie_id == Movie.id)
+        .where(
+            (Movie.ratings_count != actual_count)
+            | (func.abs(Movie.ratings_sum - actual_sum) > SUM_TOLERANCE)
+            | (func.abs(Movie.rating_average - actual_average) > SUM_TOLERANCE)
+        )
+        .order_by(Movie.id)
+    ).all()
+    return [tuple(row) for row in rows]
+
+
+def repair(session: Session, drift: list[tuple[int, int, float, int, float]]) -> None:
+    """Overwrite the stored aggregates of drifted movies with the actual values."""
+    for movie_id, _, _, actual_count, actual_sum in drift:
+        session.execute(
+            update(Movie)
+            .where(Movie.id == movie_id)
+            .values(
+                ratings_count=actual_count,
+                ratings_sum=actual_sum,
+                rating_average=actual_sum / actual_count if actual_count else 0.0,
+            )
+        )
+    session.commit()
+
+
+def _bucket_count(bucket: int):
+    """Count the ratings of a group that fall into a histogram bucket, as bucket_for does."""
+    lowest, highest = HISTOGRAM_BUCKETS[0], HISTOGRAM_BUCKETS[-1]
+    if bucket == lowest:
+        condition = Rating.score < lowest + 1
+    elif bucket == highest:
+        condition = Rating.score >= highest
+    else:
+        condition = (Rating.score >= bucket) & (Rating.score < bucket + 1)
+    return func.sum(case((condition, 1), else_=0))
+
+
+def find_histogram_drift(session: Session) -> list[tuple[int, list[int], list[int]]]:
+    """Compare movie_rating_histograms with the scores in movie_ratings.
+
+    Returns:
+        Rows of (movie_id, stored bucket counts, actual bucket counts) for
+        every movie whose histogram disagrees with its ratings. A missing
+        histogram row counts as all zeros.
+    """
+    stats = (
+        select(
+            Rating.movie_id.label("movie_id"),
+            *(_bucket_count(bucket).label(f"bucket_{bucket}") for bucket in HISTOGRAM_BUCKETS),
+        )
+        .group_by(Rating.movie_id)
+        .subquery()
+    )
+    stored = [func.coalesce(getattr(RatingHistogram, f"bucket_{bucket}"), 0) for bucket in HISTOGRAM_BUCKETS]
+    actual = [func.coalesce(stats.c[f"bucket_{bucket}"], 0) for bucket in HISTOGRAM_BUCKETS]
+    rows = session.execute(
+        select(Movie.id, *stored, *actual)
+        .outerjoin(stats, stats.c.movie_id == Movie.id)
+        .outerjoin(RatingHistogram, RatingHistogram.movie_id == Movie.id)
+        .where(or_(*(stored_count != actual_count for stored_count, actual_count in zip(stored, actual))))
+        .order_by(Movie.id)
+    ).all()
+    size = len(HISTOGRAM_BUCKETS)
+    return [(row[0], list(row[1:size + 1]), list(row[size + 1:])) for row in rows]
+
+
+def repair_histograms(session: Session, drift: list[tuple[int, list[int], list[int]]]) -> None:
+    """Rewrite the histogram rows of drifted movies from their actual bucket counts."""
+    movie_ids = [movie_id for movie_id, _, _ in drift]
+    session.execute(delete(RatingHistogram).where(RatingHistogram.movie_id.in_(movie_ids)))
+    rows = [
+        {"movie_id": movie_id, **{f"bucket_{bucket}": count for bucket, count in zip(HISTOGRAM_BUCKETS, actual)}}
+        for movie_id, _, actual in drift
+        if any(actual)
+    ]
+    if rows:
+        session.execute(insert(RatingHistogram), rows)
+    session.commit()
+
+
+def reconcile_rating_stats(fix: bool = False) -> bool:
+    """Detect, and optionally repair, drift in the movie rating aggregates and histograms."""
+    try:
+        with Session(engine) as session:
+            drift = find_drift(session)
+            histogram_drift = find_histogram_drift(session)
+            if not drift and not histogram_drift:
+                print("Rating aggregates and histograms are consistent.")
+                return True
+            if drift:
+                print(f"Found {len(drift)} movie(s) with drifted rating aggregates:")
+                for movie_id, stored_count, stored_sum, actual_count, actual_sum in drift:
+                    print(
+                        f"   - movie {movie_id}: stored count={stored_count} sum={stored_sum}, "
+                        f"actual count={actual_count} sum={actual_sum}"
+                    )
+            if histogram_drift:
+                print(f"Found {len(histogram_drift)} movie(s) with drifted rating histograms:")
+                for movie_id, stored_counts, actual_counts in histogram_drift:
+                    print(f"   - movie {movie_id}: stored buckets={stored_counts}, actual buckets={actual_counts}")
+            if fix:
+                if drift:
+                    repair(session, drift)
+                if histogram_drift:
+                    repair_histograms(session, histogram_drift)
+                print(f"Repaired {len(drift)} aggregate(s) and {len(histogram_drift)} histogram(s).")
+                return True
+            print("Run with --fix to repair them.")
+            return False
+
+    except Exception as e:
+        print(f"Database connection or query failed during reconciliation: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=(
+            "Check movies.ratings_count/ratings_sum/rating_average and "
+            "movie_rating_histograms against movie_ratings."
+        )
+    )
+    parser.add_argument("--fix", action="store_true", help="repair drifted movies and histograms")
+    args = parser.parse_args()
+    sys.exit(0 if reconcile_rating_stats(fix=args.fix) else 1)
@@ -0,0 +1,102 @@
+import os
+import sys
+import tempfile
+
+# The app reads its settings at import time, so point it at a throwaway
+# SQLite database before anything from app is imported.
+_DB_DIR = tempfile.mkdtemp(prefix="movie-rating-tests-")
+DATABASE_URL = f"sqlite:///{os.path.join(_DB_DIR, 'test.db')}"
+os.environ["DATABASE_URL"] = DATABASE_URL
+os.environ["DATABASE_REPLICA_URLS"] = ""
+os.environ["CACHE_BACKEND"] = "memory"
+os.environ["RATING_WRITE_BEHIND"] = "false"
+os.environ["MOVIE_SEARCH_INDEX"] = "false"
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+from app.db.session import engine
+from app.main import app
+from app.models import Director, Genre, Movie, MovieCastAssociation, Person, Rating
+
+MOVIE_COUNT = 60
+
+
+def seed_database(url: str, movie_count: int = MOVIE_COUNT) -> None:
+    """Create the schema and fill it with genres, directors, movies, cast and ratings."""
+    seed_engine = create_engine(url)
+    Base.metadata.create_all(seed_engine)
+    with Session(seed_engine) as session:
+        genres = [Genre(name=name) for name in ("Drama", "Action", "Comedy")]
+        directors = [Director(name=f"Director {i}") for i in range(5)]
+        people = [Person(name=f"Actor {i}") for i in range(8)]
+        session.add_all(genres + directors + people)
+        session.flush()
+        for i in range(movie_count):
+            movie = Movie(
+                title=f"Movie {i:03d}",
+                release_year=1980 + i % 30 if i % 7 else None,
+                cast=f"Actor {i % 8}, Actor {(i + 1) % 8}",
+                director_id=directors[i % 5].id,
+                ratings_count=0,
+                ratings_sum=0.0,
+            )
+            movie.genres = [genres[i % 3]]
+            session.add(movie)
+            session.flush()
+            for position in range(2):
+                session.add(MovieCastAssociation(
+                    movie_id=movie.id, person_id=people[(i + position) % 8].id, position=position,
+                ))
+            for k in range(i % 4):
+                score = float(1 + (i + k) % 10)
+                session.add(Rating(movie_id=movie.id, score=score))
+                movie.ratings_count += 1
+                movie.ratings_sum += score
+            movie.rating_average = movie.ratings_sum / movie.ratings_count if movie.ratings_count else 0.0
+        session.commit()
+    seed_engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def seeded_database() -> str:
+    """URL of the shared test database, seeded once per session."""
+    seed_database(DATABASE_URL)
+    return DATABASE_URL
+
+
+@pytest.fixture(scope="session")
+def client(seeded_database):
+    """Test client with the application lifespan running."""
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+class StatementCounter:
+    """Records the SQL statements sent through the application engine."""
+
+    def __init__(self):
+        self.statements: list[str] = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __len__(self) -> int:
+        return len(self.statements)
+
+    def reset(self) -> None:
+        self.statements.clear()
+
+
+@pytest.fixture
+def statements():
+    """Count the statements executed while a test runs."""
+    counter = StatementCounter()
+    event.listen(engine.sync_engine, "before_cursor_execute", counter)
+    yield counter
+    event.remove(engine.sync_engine, "before_cursor_execute", counter)
@@ -0,0 +1,50 @@
+"""Invalidation of the movie detail cache behind GET /movies/{id}.
+
+Every write to a movie must be visible on the next GET, even though the
+detail response is cached.
+"""
+from app.cache import TTLLRUCache, movie_detail_cache
+
+MOVIES_URL = "/api/v1/movies/"
+
+
+def get_movie(client, movie_id: int):
+    return client.get(f"{MOVIES_URL}{movie_id}")
+
+
+def test_writes_are_visible_through_the_detail_cache(client):
+    created = client.post(MOVIES_URL, json={
+        "title": "Detail Cache Original",
+        "director_id": 2,
+        "release_year": 1999,
+        "genres": [1],
+    })
+    assert created.status_code == 201, created.text
+    movie_id = created.json()["data"]["id"]
+
+    first = get_movie(client, movie_id).json()["data"]
+    assert first["title"] == "Detail Cache Original"
+    assert movie_detail_cache.get(movie_id) is not None
+
+    updated = client.put(f"{MOVIES_URL}{movie_id}", json={"title": "Detail Cache Sequel", "genres": [3]})
+    assert updated.status_code == 200, updated.text
+    data = get_movie(client, movie_id).json()["data"]
+    assert (data["title"], data["genres"]) == ("Detail Cache Sequel", ["Comedy"])
+
+    rated = client.post(f"{MOVIES_URL}{movie_id}/ratings", json={"score": 9})
+    assert rated.status_code == 201, rated.text
+    data = get_movie(client, movie_id).json()["data"]
+    assert (data["ratings_count"], data["average_rating"]) == (1, 9.0)
+
+    assert client.delete(f"{MOVIES_URL}{movie_id}").status_code in (200, 204)
+    assert get_movie(client, movie_id).status_code == 404
+
+
+def test_value_loaded_before_an_invalidation_is_not_stored():
+    cache = TTLLRUCache(max_size=4, ttl=60)
+    epoch = cache.epoch
+    cache.invalidate(1)
+    cache.set(1, "stale", epoch=epoch)
+    assert cache.get(1) is None
+    cache.set(1, "fresh", epoch=cache.epoch)
+    assert cache.get(1) == "fresh"
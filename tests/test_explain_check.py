@@ -0,0 +1,70 @@
+"""Query plan check of scripts/explain_check.py against the seeded database.
+
+Every repository read query must use an index on the seeded data, and
+dropping an index a query depends on, or losing the full-text search
+path, must make the check fail.
+"""
+import asyncio
+import importlib.util
+import shutil
+import sqlite3
+from pathlib import Path
+
+import pytest
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.db.session import to_async_url
+from app.repositories import MovieRepository
+
+SCRIPT = Path(__file__).resolve().parent.parent / "scripts" / "explain_check.py"
+
+
+@pytest.fixture(scope="module")
+def explain_check():
+    spec = importlib.util.spec_from_file_location("explain_check", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_query_plans_use_indexes(explain_check, seeded_database, monkeypatch):
+    monkeypatch.setattr(explain_check, "DATABASE_URL", seeded_database)
+    assert asyncio.run(explain_check.run_checks()) is True
+
+
+@pytest.mark.parametrize("index", ["ix_movies_rating_average_id", "ix_movies_ratings_count_id", "ix_movies_title"])
+def test_missing_index_fails(explain_check, seeded_database, monkeypatch, tmp_path, index):
+    source = make_url(seeded_database).database
+    path = tmp_path / "plans.db"
+    shutil.copyfile(source, path)
+    with sqlite3.connect(path) as connection:
+        connection.execute(f"DROP INDEX {index}")
+    monkeypatch.setattr(explain_check, "DATABASE_URL", f"sqlite:///{path}")
+    assert asyncio.run(explain_check.run_checks()) is False
+
+
+def test_search_check_requires_the_full_text_table(explain_check, seeded_database, monkeypatch):
+    monkeypatch.setattr(explain_check, "DATABASE_URL", seeded_database)
+    monkeypatch.setattr(MovieRepository, "_uses_fts", lambda self, search: False)
+    assert asyncio.run(explain_check.run_checks()) is False
+
+
+@pytest.mark.parametrize("statement, ordered_walk, scanned", [
+    # Only a check that declares the rowid walk may read movies in id order
+    ("SELECT * FROM movies ORDER BY id LIMIT 5", set(), ["movies"]),
+    ("SELECT * FROM movies ORDER BY id LIMIT 5", {"movies"}, []),
+    # A sort step means every row was read, declared walk or not
+    ('SELECT * FROM movies ORDER BY "cast" LIMIT 5', {"movies"}, ["movies"]),
+])
+def test_rowid_walk_is_decided_from_the_plan(explain_check, seeded_database, statement, ordered_walk, scanned):
+    async def scenario():
+        engine = create_async_engine(to_async_url(seeded_database), poolclass=NullPool)
+        try:
+            async with AsyncSession(engine) as session:
+                return await explain_check.explain(session, statement, (), ordered_walk)
+        finally:
+            await engine.dispose()
+
+    assert asyncio.run(scenario()) == (scanned, set())
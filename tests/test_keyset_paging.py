@@ -0,0 +1,90 @@
+"""Keyset cursor pagination of GET /movies.
+
+Crawling next_cursor must return every movie exactly once, in the order
+of page mode. The seeded movies share release years and ratings, and
+some have no release year, so every sorted crawl has to seek past runs
+of equal values and NULLs.
+"""
+import pytest
+
+from app.repositories.movie_repository import MOVIE_SORT_COLUMNS
+from app.utils.pagination import encode_cursor
+
+MOVIES_URL = "/api/v1/movies/"
+# Small enough to split runs of equal sort values across pages
+CRAWL_PAGE_SIZE = 7
+
+
+def crawl(client, **params) -> list[int]:
+    """Follow next_cursor from the first page to the last and return the ids."""
+    ids = []
+    cursor = ""
+    while cursor is not None:
+        response = client.get(MOVIES_URL, params={**params, "cursor": cursor, "page_size": CRAWL_PAGE_SIZE})
+        assert response.status_code == 200, response.text
+        data = response.json()["data"]
+        assert len(data["items"]) <= CRAWL_PAGE_SIZE
+        ids.extend(item["id"] for item in data["items"])
+        cursor = data["next_cursor"]
+    return ids
+
+
+def page_mode_ids(client, **params) -> list[int]:
+    response = client.get(MOVIES_URL, params={**params, "page_size": 10000})
+    assert response.status_code == 200, response.text
+    return [item["id"] for item in response.json()["data"]["items"]]
+
+
+def test_default_crawl_matches_page_mode(client):
+    ids = crawl(client)
+    assert ids == page_mode_ids(client)
+    assert ids == sorted(ids)
+
+
+def test_malformed_cursor_is_rejected(client):
+    response = client.get(MOVIES_URL, params={"cursor": "not a cursor"})
+    assert response.status_code == 422
+
+
+def test_cursor_without_integer_id_is_rejected(client):
+    response = client.get(MOVIES_URL, params={"cursor": encode_cursor({"id": "7"})})
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize("order", ["asc", "desc"])
+@pytest.mark.parametrize("sort", list(MOVIE_SORT_COLUMNS))
+def test_sorted_crawl_matches_page_mode(client, sort, order):
+    ids = crawl(client, sort=sort, order=order)
+    assert ids == page_mode_ids(client, sort=sort, order=order)
+    assert len(ids) == len(set(ids))
+
+
+def test_crawl_covers_null_and_tied_values(client):
+    response = client.get(MOVIES_URL, params={"sort": "release_year", "page_size": 10000})
+    years = [item["release_year"] for item in response.json()["data"]["items"]]
+    assert None in years
+    assert len(set(years)) < len(years) - years.count(None)
+
+
+def test_search_crawl_with_sort_matches_page_mode(client):
+    params = {"q": "Movie 01", "sort": "release_year", "order": "desc"}
+    ids = crawl(client, **params)
+    assert ids
+    assert ids == page_mode_ids(client, **params)
+
+
+def test_search_cursor_without_sort_is_rejected(client):
+    response = client.get(MOVIES_URL, params={"q": "Movie", "cursor": ""})
+    assert response.status_code == 422
+
+
+def test_unknown_sort_is_rejected(client):
+    assert client.get(MOVIES_URL, params={"sort": "budget"}).status_code == 422
+    assert client.get(MOVIES_URL, params={"sort": "budget", "cursor": ""}).status_code == 422
+
+
+def test_cursor_of_another_sort_is_rejected(client):
+    response = client.get(MOVIES_URL, params={"sort": "title", "cursor": "", "page_size": 2})
+    cursor = response.json()["data"]["next_cursor"]
+    response = client.get(MOVIES_URL, params={"sort": "title", "order": "desc", "cursor": cursor})
+    assert response.status_code == 422
@@ -0,0 +1,24 @@
+"""List query cache keys of GET /movies.
+
+Spellings of a query that select the same movies must share one cache
+entry; the second request of each pair is answered from the cache.
+"""
+import pytest
+
+from app.cache import list_query_cache
+
+
+@pytest.mark.parametrize("first, second", [
+    ({"genre": "Drama", "page_size": 3}, {"genre": "Drama", "page_size": 3, "order": "ASC"}),
+    ({"q": "Movie", "sort": "title", "page_size": 4}, {"q": "  Movie ", "sort": "TITLE", "page_size": 4}),
+    ({"sort": "release_year", "order": "desc", "page_size": 6},
+     {"sort": "Release_Year", "order": "Desc", "page_size": 6}),
+])
+def test_equivalent_queries_share_a_cache_entry(client, first, second):
+    response = client.get("/api/v1/movies/", params=first)
+    assert response.status_code == 200
+    hits = list_query_cache.hits
+    again = client.get("/api/v1/movies/", params=second)
+    assert again.status_code == 200
+    assert list_query_cache.hits == hits + 1
+    assert again.json()["data"] == response.json()["data"]
@@ -0,0 +1,24 @@
+"""Periodic rebuilds of the in-process structures started by the lifespan."""
+import asyncio
+
+from app.main import _refresh_periodically
+
+
+def test_refresh_keeps_running_after_a_failed_rebuild():
+    calls = []
+
+    async def rebuild():
+        calls.append(len(calls))
+        if len(calls) == 1:
+            raise RuntimeError("database unavailable")
+
+    async def scenario():
+        task = asyncio.create_task(_refresh_periodically("test structure", rebuild, 0.01))
+        while len(calls) < 3:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        assert task.cancelled()
+
+    asyncio.run(asyncio.wait_for(scenario(), 5))
+    assert len(calls) >= 3
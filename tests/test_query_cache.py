@@ -0,0 +1,39 @@
+"""Invalidation guarantees of VersionedQueryCache."""
+import asyncio
+
+from app.cache import InMemoryCacheBackend, VersionedQueryCache
+
+
+class FlakyIncrBackend(InMemoryCacheBackend):
+    """In-memory backend whose incr fails while fail_incr is set."""
+
+    def __init__(self):
+        super().__init__()
+        self.fail_incr = False
+
+    async def incr(self, key: str) -> int:
+        if self.fail_incr:
+            raise ConnectionError("backend unavailable")
+        return await super().incr(key)
+
+
+def test_failed_bump_bypasses_cache_until_a_bump_succeeds():
+    async def scenario():
+        backend = FlakyIncrBackend()
+        cache = VersionedQueryCache(backend, "test")
+        params = ("page", 1)
+        await cache.set(await cache.version(), params, ["before write"])
+        assert await cache.get(await cache.version(), params) == ["before write"]
+
+        backend.fail_incr = True
+        assert await cache.bump() is False
+        assert await cache.version() is None
+        assert await cache.get(await cache.version(), params) is None
+
+        backend.fail_incr = False
+        version = await cache.version()
+        assert version is not None
+        assert await cache.get(version, params) is None
+        assert cache.stats()["bump_pending"] is False
+
+    asyncio.run(scenario())
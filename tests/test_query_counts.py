@@ -0,0 +1,60 @@
+"""Statement counts of the movie endpoints.
+
+Relationships rendered by MovieResponse are loaded in bulk, so the number
+of statements per request must not grow with the number of movies
+returned. These counts fail loudly if a lazy load (N+1) comes back.
+"""
+import pytest
+
+from app.cache import movie_detail_cache
+
+# count, movies joined with directors, genres (selectin)
+LIST_STATEMENTS = 3
+# movie joined with director, genres (selectin)
+GET_STATEMENTS = 2
+# title check, director check, movie insert, genre insert, people lookup,
+# people insert, people re-read, cast insert, reload of movie and genres
+CREATE_STATEMENTS = 10
+# load, title check, reload after the genre/cast rewrite (delete + insert
+# each, people lookup), UPDATE, reload of movie and genres
+UPDATE_STATEMENTS = 11
+
+
+@pytest.mark.parametrize("page_size", [5, 25])
+def test_list_movies_statement_count_does_not_depend_on_page_size(client, statements, page_size):
+    # No other test lists this page, so it cannot be served from the list cache
+    response = client.get("/api/v1/movies/", params={"page_size": page_size, "page": 2})
+    assert response.status_code == 200
+    assert len(response.json()["data"]["items"]) == page_size
+    assert len(statements) == LIST_STATEMENTS, statements.statements
+
+
+def test_get_movie_by_id_statement_count(client, statements):
+    movie_detail_cache.invalidate(3)
+    response = client.get("/api/v1/movies/3")
+    assert response.status_code == 200
+    assert len(statements) == GET_STATEMENTS, statements.statements
+
+
+def test_create_movie_statement_count(client, statements):
+    response = client.post("/api/v1/movies/", json={
+        "title": "Statement Count Premiere",
+        "director_id": 1,
+        "release_year": 2001,
+        "cast": "Actor 1, Newcomer",
+        "genres": [1, 2],
+    })
+    assert response.status_code == 201, response.text
+    assert response.json()["data"]["genres"] == ["Drama", "Action"]
+    assert len(statements) == CREATE_STATEMENTS, statements.statements
+
+
+def test_update_movie_statement_count(client, statements):
+    response = client.put("/api/v1/movies/4", json={
+        "title": "Statement Count Sequel",
+        "genres": [2, 3],
+        "cast": "Actor 2, Actor 3",
+    })
+    assert response.status_code == 200, response.text
+    assert response.json()["data"]["genres"] == ["Action", "Comedy"]
+    assert len(statements) == UPDATE_STATEMENTS, statements.statements
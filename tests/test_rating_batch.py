@@ -0,0 +1,92 @@
+"""POST /ratings:batch with JSON and NDJSON bodies.
+
+Invalid rows are reported with their index in the submission and never
+abort the rest of the batch.
+"""
+import json
+
+from app.api.v1.controllers import rating as rating_controller
+
+BATCH_URL = "/api/v1/ratings:batch"
+NDJSON = {"Content-Type": "application/x-ndjson"}
+
+
+def ratings_count(client, movie_id: int) -> int:
+    return client.get(f"/api/v1/movies/{movie_id}").json()["data"]["ratings_count"]
+
+
+def error_indexes(data: dict) -> list[int]:
+    return [error["index"] for error in data["errors"]]
+
+
+def test_json_batch_reports_bad_rows(client):
+    before = ratings_count(client, 11)
+    response = client.post(BATCH_URL, json={"ratings": [
+        {"movie_id": 11, "score": 8},
+        {"movie_id": 11, "score": 0},
+        {"score": 5},
+        {"movie_id": 99999, "score": 5},
+        "not an object",
+        {"movie_id": 11, "score": 9.5},
+    ]})
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert (data["received"], data["inserted"], data["failed"]) == (6, 2, 4)
+    assert error_indexes(data) == [1, 2, 3, 4]
+    assert "does not exist" in data["errors"][2]["error"]
+    assert data["errors_truncated"] is False
+    assert ratings_count(client, 11) == before + 2
+
+
+def test_json_body_that_is_not_a_batch_is_rejected(client):
+    assert client.post(BATCH_URL, json=[{"movie_id": 11, "score": 8}]).status_code == 422
+    assert client.post(BATCH_URL, content=b"{not json", headers={"Content-Type": "application/json"}).status_code == 422
+
+
+def test_ndjson_stream_split_across_body_chunks(client):
+    before = ratings_count(client, 12)
+    body = (
+        b'{"movie_id": 12, "score": 7}\n'
+        b"\n"
+        b"{broken\n"
+        b'{"movie_id": 12, "score": 11}\n'
+        b'{"movie_id": 12, "score": 3}'
+    )
+    # Cut the body mid-line so rows straddle the chunks the server receives
+    chunks = [body[:10], body[10:40], body[40:41], body[41:]]
+    response = client.post(BATCH_URL, content=iter(chunks), headers=NDJSON)
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert (data["received"], data["inserted"], data["failed"]) == (4, 2, 2)
+    assert error_indexes(data) == [1, 2]
+    assert data["errors"][0]["error"].startswith("Invalid JSON")
+    assert ratings_count(client, 12) == before + 2
+
+
+def test_errors_keep_their_index_across_chunks(client, monkeypatch):
+    monkeypatch.setattr(rating_controller, "BATCH_CHUNK_SIZE", 2)
+    before = ratings_count(client, 13)
+    rows = [
+        {"movie_id": 13, "score": 6},
+        {"movie_id": 99999, "score": 6},
+        {"movie_id": 13, "score": 6},
+        {"movie_id": 13, "score": 6},
+        {"movie_id": 99999, "score": 6},
+    ]
+    for request in (
+        {"json": {"ratings": rows}},
+        {"content": "\n".join(json.dumps(row) for row in rows).encode(), "headers": NDJSON},
+    ):
+        data = client.post(BATCH_URL, **request).json()["data"]
+        assert (data["received"], data["inserted"], data["failed"]) == (5, 3, 2)
+        assert error_indexes(data) == [1, 4]
+    assert ratings_count(client, 13) == before + 6
+
+
+def test_reported_errors_are_truncated(client, monkeypatch):
+    monkeypatch.setattr(rating_controller, "MAX_REPORTED_ERRORS", 2)
+    response = client.post(BATCH_URL, json={"ratings": [{"movie_id": 14, "score": 0}] * 4})
+    data = response.json()["data"]
+    assert (data["received"], data["inserted"], data["failed"]) == (4, 0, 4)
+    assert error_indexes(data) == [0, 1]
+    assert data["errors_truncated"] is True
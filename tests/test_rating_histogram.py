@@ -0,0 +1,39 @@
+"""Precomputed rating histograms served by GET /movies/{id}/ratings/histogram."""
+from collections import Counter
+
+MOVIES_URL = "/api/v1/movies/"
+
+
+def histogram(client, movie_id: int) -> dict[int, int]:
+    response = client.get(f"{MOVIES_URL}{movie_id}/ratings/histogram")
+    assert response.status_code == 200, response.text
+    data = response.json()["data"]
+    counts = {bucket["score"]: bucket["count"] for bucket in data["buckets"]}
+    assert data["ratings_count"] == sum(counts.values())
+    return counts
+
+
+def test_single_and_batch_ratings_update_the_buckets(client):
+    created = client.post(MOVIES_URL, json={"title": "Histogram Premiere", "director_id": 3, "genres": [2]})
+    assert created.status_code == 201, created.text
+    movie_id = created.json()["data"]["id"]
+    assert set(histogram(client, movie_id).values()) == {0}
+
+    # The first rating inserts the histogram row, later ones increment it
+    single = [1, 9.99]
+    for score in single:
+        assert client.post(f"{MOVIES_URL}{movie_id}/ratings", json={"score": score}).status_code == 201
+    batch = [1.5, 10, 10, 5.5, 9]
+    response = client.post("/api/v1/ratings:batch", json={
+        "ratings": [{"movie_id": movie_id, "score": score} for score in batch],
+    })
+    assert response.json()["data"]["inserted"] == len(batch)
+
+    expected = Counter({1: 2, 5: 1, 9: 2, 10: 2})
+    assert histogram(client, movie_id) == {bucket: expected[bucket] for bucket in range(1, 11)}
+    detail = client.get(f"{MOVIES_URL}{movie_id}").json()["data"]
+    assert detail["ratings_count"] == len(single) + len(batch)
+
+
+def test_unknown_movie_has_no_histogram(client):
+    assert client.get(f"{MOVIES_URL}99999/ratings/histogram").status_code == 404
@@ -0,0 +1,158 @@
+"""Write-behind rating buffer: backpressure, retries, dropped rows and shutdown."""
+import asyncio
+
+import pytest
+from fastapi import Depends
+from sqlalchemy import func, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.api.v1.dependencies import get_db, get_rating_service
+from app.db.session import to_async_url
+from app.exceptions.service_exception import CapacityError
+from app.main import app
+from app.models import Rating
+from app.repositories import MovieRepository, RatingRepository
+from app.services import RatingService, RatingWriteBuffer
+
+
+class FlakySessionFactory:
+    """Session factory that fails to connect the first `failures` times."""
+
+    def __init__(self, url: str, failures: int = 0):
+        self.engine = create_async_engine(to_async_url(url), poolclass=NullPool)
+        self.sessions = async_sessionmaker(self.engine, class_=AsyncSession, expire_on_commit=False)
+        self.failures = failures
+
+    def __call__(self) -> AsyncSession:
+        if self.failures:
+            self.failures -= 1
+            raise OperationalError("connect", {}, ConnectionError("database unavailable"))
+        return self.sessions()
+
+    async def rating_count(self, movie_id: int) -> int:
+        async with self.sessions() as session:
+            return await session.scalar(select(func.count(Rating.id)).where(Rating.movie_id == movie_id))
+
+
+def run(scenario):
+    asyncio.run(asyncio.wait_for(scenario(), 10))
+
+
+def test_full_queue_rejects_ratings():
+    buffer = RatingWriteBuffer(lambda: None, max_size=2)
+    buffer.submit(1, 5.0)
+    buffer.submit(1, 6.0)
+    with pytest.raises(CapacityError):
+        buffer.submit(1, 7.0)
+    assert buffer.stats()["rejected"] == 1
+
+
+def test_full_queue_answers_503(client):
+    buffer = RatingWriteBuffer(lambda: None, max_size=1)
+
+    async def buffered_rating_service(db: AsyncSession = Depends(get_db)) -> RatingService:
+        return RatingService(RatingRepository(db), MovieRepository(db), buffer)
+
+    app.dependency_overrides[get_rating_service] = buffered_rating_service
+    try:
+        accepted = client.post("/api/v1/movies/5/ratings", json={"score": 8})
+        rejected = client.post("/api/v1/movies/5/ratings", json={"score": 8})
+    finally:
+        app.dependency_overrides.pop(get_rating_service)
+    assert accepted.status_code == 202
+    assert rejected.status_code == 503
+    assert rejected.headers["Retry-After"] == "1"
+    assert len(buffer) == 1
+
+
+def test_failed_flush_requeues_the_batch_with_backoff(seeded_database):
+    async def scenario():
+        sessions = FlakySessionFactory(seeded_database, failures=2)
+        buffer = RatingWriteBuffer(sessions, batch_size=10, retry_backoff=0.5, max_retries=1)
+        before = await sessions.rating_count(6)
+        for score in (4.0, 5.0, 6.0):
+            buffer.submit(6, score)
+
+        assert await buffer.flush() == 0
+        assert [rating["score"] for rating in buffer._queue] == [4.0, 5.0, 6.0]
+        assert buffer.retry_delay == 0.5
+        assert await buffer.flush() == 0
+        assert buffer.retry_delay == 1.0
+        assert await buffer.flush() == 3
+        assert buffer.retry_delay == 0.0
+        assert len(buffer) == 0
+        assert await sessions.rating_count(6) == before + 3
+        assert buffer.stats()["failed"] == 0
+        await sessions.engine.dispose()
+
+    run(scenario)
+
+
+def test_constraint_violation_drops_only_the_offending_rating(seeded_database):
+    async def scenario():
+        sessions = FlakySessionFactory(seeded_database)
+        buffer = RatingWriteBuffer(sessions, batch_size=10)
+        before = await sessions.rating_count(7)
+        buffer.submit(7, 7.0)
+        buffer.submit(7, None)
+        buffer.submit(7, 9.0)
+        assert await buffer.flush() == 2
+        assert await sessions.rating_count(7) == before + 2
+        assert buffer.stats()["failed"] == 1
+        assert len(buffer) == 0
+        await sessions.engine.dispose()
+
+    run(scenario)
+
+
+def test_stop_flushes_queued_ratings(seeded_database):
+    async def scenario():
+        sessions = FlakySessionFactory(seeded_database)
+        buffer = RatingWriteBuffer(sessions, batch_size=2, flush_interval=60)
+        before = await sessions.rating_count(8)
+        buffer.start()
+        buffer.submit(8, 3.0)
+        await buffer.stop()
+        assert await sessions.rating_count(8) == before + 1
+        with pytest.raises(CapacityError):
+            buffer.submit(8, 3.0)
+        await sessions.engine.dispose()
+
+    run(scenario)
+
+
+def test_stop_drains_the_queue_after_the_flusher_crashed(seeded_database):
+    async def scenario():
+        sessions = FlakySessionFactory(seeded_database)
+        buffer = RatingWriteBuffer(sessions, batch_size=10)
+
+        async def crash():
+            raise RuntimeError("flusher crashed")
+
+        buffer._run = crash
+        buffer.start()
+        await asyncio.sleep(0)
+        before = await sessions.rating_count(9)
+        buffer.submit(9, 6.0)
+        await buffer.stop()
+        assert len(buffer) == 0
+        assert await sessions.rating_count(9) == before + 1
+        await sessions.engine.dispose()
+
+    run(scenario)
+
+
+def test_stop_gives_up_after_max_retries(seeded_database):
+    async def scenario():
+        sessions = FlakySessionFactory(seeded_database, failures=100)
+        buffer = RatingWriteBuffer(sessions, retry_backoff=0.001, max_retries=2)
+        buffer.submit(10, 5.0)
+        await buffer.stop()
+        assert len(buffer) == 0
+        assert buffer.stats()["failed"] == 1
+        assert sessions.failures == 100 - 3
+        await sessions.engine.dispose()
+
+    run(scenario)
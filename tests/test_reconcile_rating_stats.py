@@ -0,0 +1,69 @@
+"""Drift detection and repair of scripts/reconcile_rating_stats.py."""
+import importlib.util
+import shutil
+import sqlite3
+from collections import Counter
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+
+from app.models import HISTOGRAM_BUCKETS, bucket_for
+
+SCRIPT = Path(__file__).resolve().parent.parent / "scripts" / "reconcile_rating_stats.py"
+
+
+@pytest.fixture(scope="module")
+def reconcile():
+    spec = importlib.util.spec_from_file_location("reconcile_rating_stats", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def database(reconcile, seeded_database, monkeypatch, tmp_path):
+    """Path of a consistent private copy of the seeded database the script runs against."""
+    path = tmp_path / "reconcile.db"
+    shutil.copyfile(make_url(seeded_database).database, path)
+    engine = create_engine(f"sqlite:///{path}")
+    monkeypatch.setattr(reconcile, "engine", engine)
+    # The seed writes ratings without histograms; start from repaired data
+    assert reconcile.reconcile_rating_stats(fix=True) is True
+    assert reconcile.reconcile_rating_stats() is True
+    yield path
+    engine.dispose()
+
+
+def histogram_row(path: Path, movie_id: int):
+    with sqlite3.connect(path) as connection:
+        return connection.execute(
+            "SELECT * FROM movie_rating_histograms WHERE movie_id = ?", (movie_id,)
+        ).fetchone()
+
+
+def test_drifted_histograms_are_rebuilt_from_ratings(reconcile, database):
+    with sqlite3.connect(database) as connection:
+        scores = connection.execute("SELECT movie_id, score FROM movie_ratings").fetchall()
+        movie_id = scores[0][0]
+        connection.execute("UPDATE movie_rating_histograms SET bucket_1 = bucket_1 + 3 WHERE movie_id = ?",
+                           (movie_id,))
+
+    assert reconcile.reconcile_rating_stats() is False
+    assert reconcile.reconcile_rating_stats(fix=True) is True
+    assert reconcile.reconcile_rating_stats() is True
+    expected = Counter(bucket_for(score) for rated_id, score in scores if rated_id == movie_id)
+    assert histogram_row(database, movie_id)[1:] == tuple(expected[bucket] for bucket in HISTOGRAM_BUCKETS)
+
+
+def test_missing_histogram_row_is_restored(reconcile, database):
+    with sqlite3.connect(database) as connection:
+        movie_id, = connection.execute("SELECT movie_id FROM movie_ratings LIMIT 1").fetchone()
+    stored = histogram_row(database, movie_id)
+    with sqlite3.connect(database) as connection:
+        connection.execute("DELETE FROM movie_rating_histograms WHERE movie_id = ?", (movie_id,))
+
+    assert reconcile.reconcile_rating_stats() is False
+    assert reconcile.reconcile_rating_stats(fix=True) is True
+    assert histogram_row(database, movie_id) == stored